@@ -0,0 +1,4 @@
+"""Performance benchmarks for the analysis engines.
+
+Run from the project root, e.g. ``python -m benchmarks.bench_drawdown``.
+"""
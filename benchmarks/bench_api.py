@@ -0,0 +1,137 @@
+"""Load-test the API with many concurrent keep-alive clients.
+
+Without --url, an in-process server is started over synthetic data; the
+clients then share its interpreter, so point --url at a separate
+`python -m src.api` for numbers closer to production.
+
+Usage:
+    python -m benchmarks.bench_api [--url http://127.0.0.1:8502] [--clients 200]
+        [--requests 25] [--coins 500]
+"""
+
+import argparse
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_prices
+from src.analyzer import rank_by_drop
+from src.api import ApiData, ApiServer
+from src.store import PriceStore
+
+
+def start_server(n_coins: int) -> tuple[ApiServer, list[str]]:
+    """Serve synthetic prices for n_coins on a free local port."""
+    prices = synthetic_prices(n_coins, 365)
+    ranking = rank_by_drop(prices, top_n=None)
+    store = PriceStore(prices, ranking.head(50), ranking=ranking)
+    server = ApiServer(("127.0.0.1", 0), ApiData(lambda: store, lambda: "synthetic"))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, ranking["coin_id"].tolist()
+
+
+def request_mix(coins: list[str], count: int, seed: int) -> list[str]:
+    """Random mix of rankings, summary and history requests."""
+    rng = np.random.default_rng(seed)
+    paths = []
+    for kind in rng.choice(["rankings", "page", "summary", "history"], size=count):
+        if kind == "rankings":
+            paths.append("/rankings")
+        elif kind == "page":
+            paths.append(f"/rankings?limit=50&offset={50 * rng.integers(0, 4)}")
+        elif kind == "summary":
+            paths.append("/summary")
+        else:
+            coin = coins[rng.integers(0, min(len(coins), 100))]
+            paths.append(f"/coins/{coin}/history?from=2025-06-01")
+    return paths
+
+
+def run_client(host: str, port: int, paths: list[str], revalidate: bool,
+               barrier: threading.Barrier) -> tuple[list[float], int, dict[int, int]]:
+    """Issue requests over one keep-alive connection.
+
+    Returns:
+        (latencies in ms, body bytes received, count per status).
+    """
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    etags: dict[str, str] = {}
+    latencies, received, statuses = [], 0, {}
+    conn.connect()
+    barrier.wait()
+    for path in paths:
+        headers = {"Accept-Encoding": "gzip"}
+        if revalidate and path in etags:
+            headers["If-None-Match"] = etags[path]
+        start = time.perf_counter()
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        body = response.read()
+        latencies.append((time.perf_counter() - start) * 1000)
+        received += len(body)
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+        if response.getheader("ETag"):
+            etags[path] = response.getheader("ETag")
+    conn.close()
+    return latencies, received, statuses
+
+
+def load(host: str, port: int, coins: list[str], clients: int, requests: int,
+         revalidate: bool) -> dict:
+    """Run every client at once and summarize the latencies."""
+    barrier = threading.Barrier(clients)
+    with ThreadPoolExecutor(clients) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(run_client, host, port, request_mix(coins, requests, seed),
+                               revalidate, barrier) for seed in range(clients)]
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+
+    latencies = np.concatenate([r[0] for r in results])
+    statuses = pd.DataFrame([r[2] for r in results]).sum().astype(int).to_dict()
+    return {
+        "req/s": len(latencies) / elapsed,
+        "p50 ms": np.percentile(latencies, 50),
+        "p95 ms": np.percentile(latencies, 95),
+        "p99 ms": np.percentile(latencies, 99),
+        "max ms": latencies.max(),
+        "MB": sum(r[1] for r in results) / 1e6,
+        "statuses": statuses,
+    }
+
+
+def main(url: str | None, clients: int, requests: int, n_coins: int) -> None:
+    """Time a cold pass, a warm pass and a pass revalidating with ETags."""
+    if url:
+        parts = urlsplit(url)
+        host, port = parts.hostname, parts.port or 80
+        conn = http.client.HTTPConnection(host, port)
+        conn.request("GET", "/rankings")
+        coins = [row["coin_id"] for row in
+                 pd.read_json(conn.getresponse(), typ="series")["rankings"]]
+    else:
+        server, coins = start_server(n_coins)
+        host, port = server.server_address[:2]
+    print(f"{clients} clients x {requests} requests against http://{host}:{port}")
+    print(f"{'pass':>10s} {'req/s':>8s} {'p50 ms':>7s} {'p95 ms':>7s} {'p99 ms':>7s} "
+          f"{'max ms':>7s} {'MB':>6s}  statuses")
+    for name, revalidate in (("cold", False), ("warm", False), ("revalidate", True)):
+        stats = load(host, port, coins, clients, requests, revalidate)
+        print(f"{name:>10s} {stats['req/s']:8.0f} {stats['p50 ms']:7.1f} {stats['p95 ms']:7.1f} "
+              f"{stats['p99 ms']:7.1f} {stats['max ms']:7.1f} {stats['MB']:6.1f}  "
+              f"{stats['statuses']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the rankings API")
+    parser.add_argument("--url", help="Running server (default: start one in-process)")
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent connections")
+    parser.add_argument("--requests", type=int, default=25, help="Requests per connection")
+    parser.add_argument("--coins", type=int, default=500, help="Synthetic coins to serve")
+    args = parser.parse_args()
+    main(args.url, args.clients, args.requests, args.coins)
@@ -0,0 +1,54 @@
+"""Benchmark dip-buying backtest throughput in parameter combos per second.
+
+Usage:
+    python -m benchmarks.bench_backtest [--coins 200] [--days 365] [--grid 10]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_prices
+from src.backtest import parameter_grid, prepare_arrays, run_backtest, simulate
+from src.panel import build_panel
+
+
+def main(coins: int, days: int, grid_size: int) -> None:
+    """Time the simulation alone and run_backtest for 1, 2, 4, ... workers."""
+    panel = build_panel(synthetic_prices(coins, days))
+    grid = parameter_grid(
+        np.linspace(10, 90, grid_size).round(1).tolist(),
+        np.geomspace(5, 200, grid_size).round(1).tolist(),
+        np.unique(np.geomspace(1, days // 2, grid_size).astype(int)).tolist(),
+    )
+    print(f"{coins} coins x {days} days, {len(grid):,d} parameter combos")
+
+    prices, drawdown = prepare_arrays(panel)
+    params = np.array([[s.entry_drawdown_pct, s.take_profit_pct, s.max_hold_days]
+                       for s in grid])
+    start = time.perf_counter()
+    simulate(prices, drawdown, params)
+    elapsed = time.perf_counter() - start
+    print(f"simulate only: {elapsed:.2f}s, {len(grid) / elapsed:,.0f} combos/s")
+
+    print(f"{'workers':>8s} {'seconds':>8s} {'combos/s':>10s} {'trades':>10s}")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        result = run_backtest(panel, grid, workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>8d} {elapsed:>8.2f} {len(grid) / elapsed:>10,.0f} "
+              f"{len(result.trades):>10,d}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--coins", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--grid", type=int, default=10,
+                        help="Values per parameter (grid has up to grid**3 combos)")
+    args = parser.parse_args()
+    main(args.coins, args.days, args.grid)
@@ -0,0 +1,45 @@
+"""Benchmark chart downsampling on long hourly price series.
+
+Usage:
+    python -m benchmarks.bench_downsample [--budget 2000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from src.downsample import METHODS, downsample
+
+
+def main(budget: int) -> None:
+    """Time each method and the serialized chart size for 1 to 5 years of hours."""
+    print(f"budget {budget} points")
+    print(f"{'rows':>7s} {'method':>7s} {'points':>7s} {'reduce ms':>10s} "
+          f"{'json KB':>8s} {'peak kept':>10s}")
+    rng = np.random.default_rng(42)
+    for years in (1, 2, 5):
+        rows = years * 365 * 24
+        prices = pd.DataFrame({
+            "date": pd.date_range("2021-01-01", periods=rows, freq="h"),
+            "price": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows))),
+        })
+        size = len(px.line(prices, x="date", y="price").to_json()) / 1024
+        print(f"{rows:7d} {'full':>7s} {rows:7d} {'-':>10s} {size:8.0f} {'yes':>10s}")
+        for method in METHODS:
+            start = time.perf_counter()
+            points = downsample(prices, "price", budget, method=method)
+            elapsed = (time.perf_counter() - start) * 1000
+            size = len(px.line(points, x="date", y="price").to_json()) / 1024
+            kept = points["price"].max() == prices["price"].max()
+            print(f"{rows:7d} {method:>7s} {len(points):7d} {elapsed:10.1f} {size:8.0f} "
+                  f"{'yes' if kept else 'no':>10s}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark chart downsampling")
+    parser.add_argument("--budget", type=int, default=2000, help="Points per series")
+    args = parser.parse_args()
+    main(args.budget)
@@ -0,0 +1,36 @@
+"""Benchmark drawdown analytics to show they scale linearly in rows.
+
+Usage:
+    python -m benchmarks.bench_drawdown [--days 365] [--max-coins 3200]
+"""
+
+import argparse
+import time
+
+from benchmarks.synthetic import synthetic_prices
+from src.drawdown import drawdown_episodes, drawdown_stats, underwater_curve
+
+
+def main(days: int, max_coins: int) -> None:
+    """Time each drawdown routine on doubling universe sizes."""
+    print(f"{'rows':>10s} {'curve s':>9s} {'episodes s':>11s} {'stats s':>9s} {'ns/row':>8s}")
+    coins = 100
+    while coins <= max_coins:
+        df = synthetic_prices(coins, days)
+        timings = []
+        for func in (underwater_curve, drawdown_episodes, drawdown_stats):
+            start = time.perf_counter()
+            func(df)
+            timings.append(time.perf_counter() - start)
+        per_row = timings[-1] / len(df) * 1e9
+        print(f"{len(df):>10,d} {timings[0]:>9.3f} {timings[1]:>11.3f} "
+              f"{timings[2]:>9.3f} {per_row:>8.0f}")
+        coins *= 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--max-coins", type=int, default=3200)
+    args = parser.parse_args()
+    main(args.days, args.max_coins)
@@ -0,0 +1,37 @@
+"""Benchmark sharded analysis throughput against the number of workers.
+
+Usage:
+    python -m benchmarks.bench_parallel [--coins 2000] [--days 365]
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.synthetic import synthetic_prices
+from src.parallel import rank_parallel
+
+
+def main(coins: int, days: int) -> None:
+    """Time rank_parallel for 1, 2, 4, ... workers up to the CPU count."""
+    df = synthetic_prices(coins, days)
+    print(f"{len(df):,d} rows, {coins} coins")
+    print(f"{'workers':>8s} {'seconds':>8s} {'rows/s':>12s} {'speedup':>8s}")
+    baseline = None
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        rank_parallel(df, workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8d} {elapsed:>8.2f} {len(df) / elapsed:>12,.0f} "
+              f"{baseline / elapsed:>7.1f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--coins", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+    main(args.coins, args.days)
@@ -0,0 +1,36 @@
+"""Benchmark bootstrap drawdown simulation on growing universes.
+
+Usage:
+    python -m benchmarks.bench_simulation [--paths 1000] [--days 365]
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.synthetic import synthetic_prices
+from src.panel import build_panel
+from src.simulation import simulate_drawdowns
+
+
+def main(paths: int, days: int) -> None:
+    """Time simulate_drawdowns for 100, 200, 400 and 800 coins."""
+    workers = os.cpu_count() or 1
+    print(f"{paths} paths x {days} days per coin, {workers} worker(s) available")
+    print(f"{'coins':>6s} {'workers':>8s} {'seconds':>8s} {'path-days/s':>14s}")
+    for coins in (100, 200, 400, 800):
+        panel = build_panel(synthetic_prices(coins, days))
+        for n_workers in sorted({1, workers}):
+            start = time.perf_counter()
+            simulate_drawdowns(panel, n_paths=paths, horizon=days, workers=n_workers)
+            elapsed = time.perf_counter() - start
+            print(f"{coins:>6d} {n_workers:>8d} {elapsed:>8.2f} "
+                  f"{coins * paths * days / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+    main(args.paths, args.days)
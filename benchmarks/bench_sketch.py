@@ -0,0 +1,53 @@
+"""Benchmark daily quantile sketches against exact per-day percentiles.
+
+"append s" is the update after one new day: sketch that day alone and merge
+it into the sketch of the earlier days, as get_sketches() does.
+
+Usage:
+    python -m benchmarks.bench_sketch [--days 365]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_prices
+from src.panel import build_panel
+from src.sketch import DEFAULT_QUANTILES, QuantileSketch
+
+
+def main(days: int) -> None:
+    """Time daily drawdown percentiles for 500, 1000, 2000 and 4000 coins."""
+    print(f"{days} days, percentiles {DEFAULT_QUANTILES}")
+    print(f"{'coins':>6s} {'exact s':>8s} {'sketch s':>9s} {'append s':>9s} "
+          f"{'max rel err':>12s}")
+    for coins in (500, 1000, 2000, 4000):
+        price = build_panel(synthetic_prices(coins, days)).price
+        drawdown = ((price / np.fmax.accumulate(price, axis=1) - 1) * 100).T
+        labels = np.arange(days)
+
+        start = time.perf_counter()
+        exact = np.nanquantile(drawdown, DEFAULT_QUANTILES, axis=1, method="lower").T
+        exact_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sketch = QuantileSketch.from_values(drawdown, labels)
+        estimate = sketch.quantiles()
+        sketch_s = time.perf_counter() - start
+
+        cached = QuantileSketch.from_values(drawdown[:-1], labels[:-1])
+        start = time.perf_counter()
+        cached.merge(QuantileSketch.from_values(drawdown[-1:], labels[-1:]))
+        append_s = time.perf_counter() - start
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            error = np.nanmax(np.abs(estimate - exact) / np.abs(exact))
+        print(f"{coins:>6d} {exact_s:>8.3f} {sketch_s:>9.3f} {append_s:>9.4f} {error:>12.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+    main(args.days)
@@ -0,0 +1,34 @@
+"""Synthetic price data shaped like the fetcher's output, for benchmarks."""
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_prices(n_coins: int, n_days: int, seed: int = 0) -> pd.DataFrame:
+    """Generate random-walk daily candles for many coins.
+
+    Args:
+        n_coins: Number of coins.
+        n_days: Number of consecutive days per coin.
+        seed: Random seed.
+
+    Returns:
+        DataFrame with the same columns as load_data(), sorted by coin and date.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2025-01-01", periods=n_days)
+    log_returns = rng.normal(0, 0.05, size=(n_coins, n_days))
+    prices = 10 * np.exp(np.cumsum(log_returns, axis=1))
+    coin_ids = np.repeat([f"COIN{i:05d}" for i in range(n_coins)], n_days)
+
+    return pd.DataFrame({
+        "date": np.tile(dates, n_coins),
+        "coin_id": coin_ids,
+        "coin_name": coin_ids,
+        "symbol": coin_ids,
+        "price": prices.ravel(),
+        "market_cap": 0.0,
+        "volume": rng.uniform(1e5, 1e7, size=n_coins * n_days),
+        "high": prices.ravel() * 1.02,
+        "low": prices.ravel() * 0.98,
+    })
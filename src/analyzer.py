@@ -8,11 +8,13 @@ This module provides comprehensive analysis of altcoin price data including:
 - Exporting results to CSV and JSON
 """
 
+import argparse
 import logging
 import sqlite3
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+import numpy as np
 import pandas as pd
 
 from src.config import (
@@ -20,9 +22,16 @@ from src.config import (
     DATA_DIR,
     MIN_DATA_DAYS,
     PRICES_CSV,
+    RANKING_EXPORT_CSV,
+    RANKING_EXPORT_JSON,
+    RANKING_PATH,
     RESULTS_CSV,
+    RESULTS_JSON,
     TOP_N_RANKING,
 )
+from src.drawdown import drawdown_stats
+from src.exports import write_frame
+from src.fingerprint import analysis_params, compute_fingerprint, is_fresh, write_stamp
 
 logger = logging.getLogger(__name__)
 
@@ -174,69 +183,328 @@ def get_coin_stats(df: pd.DataFrame, coin_id: str) -> dict[str, Any]:
     }
 
 
-def rank_by_drop(df: pd.DataFrame, top_n: int = TOP_N_RANKING) -> pd.DataFrame:
+# Bump when the columns written by run() change, so cached results are rebuilt
+RESULTS_SCHEMA_VERSION = 2
+
+SUMMARY_COLUMNS = [
+    "coin_id", "coin_name", "symbol", "peak_price", "peak_date",
+    "current_price", "current_date", "market_cap", "volume", "data_points",
+]
+
+RANKING_COLUMNS = [
+    "coin_id", "coin_name", "symbol", "peak_price", "peak_date",
+    "current_price", "current_date", "pct_change", "market_cap", "volume",
+]
+
+# Per-coin peak/latest aggregation pushed down into SQLite. Window functions
+# walk each coin's partition once, so only one row per coin leaves the database.
+COIN_SUMMARY_SQL = """
+WITH ranked AS (
+    SELECT
+        coin_id, coin_name, symbol, price, date, market_cap, volume,
+        ROW_NUMBER() OVER (PARTITION BY coin_id ORDER BY price DESC, date ASC) AS peak_rn,
+        ROW_NUMBER() OVER (PARTITION BY coin_id ORDER BY date DESC) AS latest_rn,
+        COUNT(*) OVER (PARTITION BY coin_id) AS data_points
+    FROM prices
+    WHERE date < :before
+)
+SELECT
+    peak.coin_id AS coin_id,
+    peak.coin_name AS coin_name,
+    peak.symbol AS symbol,
+    peak.price AS peak_price,
+    substr(peak.date, 1, 10) AS peak_date,
+    latest.price AS current_price,
+    substr(latest.date, 1, 10) AS current_date,
+    latest.market_cap AS market_cap,
+    latest.volume AS volume,
+    peak.data_points AS data_points
+FROM ranked AS peak
+JOIN ranked AS latest
+    ON latest.coin_id = peak.coin_id AND latest.latest_rn = 1
+WHERE peak.peak_rn = 1
+ORDER BY peak.coin_id
+"""
+
+
+def format_dates(dates: pd.Series) -> pd.Series:
+    """Format a date column as YYYY-MM-DD strings."""
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.dt.strftime("%Y-%m-%d")
+    return dates.astype(str).str[:10]
+
+
+def _column(rows: pd.DataFrame, name: str, default: Any) -> pd.Series:
+    """Return a column, or a constant series if the store lacks it."""
+    if name in rows.columns:
+        return rows[name]
+    return pd.Series(default, index=rows.index)
+
+
+def as_of_bound(as_of: str | pd.Timestamp) -> pd.Timestamp:
+    """Return the exclusive upper bound for an as-of date (end of that day)."""
+    return pd.Timestamp(as_of).normalize() + pd.Timedelta(days=1)
+
+
+def _coin_order(codes: np.ndarray, seconds: np.ndarray) -> np.ndarray:
+    """Return row positions ordered by coin then date, skipping the sort if possible."""
+    same_coin = codes[1:] == codes[:-1]
+    already_sorted = np.all(
+        (codes[1:] > codes[:-1]) | (same_coin & (seconds[1:] >= seconds[:-1]))
+    )
+    if already_sorted:
+        return np.arange(len(codes))
+    return np.lexsort((seconds, codes))
+
+
+def summarize_coins(
+    df: pd.DataFrame,
+    as_of: str | pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Reduce the price history to one peak/latest row per coin.
+
+    Works on position arrays over the (coin_id, date) ordering: a per-coin
+    prefix max records where each running peak was set, and ``as_of`` is
+    resolved with one binary search per coin. No per-coin filtering or copy
+    of the frame is made, so a historical summary costs the same as the
+    live one.
+
+    Args:
+        df: Full price DataFrame.
+        as_of: Only consider prices dated on or before this day.
+
+    Returns:
+        DataFrame with SUMMARY_COLUMNS, one row per coin with data.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    codes, _ = pd.factorize(df["coin_id"])
+    seconds = pd.to_datetime(df["date"]).to_numpy().astype("datetime64[s]").astype(np.int64)
+    order = _coin_order(codes, seconds)
+    codes, seconds = codes[order], seconds[order]
+    prices = pd.to_numeric(df["price"], errors="coerce").to_numpy(float)[order]
+    prices = np.where(np.isnan(prices), -np.inf, prices)
+
+    n = len(order)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], n]
+    group_start = np.zeros(n, dtype=bool)
+    group_start[starts] = True
+
+    # Position of the running peak at every row (earliest day wins ties)
+    running_max = pd.Series(prices).groupby(codes).cummax().to_numpy()
+    new_peak = group_start | (running_max > np.r_[-np.inf, running_max[:-1]])
+    peak_at = np.maximum.accumulate(np.where(new_peak, np.arange(n), 0))
+
+    # Last row of each coin on or before as_of
+    if as_of is None:
+        last = ends - 1
+    else:
+        origin = seconds.min()
+        span = int(seconds.max() - origin) + 2
+        keys = codes.astype(np.int64) * span + (seconds - origin)
+        bound = int(as_of_bound(as_of).to_datetime64().astype("datetime64[s]").astype(np.int64))
+        offset = int(np.clip(bound - 1 - origin, -1, span - 1))
+        last = np.searchsorted(keys, codes[starts].astype(np.int64) * span + offset,
+                               side="right") - 1
+
+    has_data = last >= starts
+    starts, last = starts[has_data], last[has_data]
+    peak_rows = df.iloc[order[peak_at[last]]].reset_index(drop=True)
+    latest_rows = df.iloc[order[last]].reset_index(drop=True)
+
+    summary = pd.DataFrame({
+        "coin_id": peak_rows["coin_id"],
+        "coin_name": _column(peak_rows, "coin_name", None).fillna(peak_rows["coin_id"]),
+        "symbol": _column(peak_rows, "symbol", "").fillna(""),
+        "peak_price": peak_rows["price"].astype(float),
+        "peak_date": format_dates(peak_rows["date"]),
+        "current_price": latest_rows["price"].astype(float),
+        "current_date": format_dates(latest_rows["date"]),
+        "market_cap": _column(latest_rows, "market_cap", 0).astype(float),
+        "volume": _column(latest_rows, "volume", 0).astype(float),
+        "data_points": last - starts + 1,
+    })
+    return summary
+
+
+def query_coin_summary(
+    db_path: Path | str | None = None,
+    as_of: str | pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Compute the per-coin peak/latest summary inside SQLite.
+
+    Uses the same tie-breaking as summarize_coins() (earliest date wins for
+    equal peak prices) but never pulls the full price history into pandas.
+
+    Args:
+        db_path: Database file path (defaults to DATABASE_PATH).
+        as_of: Only consider prices dated on or before this day.
+
+    Returns:
+        DataFrame with SUMMARY_COLUMNS, one row per coin.
+
+    Raises:
+        FileNotFoundError: If the database does not exist.
+    """
+    db_path = Path(db_path) if db_path else DATABASE_PATH
+    if not db_path.exists():
+        raise FileNotFoundError(f"SQLite database not found: {db_path}")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        # Dates are stored as ISO text, so the next day's date string is an
+        # exclusive bound for both "YYYY-MM-DD" and "YYYY-MM-DD HH:MM:SS" rows
+        before = "9999-12-31" if as_of is None else as_of_bound(as_of).strftime("%Y-%m-%d")
+        summary = pd.read_sql(COIN_SUMMARY_SQL, conn, params={"before": before})
+    finally:
+        conn.close()
+
+    summary["coin_name"] = summary["coin_name"].fillna(summary["coin_id"]).astype(str)
+    summary["symbol"] = summary["symbol"].fillna("").astype(str)
+    summary[["market_cap", "volume"]] = summary[["market_cap", "volume"]].fillna(0)
+    logger.info("Summarized %d coins in SQLite", len(summary))
+    return summary[SUMMARY_COLUMNS]
+
+
+def rank_summary(summary: pd.DataFrame, top_n: int | None = TOP_N_RANKING) -> pd.DataFrame:
+    """Rank a per-coin summary by biggest price drop from peak.
+
+    Args:
+        summary: Output of summarize_coins() or query_coin_summary().
+        top_n: Number of top losers to return; None keeps every coin.
+
+    Returns:
+        DataFrame ranked by drop percentage (biggest drops first).
+    """
+    # Skip coins with insufficient data
+    enough = summary["data_points"] >= MIN_DATA_DAYS
+    if not enough.all():
+        logger.debug("Skipping %d coins with fewer than %d data points",
+                     int((~enough).sum()), MIN_DATA_DAYS)
+
+    # Skip zero-price coins
+    priced = (summary["peak_price"] > 0) & (summary["current_price"] > 0)
+    ranked = summary[enough & priced].copy()
+
+    ranked["pct_change"] = (
+        (ranked["current_price"] - ranked["peak_price"]) / ranked["peak_price"] * 100
+    ).round(2)
+
+    # Only include coins that have actually dropped
+    ranked = ranked[ranked["pct_change"] < 0]
+    if ranked.empty:
+        return pd.DataFrame()
+
+    ranked = ranked[RANKING_COLUMNS]
+    ranked = ranked.sort_values("pct_change", ascending=True, kind="mergesort")
+    if top_n is not None:
+        ranked = ranked.head(top_n)
+    ranked.reset_index(drop=True, inplace=True)
+    ranked.index += 1
+    ranked.index.name = "rank"
+    return ranked
+
+
+def query_coin_history(
+    coin_ids: list[str],
+    db_path: Path | str | None = None,
+    columns: tuple[str, ...] = ("coin_id", "date", "price"),
+) -> pd.DataFrame:
+    """Load the history of selected coins from SQLite via the (coin_id, date) index.
+
+    Args:
+        coin_ids: Coins to load.
+        db_path: Database file path (defaults to DATABASE_PATH).
+        columns: Columns to select.
+
+    Returns:
+        DataFrame sorted by coin_id and date.
+    """
+    db_path = Path(db_path) if db_path else DATABASE_PATH
+    placeholders = ", ".join("?" for _ in coin_ids)
+    query = (f"SELECT {', '.join(columns)} FROM prices "
+             f"WHERE coin_id IN ({placeholders}) ORDER BY coin_id, date")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        df = pd.read_sql(query, conn, params=list(coin_ids), parse_dates=["date"])
+    finally:
+        conn.close()
+    return df
+
+
+def add_drawdown_columns(results: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """Join per-coin drawdown statistics onto a ranking.
+
+    Args:
+        results: Ranked results from rank_summary().
+        df: Price history covering at least the ranked coins.
+
+    Returns:
+        Ranking with the drawdown.STATS_COLUMNS appended.
+    """
+    if results.empty:
+        return results
+    stats = drawdown_stats(df).set_index("coin_id")
+    joined = results.join(stats, on="coin_id")
+    joined.index.name = "rank"
+    return joined
+
+
+def rank_by_drop(
+    df: pd.DataFrame,
+    top_n: int | None = TOP_N_RANKING,
+    as_of: str | pd.Timestamp | None = None,
+    drawdowns: bool = False,
+    ignore_outliers: bool = False,
+) -> pd.DataFrame:
     """Rank coins by biggest price drop from 2025 peak.
 
     Args:
         df: Full price DataFrame.
-        top_n: Number of top losers to return.
+        top_n: Number of top losers to return; None keeps every coin.
+        as_of: Rank as the data stood at the end of this day.
+        drawdowns: Append max drawdown, underwater duration, days since
+            peak, recovery time and episode count for each ranked coin.
+        ignore_outliers: Drop rows flagged by the data-quality outlier
+            checks (spikes, non-positive prices, ...) before taking peaks.
 
     Returns:
         DataFrame ranked by drop percentage (biggest drops first).
     """
-    results = []
-
-    for coin_id in df["coin_id"].unique():
-        coin_data = df[df["coin_id"] == coin_id]
-
-        # Skip coins with insufficient data
-        if len(coin_data) < MIN_DATA_DAYS:
-            logger.debug("Skipping %s: only %d data points", coin_id, len(coin_data))
-            continue
-
-        peak_row = coin_data.loc[coin_data["price"].idxmax()]
-        latest_row = coin_data.loc[coin_data["date"].idxmax()]
-
-        peak_price = float(peak_row["price"])
-        current_price = float(latest_row["price"])
-
-        # Skip zero-price coins
-        if peak_price <= 0 or current_price <= 0:
-            continue
-
-        pct_drop = calculate_drop_percentage(peak_price, current_price)
-
-        # Only include coins that have actually dropped
-        if pct_drop >= 0:
-            continue
-
-        results.append({
-            "coin_id": coin_id,
-            "coin_name": str(peak_row.get("coin_name", coin_id)),
-            "symbol": str(peak_row.get("symbol", "")),
-            "peak_price": peak_price,
-            "peak_date": peak_row["date"].strftime("%Y-%m-%d")
-            if hasattr(peak_row["date"], "strftime")
-            else str(peak_row["date"])[:10],
-            "current_price": current_price,
-            "current_date": latest_row["date"].strftime("%Y-%m-%d")
-            if hasattr(latest_row["date"], "strftime")
-            else str(latest_row["date"])[:10],
-            "pct_change": pct_drop,
-            "market_cap": float(latest_row.get("market_cap", 0)),
-            "volume": float(latest_row.get("volume", 0)),
-        })
-
-    results_df = pd.DataFrame(results)
-    if results_df.empty:
-        return results_df
+    if ignore_outliers:
+        from src.quality import drop_outliers
+
+        df = drop_outliers(df)
+    results = rank_summary(summarize_coins(df, as_of), top_n)
+    if drawdowns and not results.empty:
+        ranked = df[df["coin_id"].isin(results["coin_id"])]
+        if as_of is not None:
+            ranked = ranked[pd.to_datetime(ranked["date"]) < as_of_bound(as_of)]
+        results = add_drawdown_columns(results, ranked)
+    return results
 
-    results_df.sort_values("pct_change", ascending=True, inplace=True)
-    results_df = results_df.head(top_n)
-    results_df.reset_index(drop=True, inplace=True)
-    results_df.index += 1
-    results_df.index.name = "rank"
-    return results_df
+
+def rank_as_of(
+    as_of: str | pd.Timestamp,
+    source: str = "csv",
+    top_n: int = TOP_N_RANKING,
+) -> pd.DataFrame:
+    """Rank coins as they stood on a past date, reading from the price store.
+
+    Args:
+        as_of: Day to rank as of (inclusive).
+        source: Data source, either 'csv' or 'sqlite'.
+        top_n: Number of top losers to return.
+
+    Returns:
+        DataFrame ranked by drop percentage (biggest drops first).
+    """
+    if source == "sqlite" and DATABASE_PATH.exists():
+        return rank_summary(query_coin_summary(as_of=as_of), top_n)
+    return rank_by_drop(load_data(source), top_n, as_of=as_of)
 
 
 def generate_summary(results_df: pd.DataFrame) -> dict[str, Any]:
@@ -251,12 +519,18 @@ def generate_summary(results_df: pd.DataFrame) -> dict[str, Any]:
     if results_df.empty:
         return {"total_coins": 0}
 
+    p10, p25, p75, p90 = np.percentile(results_df["pct_change"].to_numpy(float),
+                                       [10, 25, 75, 90])
     return {
         "total_coins": len(results_df),
         "avg_drop_pct": round(float(results_df["pct_change"].mean()), 2),
         "median_drop_pct": round(float(results_df["pct_change"].median()), 2),
         "worst_drop_pct": round(float(results_df["pct_change"].min()), 2),
         "best_drop_pct": round(float(results_df["pct_change"].max()), 2),
+        "p10_drop_pct": round(float(p10), 2),
+        "p25_drop_pct": round(float(p25), 2),
+        "p75_drop_pct": round(float(p75), 2),
+        "p90_drop_pct": round(float(p90), 2),
         "total_market_cap": round(float(results_df["market_cap"].sum()), 2),
         "biggest_loser": str(results_df.iloc[0]["coin_name"]),
         "biggest_loser_drop": round(float(results_df.iloc[0]["pct_change"]), 2),
@@ -270,6 +544,9 @@ def export_results(
 ) -> Path:
     """Export analysis results to file.
 
+    The rank index is written as a CSV column and a JSON record field; a
+    '.gz' filepath is gzip-compressed.
+
     Args:
         results_df: Results DataFrame.
         fmt: Export format ('csv' or 'json').
@@ -281,44 +558,179 @@ def export_results(
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
     if filepath is None:
-        filepath = RESULTS_CSV if fmt == "csv" else DATA_DIR / "analysis_results.json"
+        filepath = RESULTS_CSV if fmt == "csv" else RESULTS_JSON
     filepath = Path(filepath)
 
-    if fmt == "json":
-        results_df.to_json(filepath, orient="records", indent=2)
-    else:
-        results_df.to_csv(filepath)
+    write_frame(results_df, fmt, filepath)
 
     logger.info("Exported results to %s", filepath)
     return filepath
 
 
-def run() -> pd.DataFrame:
+def print_ranking(results: pd.DataFrame, label: str) -> None:
+    """Print the top 20 rows of a ranking to stdout.
+
+    Args:
+        results: Ranked results from rank_by_drop().
+        label: Description of the peak the drops are measured from.
+    """
+    print(f"\nTop {len(results)} biggest drops from {label}:")
+    for rank, row in results.head(20).iterrows():
+        print(f"  {rank:>3d}. {row['symbol'].upper():>8s}  {row['pct_change']:+7.1f}%  "
+              f"peak ${row['peak_price']:.4f} -> now ${row['current_price']:.4f}")
+
+
+def input_fingerprint(source: str = "csv") -> str:
+    """Fingerprint the price store and parameters that feed the analysis.
+
+    Args:
+        source: Data source, either 'csv' or 'sqlite'.
+
+    Returns:
+        Hex digest that changes whenever the results would change.
+    """
+    use_sqlite = source == "sqlite" and DATABASE_PATH.exists()
+    store = DATABASE_PATH if use_sqlite else PRICES_CSV
+    params = {
+        **analysis_params(),
+        "source": "sqlite" if use_sqlite else "csv",
+        "schema": RESULTS_SCHEMA_VERSION,
+    }
+    return compute_fingerprint([store], params)
+
+
+def results_are_fresh(source: str = "csv") -> bool:
+    """Check whether the saved results were built from the current inputs.
+
+    Only stats the price store, so it is cheap enough to call on every page load.
+
+    Args:
+        source: Data source, either 'csv' or 'sqlite'.
+
+    Returns:
+        True if RESULTS_CSV and RANKING_PATH exist and match the current
+        input fingerprint.
+    """
+    fingerprint = input_fingerprint(source)
+    return is_fresh(RESULTS_CSV, fingerprint) and is_fresh(RANKING_PATH, fingerprint)
+
+
+def load_results() -> pd.DataFrame:
+    """Load previously exported results.
+
+    Returns:
+        Ranked results indexed by rank, or an empty DataFrame if none exist.
+    """
+    if not RESULTS_CSV.exists():
+        return pd.DataFrame()
+    return pd.read_csv(RESULTS_CSV, index_col="rank")
+
+
+def load_full_ranking(path: Path | str | None = None) -> pd.DataFrame:
+    """Load the untruncated ranking written by run().
+
+    Args:
+        path: Ranking file (defaults to RANKING_PATH).
+
+    Returns:
+        Every ranked coin indexed by rank, or an empty DataFrame if none exists.
+    """
+    path = Path(path) if path else RANKING_PATH
+    if not path.exists():
+        return pd.DataFrame()
+    return pd.read_pickle(path)
+
+
+def run(
+    source: str = "csv",
+    force: bool = False,
+    stream: bool = False,
+    workers: int = 1,
+    progress: Callable[[str], None] | None = None,
+) -> pd.DataFrame:
     """Main analysis pipeline: load data, compute drops, save results.
 
+    Args:
+        source: Data source, either 'csv' or 'sqlite'. With 'sqlite' the
+            per-coin aggregation runs inside the database.
+        force: Recompute even if the inputs are unchanged since the last run.
+        stream: Read the store in chunks instead of loading it whole, for
+            stores larger than memory.
+        workers: Analyze coin shards on this many processes.
+        progress: Called with a short message as each step starts, e.g. to
+            show progress in the dashboard. Steps are also logged at INFO.
+
+    The same pass also writes the untruncated ranking of every coin to
+    RANKING_PATH for the All Coins page, plus gzipped CSV and JSON exports
+    of it for downloads.
+
     Returns:
         DataFrame with ranked results.
     """
-    logger.info("Starting analysis pipeline")
+    def step(message: str) -> None:
+        logger.info(message)
+        if progress:
+            progress(message)
+
+    fingerprint = input_fingerprint(source)
+    if not force and is_fresh(RESULTS_CSV, fingerprint) and is_fresh(RANKING_PATH, fingerprint):
+        step("Inputs unchanged since last run, using cached results")
+        return load_results()
+
+    step("Ranking coins by drop from peak")
+
+    if stream:
+        from src.streaming import stream_history, stream_rank
+
+        ranking = stream_rank(source, top_n=None)
+        results = ranking.head(TOP_N_RANKING)
+        if not results.empty:
+            history = stream_history(results["coin_id"].tolist(), source)
+            results = add_drawdown_columns(results, history)
+    elif workers > 1:
+        from src.parallel import rank_parallel
+
+        # Workers compute drawdowns for every coin anyway
+        ranking = rank_parallel(load_data(source), workers, top_n=None)
+        results = ranking.head(TOP_N_RANKING)
+        ranking = ranking[RANKING_COLUMNS] if not ranking.empty else ranking
+    elif source == "sqlite" and DATABASE_PATH.exists():
+        ranking = rank_summary(query_coin_summary(), top_n=None)
+        results = ranking.head(TOP_N_RANKING)
+        # Only the ranked coins' histories are needed for drawdowns
+        if not results.empty:
+            history = query_coin_history(results["coin_id"].tolist())
+            results = add_drawdown_columns(results, history)
+    else:
+        df = load_data(source)
+        ranking = rank_summary(summarize_coins(df), top_n=None)
+        results = ranking.head(TOP_N_RANKING)
+        if not results.empty:
+            results = add_drawdown_columns(results, df[df["coin_id"].isin(results["coin_id"])])
 
-    df = load_data()
-    logger.info("Loaded %d rows for %d coins",
-                len(df), df["coin_id"].nunique())
+    logger.info("Ranked %d coins by drop percentage", len(ranking))
+    step("Saving results")
 
-    results = rank_by_drop(df)
-    logger.info("Ranked %d coins by drop percentage", len(results))
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    ranking.to_pickle(RANKING_PATH)
+    # Pre-built downloads, so the web process never re-serializes every coin
+    export_results(ranking, "csv", RANKING_EXPORT_CSV)
+    export_results(ranking, "json", RANKING_EXPORT_JSON)
+    write_stamp(RANKING_PATH, fingerprint, rows=len(ranking))
 
     if not results.empty:
         export_results(results, "csv")
         export_results(results, "json")
+        write_stamp(RESULTS_CSV, fingerprint, rows=len(results))
 
+        from src.simulation import summary_intervals
+
+        step("Summarizing results")
         summary = generate_summary(results)
         logger.info("Summary: %s", summary)
+        logger.info("Bootstrap intervals: %s", summary_intervals(results))
 
-        print(f"\nTop {len(results)} biggest drops from 2025 peak:")
-        for rank, row in results.head(20).iterrows():
-            print(f"  {rank:>3d}. {row['symbol'].upper():>8s}  {row['pct_change']:+7.1f}%  "
-                  f"peak ${row['peak_price']:.4f} -> now ${row['current_price']:.4f}")
+        print_ranking(results, "2025 peak")
     else:
         logger.warning("No coins with price drops found")
 
@@ -326,5 +738,38 @@ def run() -> pd.DataFrame:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank altcoins by drop from peak")
+    parser.add_argument("--source", choices=["csv", "sqlite"], default="csv",
+                        help="Price store to analyze")
+    parser.add_argument("--force", action="store_true",
+                        help="Recompute even if inputs are unchanged")
+    parser.add_argument("--peak-window",
+                        help="Measure drops from the peak within a window "
+                             "(all, ytd, 90d, 365d, ...) instead of the 2025 peak; "
+                             "prints the ranking without overwriting saved results")
+    parser.add_argument("--as-of", metavar="YYYY-MM-DD",
+                        help="Rank as the data stood on this date; prints the "
+                             "ranking without overwriting saved results")
+    parser.add_argument("--ignore-outliers", action="store_true",
+                        help="Skip rows flagged by the data-quality checks; prints "
+                             "the ranking without overwriting saved results")
+    parser.add_argument("--stream", action="store_true",
+                        help="Read the price store in chunks (bounded memory)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes to shard the analysis across")
+    args = parser.parse_args()
+
     logging.basicConfig(level=logging.INFO)
-    run()
+    if args.as_of:
+        print_ranking(rank_as_of(args.as_of, args.source), f"peak as of {args.as_of}")
+    elif args.ignore_outliers:
+        print_ranking(rank_by_drop(load_data(args.source), ignore_outliers=True),
+                      "2025 peak, outliers ignored")
+    elif args.peak_window:
+        from src.panel import get_panel
+        from src.range_max import RangeMaxIndex, rank_by_window
+
+        index = RangeMaxIndex(get_panel(args.source))
+        print_ranking(rank_by_window(index, args.peak_window), f"{args.peak_window} peak")
+    else:
+        run(source=args.source, force=args.force, stream=args.stream, workers=args.workers)
@@ -0,0 +1,432 @@
+"""Read-only HTTP/JSON API over the analyzer outputs and the price store.
+
+Endpoints:
+    GET /rankings?limit=&offset=        every ranked coin, biggest drop first
+    GET /coins/{id}/history?from=&to=   one coin's daily prices
+    GET /summary                        headline numbers of the ranking
+
+The server is the standard library's ThreadingHTTPServer over the same
+PriceStore the dashboard uses, reloaded when store_version() changes. Each
+distinct request is rendered to JSON once per data version and kept with
+its gzipped body and ETag, so a repeat request costs a dictionary lookup
+and a client sending If-None-Match gets a bodiless 304.
+
+Usage:
+    python -m src.api [--host 127.0.0.1] [--port 8502]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import pandas as pd
+
+from src.config import (
+    API_BACKLOG,
+    API_CACHE_SIZE,
+    API_GZIP_MIN_BYTES,
+    API_HOST,
+    API_PORT,
+    API_VERSION_INTERVAL,
+)
+from src.downsample import in_window
+from src.store import PriceStore, load_store, store_version
+
+logger = logging.getLogger(__name__)
+
+# Repeated on every history row, so returned once at the top instead
+COIN_COLUMNS = ["coin_id", "coin_name", "symbol"]
+NO_RESULTS = "No analysis results yet; run python -m src.analyzer"
+
+
+def _records(frame: pd.DataFrame) -> list[dict[str, Any]]:
+    """Rows as JSON-ready dicts, with a named index as the first field."""
+    if frame.index.name:
+        frame = frame.reset_index()
+    return json.loads(frame.to_json(orient="records", date_format="iso"))
+
+
+def _ranking(store: PriceStore) -> pd.DataFrame:
+    """The full ranking, or FileNotFoundError before the first analysis."""
+    ranking = store.all_drops
+    if ranking.empty:
+        raise FileNotFoundError(NO_RESULTS)
+    return ranking
+
+
+def rankings_payload(store: PriceStore, limit: int | None = None, offset: int = 0) -> dict:
+    """Every ranked coin, or one page of them.
+
+    Args:
+        store: Price and results store.
+        limit: Coins to return (all when None).
+        offset: Coins to skip from the top.
+
+    Returns:
+        Dict with the total count, the page bounds and the ranked records.
+    """
+    ranking = _ranking(store)
+    page = ranking.iloc[offset:None if limit is None else offset + limit]
+    return {"total": len(ranking), "offset": offset, "count": len(page),
+            "rankings": _records(page)}
+
+
+def history_payload(
+    store: PriceStore,
+    coin_id: str,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+) -> dict:
+    """One coin's price history, optionally limited to a date window.
+
+    Args:
+        store: Price and results store.
+        coin_id: Coin identifier.
+        start: First day (inclusive), or None.
+        end: Last day (inclusive), or None.
+
+    Returns:
+        Dict with the coin's identity and its dated rows.
+
+    Raises:
+        KeyError: If the coin has no price history.
+    """
+    rows = store.coin_history(coin_id)
+    if rows.empty:
+        raise KeyError(f"Unknown coin: {coin_id}")
+    identity = _records(rows[[c for c in COIN_COLUMNS if c in rows]].tail(1))[0]
+    if start is not None or end is not None:
+        rows = in_window(rows, start, rows["date"].max() if end is None else end)
+    return {**identity, "count": len(rows),
+            "history": _records(rows.drop(columns=list(identity)))}
+
+
+def summary_payload(store: PriceStore) -> dict:
+    """Headline numbers of the current ranking.
+
+    Args:
+        store: Price and results store.
+
+    Returns:
+        Dict with the coin count, mean and median drop, the biggest drop and
+        the latest price date.
+    """
+    ranking = _ranking(store)
+    pct_change = ranking["pct_change"]
+    summary = {
+        "coins": len(ranking),
+        "mean_pct_change": round(float(pct_change.mean()), 4),
+        "median_pct_change": round(float(pct_change.median()), 4),
+        "biggest_drop": _records(ranking.head(1))[0],
+    }
+    if "current_date" in ranking:
+        summary["as_of"] = str(pd.Timestamp(ranking["current_date"].max()).date())
+    return summary
+
+
+def _int_param(query: dict[str, str], name: str, default: int | None = None) -> int | None:
+    """Parse a non-negative integer query parameter."""
+    if name not in query:
+        return default
+    try:
+        value = int(query[name])
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise ValueError(f"{name} must be a non-negative integer")
+    return value
+
+
+def _date_param(query: dict[str, str], name: str) -> pd.Timestamp | None:
+    """Parse a date query parameter such as 2025-06-30.
+
+    Price dates are naive, so values with a timezone are rejected rather
+    than compared against them.
+    """
+    if not query.get(name):
+        return None
+    try:
+        value = pd.Timestamp(query[name])
+    except ValueError:
+        value = pd.NaT
+    if value is pd.NaT or value.tzinfo is not None:
+        raise ValueError(f"{name} must be a date like 2025-06-30, without a timezone")
+    return value
+
+
+def route(target: str) -> tuple[tuple, Callable[[PriceStore], dict]]:
+    """Resolve a request target to a cache key and a payload builder.
+
+    The key holds only the parsed parameters, so equivalent requests
+    (reordered or unknown query parameters) share one cache entry.
+
+    Args:
+        target: Request path with its query string.
+
+    Returns:
+        (cache key, function building the payload from a store).
+
+    Raises:
+        KeyError: If no endpoint matches.
+        ValueError: If a query parameter is malformed.
+    """
+    parts = urlsplit(target)
+    query = dict(parse_qsl(parts.query))
+    segments = [unquote(segment) for segment in parts.path.strip("/").split("/")]
+
+    if segments == ["rankings"]:
+        limit, offset = _int_param(query, "limit"), _int_param(query, "offset", 0)
+        return ("rankings", limit, offset), lambda store: rankings_payload(store, limit, offset)
+    if segments == ["summary"]:
+        return ("summary",), summary_payload
+    if len(segments) == 3 and segments[0] == "coins" and segments[2] == "history":
+        coin_id = segments[1]
+        start, end = _date_param(query, "from"), _date_param(query, "to")
+        return (("history", coin_id, start, end),
+                lambda store: history_payload(store, coin_id, start, end))
+    raise KeyError(f"Unknown path: {parts.path}")
+
+
+@dataclass(frozen=True)
+class Response:
+    """A rendered JSON response with its gzipped body and ETag."""
+
+    status: int
+    body: bytes
+    gzipped: bytes | None
+    etag: str
+    version: str
+
+    @classmethod
+    def render(cls, payload: dict, status: int = 200, version: str = "") -> "Response":
+        """Encode a payload, gzipping bodies of at least API_GZIP_MIN_BYTES.
+
+        The ETag is weak because the plain and gzipped bodies are the same
+        content; it hashes the body, so it survives data versions that did
+        not change this response.
+        """
+        body = json.dumps(payload, separators=(",", ":"), allow_nan=False).encode()
+        gzipped = gzip.compress(body, mtime=0) if len(body) >= API_GZIP_MIN_BYTES else None
+        etag = f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+        return cls(status, body, gzipped, etag, version)
+
+
+def error_response(error: Exception, version: str = "") -> Response:
+    """Map a payload error to its HTTP status: 404, 400 or 503."""
+    status = 503 if isinstance(error, FileNotFoundError) else (
+        404 if isinstance(error, KeyError) else 400)
+    return Response.render({"error": error.args[0]}, status, version)
+
+
+class ApiData:
+    """The current store and the responses rendered from it.
+
+    The store is reloaded under a lock when the data version changes, and
+    each response is rendered by one thread while concurrent requests for it
+    wait, so a burst of identical cold requests costs a single render.
+
+    Args:
+        loader: Returns a PriceStore over the current data files.
+        version: Returns the current data version.
+        cache_size: Rendered responses kept, least recently used dropped.
+        check_interval: Seconds between data version checks.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], PriceStore] = load_store,
+        version: Callable[[], str] = store_version,
+        cache_size: int = API_CACHE_SIZE,
+        check_interval: float = API_VERSION_INTERVAL,
+    ) -> None:
+        self._loader = loader
+        self._version = version
+        self._cache_size = cache_size
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        self._current: tuple[str, PriceStore] | None = None
+        self._checked = 0.0
+        self._responses: OrderedDict[tuple, Response] = OrderedDict()
+        self._rendering: dict[tuple, threading.Lock] = {}
+
+    def store(self) -> tuple[str, PriceStore]:
+        """Return the data version and its store, reloading if it changed."""
+        with self._lock:
+            now = time.monotonic()
+            if self._current is not None and now - self._checked < self._check_interval:
+                return self._current
+            version = self._version()
+            self._checked = now
+            if self._current is None or self._current[0] != version:
+                logger.info("Loading API store for data version %s", version[:12])
+                self._current = (version, self._loader())
+                self._responses.clear()
+            return self._current
+
+    def get(self, target: str) -> Response:
+        """Return the response for a request target, rendering it if needed.
+
+        Args:
+            target: Request path with its query string.
+
+        Returns:
+            The cached or freshly rendered response; errors become 4xx/503
+            responses and are not cached.
+        """
+        version, store = self.store()
+        try:
+            key, build = route(target)
+            key = (version, *key)
+        except (KeyError, ValueError) as e:
+            return error_response(e, version)
+
+        with self._lock:
+            if key in self._responses:
+                self._responses.move_to_end(key)
+                return self._responses[key]
+            rendering = self._rendering.setdefault(key, threading.Lock())
+        with rendering:
+            with self._lock:
+                if key in self._responses:
+                    return self._responses[key]
+            try:
+                payload = build(store)
+            except (KeyError, ValueError, FileNotFoundError) as e:
+                response = error_response(e, version)
+            else:
+                response = Response.render(payload, version=version)
+                with self._lock:
+                    self._responses[key] = response
+                    while len(self._responses) > self._cache_size:
+                        self._responses.popitem(last=False)
+            finally:
+                with self._lock:
+                    self._rendering.pop(key, None)
+        return response
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Whether an Accept-Encoding header allows gzip (and not with q=0)."""
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip().removeprefix("q=")
+        try:
+            return not params.strip() or float(q) > 0
+        except ValueError:
+            return False
+    return False
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Serves GET and HEAD from the server's ApiData, keeping connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle on, keep-alive
+    # clients wait out a delayed ACK between them
+    disable_nagle_algorithm = True
+    server: "ApiServer"
+
+    def do_GET(self) -> None:
+        """Send the response with its body."""
+        self._respond(send_body=True)
+
+    def do_HEAD(self) -> None:
+        """Send the response headers only."""
+        self._respond(send_body=False)
+
+    def _respond(self, send_body: bool) -> None:
+        try:
+            response = self.server.data.get(self.path)
+        except Exception:
+            logger.exception("Failed to render %s", self.path)
+            response = Response.render({"error": "Internal server error"}, 500)
+
+        if response.status == 200 and etag_matches(self.headers.get("If-None-Match"),
+                                                   response.etag):
+            self.send_response(304)
+            self._send_cache_headers(response)
+            self.end_headers()
+            return
+
+        body = response.body
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json")
+        if response.gzipped is not None and accepts_gzip(self.headers.get("Accept-Encoding")):
+            body = response.gzipped
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        if response.status == 200:
+            self._send_cache_headers(response)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_cache_headers(self, response: Response) -> None:
+        """Headers that let clients revalidate with If-None-Match."""
+        self.send_header("ETag", response.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("X-Data-Version", response.version[:12])
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Route the access log to the module logger at debug level."""
+        logger.debug("%s - " + format, self.address_string(), *args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    """Threaded API server, one thread per connection.
+
+    Args:
+        address: (host, port) to listen on; port 0 picks a free port.
+        data: Store and response cache (defaults to the data directory).
+    """
+
+    daemon_threads = True
+    request_queue_size = API_BACKLOG
+
+    def __init__(self, address: tuple[str, int], data: ApiData | None = None) -> None:
+        super().__init__(address, ApiHandler)
+        self.data = data or ApiData()
+
+
+def serve(host: str = API_HOST, port: int = API_PORT) -> None:
+    """Serve the API until interrupted.
+
+    Args:
+        host: Interface to listen on.
+        port: Port to listen on.
+    """
+    with ApiServer((host, port)) as server:
+        logger.info("Serving the API on http://%s:%d", host, server.server_address[1])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Stopping the API server")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Read-only rankings and history API")
+    parser.add_argument("--host", default=API_HOST, help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=API_PORT, help="Port to listen on")
+    args = parser.parse_args()
+    serve(args.host, args.port)
@@ -1,41 +1,191 @@
 """Ensure analysis results exist, running the analyzer if needed.
 
 Used by Streamlit pages to ensure data is available on first load.
-If price data exists but analysis results don't, runs the analyzer.
+If price data exists but analysis results are missing or were built from
+older inputs, the analyzer runs in a background thread so no page render
+waits for it. Only one analysis runs at a time: a lock in this process
+stops concurrent visitors from starting a second one, and ANALYSIS_LOCK on
+disk does the same across server processes and the CLI. Pages keep showing
+the last good results with a progress note; the caches built from the
+results are keyed on the files' data version, so they reload on their own
+once the run has written new ones.
 """
 
 import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
 
 import streamlit as st
 
-from src.config import PRICES_CSV, RESULTS_CSV
+from src.analyzer import input_fingerprint, results_are_fresh
+from src.config import (
+    ANALYSIS_LOCK,
+    ANALYSIS_LOCK_TIMEOUT,
+    PRICES_CSV,
+    PROGRESS_REFRESH,
+    RESULTS_CSV,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def ensure_data() -> bool:
-    """Run analysis if price data exists but results don't.
+@dataclass
+class AnalysisStatus:
+    """State of the background analysis in this process.
+
+    Attributes:
+        state: 'idle', 'running', 'done' or 'failed'.
+        fingerprint: Input fingerprint the run was started for.
+        started: Start time (epoch seconds).
+        finished: End time (epoch seconds).
+        message: Step the analysis last reported.
+        error: Error message if the run failed.
+    """
+
+    state: str = "idle"
+    fingerprint: str = ""
+    started: float | None = None
+    finished: float | None = None
+    message: str = ""
+    error: str = ""
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the run started (0 if it never did)."""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+_status = AnalysisStatus()
+_guard = threading.Lock()
+
+
+def analysis_status() -> AnalysisStatus:
+    """Return a snapshot of the background analysis status."""
+    with _guard:
+        return replace(_status)
+
+
+def _acquire_lock(path: Path) -> bool:
+    """Create the lock file, replacing one abandoned by a dead run.
+
+    Args:
+        path: Lock file path.
 
     Returns:
-        True if data is available, False otherwise.
+        True if this process now holds the lock.
     """
-    if RESULTS_CSV.exists() and RESULTS_CSV.stat().st_size > 0:
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                age = time.time() - path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if age < ANALYSIS_LOCK_TIMEOUT:
+                return False
+            logger.warning("Removing abandoned analysis lock %s (%.0fs old)", path, age)
+            path.unlink(missing_ok=True)
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(f"{os.getpid()}\n")
         return True
+    return False
 
-    if not PRICES_CSV.exists() or PRICES_CSV.stat().st_size == 0:
-        return False
 
+def _report_progress(message: str) -> None:
+    """Show the analyzer's current step in the progress note."""
+    with _guard:
+        _status.message = message
+
+
+def _analyze(lock_path: Path) -> None:
+    """Run the analyzer, record the outcome and release the lock."""
     try:
-        with st.spinner("Running analysis..."):
-            from src.analyzer import run as run_analysis
-            run_analysis()
+        from src.analyzer import run as run_analysis
+        run_analysis(progress=_report_progress)
+        outcome = {"state": "done", "error": ""}
+    except Exception as e:
+        logger.error("Background analysis failed: %s", e)
+        outcome = {"state": "failed", "error": str(e)}
+    finally:
+        lock_path.unlink(missing_ok=True)
+    with _guard:
+        _status.state = outcome["state"]
+        _status.error = outcome["error"]
+        _status.finished = time.time()
+
+
+def start_analysis(lock_path: Path | None = None) -> bool:
+    """Start the analyzer in a background thread unless a run is under way.
 
-        st.cache_data.clear()
+    Args:
+        lock_path: Lock file shared with other processes (defaults to
+            ANALYSIS_LOCK).
+
+    Returns:
+        True if this call started a run, False if one was already running
+        here or in another process.
+    """
+    global _status
+    lock_path = Path(lock_path) if lock_path else ANALYSIS_LOCK
+    with _guard:
+        if _status.state == "running" or not _acquire_lock(lock_path):
+            return False
+        _status = AnalysisStatus(
+            state="running",
+            fingerprint=input_fingerprint(),
+            started=time.time(),
+            message="Starting analysis",
+        )
+    threading.Thread(target=_analyze, args=(lock_path,), name="analysis", daemon=True).start()
+    logger.info("Started background analysis")
+    return True
+
+
+@st.fragment(run_every=PROGRESS_REFRESH)
+def _show_progress(has_results: bool) -> None:
+    """Show analysis progress, reloading the page once the run ends."""
+    status = analysis_status()
+    if status.state != "running" and not ANALYSIS_LOCK.exists():
         st.rerun()
+    if status.state != "running":
+        st.info("⏳ Analysis is running in another process...")
+        return
+    note = " Showing the previous results until it finishes." if has_results else ""
+    st.info(f"⏳ Updating analysis ({status.elapsed:.0f}s): {status.message.rstrip('.')}.{note}")
 
-    except Exception as e:
-        logger.error("Analysis failed: %s", e)
-        st.error(f"Failed to run analysis: {e}")
+
+def ensure_data() -> bool:
+    """Start analysis if price data exists but results are missing or stale.
+
+    Returns without waiting: while the analysis runs, pages get the last
+    good results (if any) and a progress note that reloads the page when
+    it is done.
+
+    Returns:
+        True if results are available to show, False otherwise.
+    """
+    has_results = RESULTS_CSV.exists() and RESULTS_CSV.stat().st_size > 0
+    has_prices = PRICES_CSV.exists() and PRICES_CSV.stat().st_size > 0
+
+    if has_results and (not has_prices or results_are_fresh()):
+        return True
+
+    if not has_prices:
         return False
 
-    return True
+    status = analysis_status()
+    if status.state == "failed" and status.fingerprint == input_fingerprint():
+        # Don't retry until the inputs change
+        st.error(f"Failed to run analysis: {status.error}")
+        return has_results
+
+    start_analysis()
+    _show_progress(has_results)
+    return has_results
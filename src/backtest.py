@@ -0,0 +1,400 @@
+"""Vectorized dip-buying backtests over the price panel.
+
+A strategy buys a coin at the close of a day on which it trades at least
+``entry_drawdown_pct`` below its running peak, and sells at the first close
+``take_profit_pct`` above the entry price or after ``max_hold_days``,
+whichever comes first. Each coin holds at most one position at a time and
+can re-enter the day after an exit.
+
+Every (strategy, coin) pair of a parameter grid is one row of the
+simulation. Rows advance trade by trade together: the next entry comes from
+a precomputed "next signal day" table, and the take-profit day is found by
+binary lifting over power-of-two window maxima (the same sparse-table idea
+as range_max), so each exit costs O(log max_hold_days) vectorized steps.
+The Python loop therefore runs once per trade number, not per day, coin or
+strategy. Large grids are split into chunks and fanned out over a process
+pool.
+"""
+
+import argparse
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.panel import Panel, forward_fill, get_panel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GRID = {
+    "entry_drawdown_pct": [30, 50, 70],
+    "take_profit_pct": [10, 25, 50],
+    "max_hold_days": [14, 30, 90],
+}
+
+EXIT_REASONS = np.array(["target", "time", "open"])
+TRADE_FIELDS = ("strategy", "coin", "entry", "exit", "ret", "reason")
+
+# Upper bound on (strategy, coin) rows simulated at once per chunk
+MAX_CHUNK_ROWS = 500_000
+
+# Price arrays shared with pool workers through the initializer
+_worker_arrays: tuple[np.ndarray, np.ndarray] | None = None
+
+
+@dataclass(frozen=True)
+class Strategy:
+    """Parameters of a dip-buying rule.
+
+    Attributes:
+        entry_drawdown_pct: Buy when the close is at least this far below
+            the running peak (e.g. 50 for -50%).
+        take_profit_pct: Sell when the close is this far above the entry.
+        max_hold_days: Sell at the close this many days after entry.
+    """
+
+    entry_drawdown_pct: float
+    take_profit_pct: float
+    max_hold_days: int
+
+
+@dataclass
+class BacktestResult:
+    """Trades and return summaries of a backtest.
+
+    Attributes:
+        strategies: One row per strategy (index = strategy id) with its
+            parameters.
+        trades: One row per trade, ordered by strategy, coin and entry.
+        per_coin: Per (strategy, coin) trade count, win rate and returns.
+        summary: Per-strategy aggregate returns, best first.
+    """
+
+    strategies: pd.DataFrame
+    trades: pd.DataFrame
+    per_coin: pd.DataFrame
+    summary: pd.DataFrame
+
+
+def parameter_grid(
+    entry_drawdown_pct: list[float],
+    take_profit_pct: list[float],
+    max_hold_days: list[int],
+) -> list[Strategy]:
+    """Build every combination of the given parameter values.
+
+    Returns:
+        List of strategies (cartesian product of the inputs).
+    """
+    return [Strategy(*combo) for combo in itertools.product(
+        entry_drawdown_pct, take_profit_pct, max_hold_days)]
+
+
+def prepare_arrays(panel: Panel) -> tuple[np.ndarray, np.ndarray]:
+    """Return the arrays simulate() runs on.
+
+    Args:
+        panel: Price panel.
+
+    Returns:
+        (forward-filled closes, drawdown from running peak). Drawdown is NaN
+        on days without a candle, so no trade opens on them.
+    """
+    prices = forward_fill(panel.price)
+    peak = np.fmax.accumulate(panel.price, axis=1)
+    with np.errstate(invalid="ignore"):
+        drawdown = panel.price / peak - 1
+    return prices, drawdown
+
+
+def _next_signal(drawdown: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """For each threshold, coin and day, the first entry day on or after it.
+
+    Returns:
+        int32 array of shape (thresholds, coins, days + 1); the number of
+        days marks "no further signal".
+    """
+    n_coins, n_days = drawdown.shape
+    sentinel = np.int32(n_days)
+    days = np.arange(n_days, dtype=np.int32)
+    out = np.full((len(thresholds), n_coins, n_days + 1), sentinel, dtype=np.int32)
+    with np.errstate(invalid="ignore"):
+        for k, threshold in enumerate(thresholds):
+            signal_day = np.where(drawdown <= -threshold / 100, days, sentinel)
+            out[k, :, :-1] = np.minimum.accumulate(signal_day[:, ::-1], axis=1)[:, ::-1]
+    return out
+
+
+def _window_max_levels(prices: np.ndarray, max_span: int) -> list[np.ndarray]:
+    """Level k holds the max close over [day, day + 2**k - 1] (clipped at the end)."""
+    levels = [prices]
+    span = 1
+    while 2 * span <= max_span:
+        prev = levels[-1]
+        level = prev.copy()
+        level[:, :-span] = np.fmax(prev[:, :-span], prev[:, span:])
+        levels.append(level)
+        span *= 2
+    return levels
+
+
+def _first_at_least(levels: list[np.ndarray], coin: np.ndarray, start: np.ndarray,
+                    stop: np.ndarray, threshold: np.ndarray) -> np.ndarray:
+    """First day in [start, stop] whose close reaches threshold, else stop + 1.
+
+    Greedily skips the largest power-of-two blocks that lie inside the range
+    and stay below the threshold.
+    """
+    n_days = levels[0].shape[1]
+    pos = start.copy()
+    for k in range(len(levels) - 1, -1, -1):
+        span = 1 << k
+        inside = pos + span - 1 <= stop
+        below = levels[k][coin, np.minimum(pos, n_days - 1)] < threshold
+        pos = np.where(inside & below, pos + span, pos)
+    return pos
+
+
+def simulate(prices: np.ndarray, drawdown: np.ndarray,
+             params: np.ndarray) -> dict[str, np.ndarray]:
+    """Run a chunk of strategies over every coin.
+
+    Args:
+        prices: Forward-filled closes, shape (coins, days).
+        drawdown: Drawdown from running peak on observed days (NaN
+            elsewhere), shape (coins, days).
+        params: Array of shape (strategies, 3) with entry drawdown %, take
+            profit % and max hold days per strategy.
+
+    Returns:
+        Dict of equal-length trade arrays: strategy (chunk-local), coin,
+        entry, exit (day columns), ret (fraction) and reason (index into
+        EXIT_REASONS).
+    """
+    n_coins, n_days = prices.shape
+    n_strategies = len(params)
+    thresholds, threshold_of = np.unique(params[:, 0], return_inverse=True)
+    next_signal = _next_signal(drawdown, thresholds)
+    targets = 1 + params[:, 1] / 100
+    holds = params[:, 2].astype(np.int64)
+    levels = _window_max_levels(prices, int(holds.max()) if n_strategies else 1)
+
+    strategy = np.repeat(np.arange(n_strategies), n_coins)
+    coin = np.tile(np.arange(n_coins), n_strategies)
+    position = np.zeros(len(strategy), dtype=np.int64)
+    rows = np.arange(len(strategy))
+    trades: dict[str, list[np.ndarray]] = {key: [] for key in TRADE_FIELDS}
+
+    while rows.size:
+        g, c = strategy[rows], coin[rows]
+        entry = next_signal[threshold_of[g], c, position[rows]].astype(np.int64)
+        has_entry = entry < n_days
+        rows, g, c, entry = rows[has_entry], g[has_entry], c[has_entry], entry[has_entry]
+        if not rows.size:
+            break
+
+        entry_price = prices[c, entry]
+        time_exit = entry + holds[g]
+        stop = np.minimum(time_exit, n_days - 1)
+        hit_day = _first_at_least(levels, c, entry + 1, stop, entry_price * targets[g])
+        hit = hit_day <= stop
+        exit_day = np.where(hit, hit_day, stop)
+        reason = np.where(hit, 0, np.where(time_exit < n_days, 1, 2))
+
+        trades["strategy"].append(g)
+        trades["coin"].append(c)
+        trades["entry"].append(entry)
+        trades["exit"].append(exit_day)
+        trades["ret"].append(prices[c, exit_day] / entry_price - 1)
+        trades["reason"].append(reason)
+
+        position[rows] = exit_day + 1
+        rows = rows[position[rows] < n_days]
+
+    return _merge_trades([{key: np.concatenate(parts) for key, parts in trades.items()}]
+                         if trades["strategy"] else [])
+
+
+def _merge_trades(parts: list[dict[str, np.ndarray]],
+                  offsets: list[int] | None = None) -> dict[str, np.ndarray]:
+    """Concatenate trade arrays, shifting chunk-local strategy ids by offsets."""
+    merged = {}
+    for key in TRADE_FIELDS:
+        dtype = float if key == "ret" else np.int64
+        arrays = [part[key].astype(dtype) for part in parts]
+        if key == "strategy" and offsets is not None:
+            arrays = [values + offset for values, offset in zip(arrays, offsets)]
+        merged[key] = np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype)
+    return merged
+
+
+def _init_worker(prices: np.ndarray, drawdown: np.ndarray) -> None:
+    """Receive the panel arrays once per worker process."""
+    global _worker_arrays
+    _worker_arrays = (prices, drawdown)
+
+
+def _simulate_in_worker(params: np.ndarray) -> dict[str, np.ndarray]:
+    """Run simulate() on the arrays handed to this worker."""
+    return simulate(*_worker_arrays, params)
+
+
+def _chunks(params: np.ndarray, n_coins: int, workers: int) -> list[np.ndarray]:
+    """Split the grid into at most MAX_CHUNK_ROWS rows per chunk, >= 1 per worker."""
+    n_chunks = max(int(np.ceil(len(params) * n_coins / MAX_CHUNK_ROWS)), workers)
+    return np.array_split(params, min(n_chunks, len(params)))
+
+
+def _trade_frame(panel: Panel, prices: np.ndarray,
+                 raw: dict[str, np.ndarray]) -> pd.DataFrame:
+    """Label raw trade arrays with coin ids and dates.
+
+    coin_id and exit_reason are categoricals built from the integer codes,
+    which keeps million-row trade tables cheap to build and hold.
+    """
+    dates = pd.to_datetime(panel.dates)
+    entry_price = prices[raw["coin"], raw["entry"]]
+    return pd.DataFrame({
+        "strategy": raw["strategy"],
+        "coin_id": pd.Categorical.from_codes(raw["coin"], panel.coins.tolist()),
+        "entry_date": dates[raw["entry"]],
+        "exit_date": dates[raw["exit"]],
+        "entry_price": entry_price,
+        "exit_price": entry_price * (1 + raw["ret"]),
+        "return_pct": raw["ret"] * 100,
+        "holding_days": raw["exit"] - raw["entry"],
+        "exit_reason": pd.Categorical.from_codes(raw["reason"], EXIT_REASONS.tolist()),
+    })
+
+
+def summarize_trades(panel: Panel, raw: dict[str, np.ndarray],
+                     strategies: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Reduce raw trades to per-coin and per-strategy returns.
+
+    Sums are taken with bincount over integer (strategy, coin) keys rather
+    than a grouped DataFrame, which dominates the run time for large grids.
+    Open positions are marked to the last close and count as trades.
+
+    Args:
+        panel: Panel the trades were simulated on.
+        raw: Trade arrays from simulate() with global strategy ids.
+        strategies: Strategy parameters indexed by strategy id.
+
+    Returns:
+        (per_coin, summary). per_coin has trades, win_rate_pct,
+        avg_return_pct, total_return_pct (compounded) and avg_hold_days per
+        strategy and coin. summary has one row per strategy with trades,
+        coins_traded, win_rate_pct, avg_return_pct, median_return_pct,
+        avg_coin_return_pct (mean of per-coin compounded returns),
+        avg_hold_days and open_trades, sorted by avg_coin_return_pct.
+    """
+    n_coins, n_strategies = len(panel.coins), len(strategies)
+    ret, hold = raw["ret"], raw["exit"] - raw["entry"]
+    win = (ret > 0).astype(float)
+
+    key = raw["strategy"] * n_coins + raw["coin"]
+    size = n_strategies * n_coins
+    count = np.bincount(key, minlength=size)
+    traded = np.flatnonzero(count)
+    n = count[traded]
+    total = np.expm1(np.bincount(key, np.log1p(ret), size)[traded]) * 100
+    per_coin = pd.DataFrame({
+        "strategy": traded // n_coins,
+        "coin_id": panel.coins[traded % n_coins],
+        "trades": n,
+        "win_rate_pct": np.bincount(key, win, size)[traded] / n * 100,
+        "avg_return_pct": np.bincount(key, ret, size)[traded] / n * 100,
+        "total_return_pct": total,
+        "avg_hold_days": np.bincount(key, hold, size)[traded] / n,
+    }).sort_values(["strategy", "total_return_pct"], ascending=[True, False],
+                   kind="stable", ignore_index=True)
+
+    strategy = raw["strategy"]
+    trades = np.bincount(strategy, minlength=n_strategies)
+    coins_traded = np.bincount(traded // n_coins, minlength=n_strategies)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        summary = strategies.assign(
+            trades=trades,
+            coins_traded=coins_traded,
+            win_rate_pct=np.bincount(strategy, win, n_strategies) / trades * 100,
+            avg_return_pct=np.bincount(strategy, ret, n_strategies) / trades * 100,
+            median_return_pct=pd.Series(ret * 100).groupby(strategy).median()
+            .reindex(strategies.index).to_numpy(),
+            avg_coin_return_pct=np.bincount(traded // n_coins, total, n_strategies)
+            / coins_traded,
+            avg_hold_days=np.bincount(strategy, hold, n_strategies) / trades,
+            open_trades=np.bincount(strategy, raw["reason"] == 2, n_strategies).astype(int),
+        )
+    summary = summary.sort_values("avg_coin_return_pct", ascending=False, kind="stable")
+    return per_coin, summary
+
+
+def run_backtest(
+    panel: Panel,
+    strategies: list[Strategy],
+    workers: int = 1,
+) -> BacktestResult:
+    """Backtest a grid of dip-buying strategies on every coin of a panel.
+
+    Args:
+        panel: Price panel.
+        strategies: Strategies to evaluate (see parameter_grid()).
+        workers: Worker processes; 1 simulates in-process.
+
+    Returns:
+        BacktestResult with trades, per-coin and aggregate returns.
+    """
+    table = pd.DataFrame([asdict(s) for s in strategies],
+                         columns=list(Strategy.__dataclass_fields__))
+    table.index.name = "strategy"
+    params = table.to_numpy(float)
+    prices, drawdown = prepare_arrays(panel)
+
+    raw_parts, offsets = [], []
+    if len(params) and panel.coins.size and panel.dates.size:
+        chunks = _chunks(params, len(panel.coins), workers)
+        offsets = np.cumsum([0] + [len(chunk) for chunk in chunks[:-1]]).tolist()
+        logger.info("Backtesting %d strategies x %d coins in %d chunks on %d workers",
+                    len(params), len(panel.coins), len(chunks), workers)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(prices, drawdown)) as pool:
+                raw_parts = list(pool.map(_simulate_in_worker, chunks))
+        else:
+            raw_parts = [simulate(prices, drawdown, chunk) for chunk in chunks]
+
+    raw = _merge_trades(raw_parts, offsets)
+    order = np.lexsort((raw["entry"], raw["coin"], raw["strategy"]))
+    raw = {key: values[order] for key, values in raw.items()}
+    per_coin, summary = summarize_trades(panel, raw, table)
+    trades = _trade_frame(panel, prices, raw)
+    return BacktestResult(strategies=table, trades=trades, per_coin=per_coin, summary=summary)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest dip-buying rules on all coins")
+    parser.add_argument("--source", choices=["csv", "sqlite"], default="csv",
+                        help="Price store to analyze")
+    parser.add_argument("--entry", type=float, nargs="+",
+                        default=DEFAULT_GRID["entry_drawdown_pct"],
+                        help="Entry drawdowns from peak in %% (e.g. 30 50)")
+    parser.add_argument("--take-profit", type=float, nargs="+",
+                        default=DEFAULT_GRID["take_profit_pct"],
+                        help="Take-profit rebounds in %%")
+    parser.add_argument("--hold", type=int, nargs="+",
+                        default=DEFAULT_GRID["max_hold_days"],
+                        help="Maximum holding periods in days")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for the parameter grid")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Number of strategies to print")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    result = run_backtest(get_panel(args.source),
+                          parameter_grid(args.entry, args.take_profit, args.hold),
+                          workers=args.workers)
+    print(result.summary.head(args.top).round(2).to_string())
@@ -0,0 +1,219 @@
+"""Plotly figures for the dashboard pages.
+
+Each builder is a pure function of its data, so pages can cache the
+finished figure keyed on the data version and the widget values that
+shaped it, and a rerun that did not change those inputs reuses the figure
+instead of rebuilding it. Cached figures are shared between sessions, so
+callers must not modify what a builder returns.
+"""
+
+import logging
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+logger = logging.getLogger(__name__)
+
+ACCENT = "#667eea"
+DROP_RED = "#ff4444"
+
+
+def drop_bar(
+    frame: pd.DataFrame,
+    hover_data: list[str],
+    height: int = 500,
+    y_label: str = "% Drop from Peak",
+) -> go.Figure:
+    """Bar chart of each coin's drop from peak, coloured by size.
+
+    Args:
+        frame: Ranked coins with symbol and pct_change.
+        hover_data: Extra columns shown on hover.
+        height: Figure height in pixels.
+        y_label: Label for the pct_change axis.
+
+    Returns:
+        The figure.
+    """
+    fig = px.bar(
+        frame,
+        x="symbol",
+        y="pct_change",
+        color="pct_change",
+        color_continuous_scale="RdYlGn",
+        labels={"pct_change": y_label, "symbol": "Coin"},
+        hover_data=[c for c in hover_data if c in frame.columns],
+        text="pct_change",
+    )
+    fig.update_traces(texttemplate="%{text:.1f}%", textposition="outside")
+    fig.update_layout(height=height, xaxis_tickangle=-45, showlegend=False)
+    return fig
+
+
+def drop_histogram(pct_change: pd.Series, nbins: int = 20) -> go.Figure:
+    """Histogram of drops from peak.
+
+    Args:
+        pct_change: Drop percentages.
+        nbins: Number of bins.
+
+    Returns:
+        The figure.
+    """
+    fig = px.histogram(
+        pct_change.rename("pct_change").to_frame(),
+        x="pct_change",
+        nbins=nbins,
+        labels={"pct_change": "% Drop from Peak"},
+        color_discrete_sequence=[ACCENT],
+    )
+    fig.update_layout(height=350)
+    return fig
+
+
+def percentile_bands(bands: pd.DataFrame, value_label: str) -> go.Figure:
+    """Daily percentile lines across all coins.
+
+    Args:
+        bands: QuantileSketch.to_frame() output with label and p10..p90.
+        value_label: Axis label for the metric.
+
+    Returns:
+        The figure.
+    """
+    long = bands.dropna(subset=["p50"]).melt(
+        id_vars="label", value_vars=["p10", "p25", "p50", "p75", "p90"],
+        var_name="percentile", value_name="value")
+    fig = px.line(
+        long,
+        x="label",
+        y="value",
+        color="percentile",
+        labels={"label": "Date", "value": value_label},
+        color_discrete_sequence=px.colors.sequential.Plasma,
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+def price_history(
+    points: pd.DataFrame,
+    peak_date: pd.Timestamp,
+    peak_price: float,
+    overlays: dict[str, pd.DataFrame] | None = None,
+) -> go.Figure:
+    """Price line with the peak marked and optional indicator overlays.
+
+    Args:
+        points: Rows with date and price.
+        peak_date: Date of the 2025 peak.
+        peak_price: Peak price.
+        overlays: Indicator column name -> rows with date and that column.
+
+    Returns:
+        The figure.
+    """
+    fig = px.line(points, x="date", y="price", labels={"price": "Price (USD)", "date": "Date"})
+    fig.add_trace(go.Scatter(
+        x=[peak_date],
+        y=[peak_price],
+        mode="markers+text",
+        marker=dict(size=12, color="red", symbol="star"),
+        text=[f"Peak: ${peak_price:.4f}"],
+        textposition="top center",
+        name="2025 Peak",
+        showlegend=True,
+    ))
+    for column, rows in (overlays or {}).items():
+        fig.add_trace(go.Scatter(
+            x=rows["date"],
+            y=rows[column],
+            mode="lines",
+            line=dict(width=1, dash="dot" if "bb_" in column else None),
+            name=column.upper().replace("_", " "),
+        ))
+    fig.update_layout(height=450, hovermode="x unified")
+    return fig
+
+
+def volume_bars(points: pd.DataFrame) -> go.Figure:
+    """Trading volume bars.
+
+    Args:
+        points: Rows with date and volume.
+
+    Returns:
+        The figure.
+    """
+    fig = px.bar(
+        points,
+        x="date",
+        y="volume",
+        labels={"volume": "Volume (USD)", "date": "Date"},
+        color_discrete_sequence=[ACCENT],
+    )
+    fig.update_layout(height=300)
+    return fig
+
+
+def drawdown_area(series: pd.DataFrame) -> go.Figure:
+    """Area chart of the percentage below the running peak.
+
+    Args:
+        series: RankHistory.coin_series() rows.
+
+    Returns:
+        The figure.
+    """
+    fig = px.area(
+        series,
+        x="date",
+        y="drawdown_pct",
+        labels={"drawdown_pct": "% from Running Peak", "date": "Date"},
+        color_discrete_sequence=[DROP_RED],
+    )
+    fig.update_layout(height=300)
+    return fig
+
+
+def rank_line(series: pd.DataFrame) -> go.Figure:
+    """Daily drop rank, best (1) at the top.
+
+    Args:
+        series: RankHistory.coin_series() rows.
+
+    Returns:
+        The figure.
+    """
+    fig = px.line(
+        series,
+        x="date",
+        y="rank",
+        labels={"rank": "Drop Rank", "date": "Date"},
+        color_discrete_sequence=[ACCENT],
+    )
+    fig.update_yaxes(autorange="reversed")
+    fig.update_layout(height=300)
+    return fig
+
+
+def candlestick(rows: pd.DataFrame) -> go.Figure:
+    """Candlestick of recent rows, opening at the previous close.
+
+    Args:
+        rows: Rows with date and price (high/low used when present).
+
+    Returns:
+        The figure.
+    """
+    fig = go.Figure(data=[go.Candlestick(
+        x=rows["date"],
+        open=rows["price"].shift(1).fillna(rows["price"]),
+        high=rows.get("high", rows["price"]),
+        low=rows.get("low", rows["price"]),
+        close=rows["price"],
+        name="Price",
+    )])
+    fig.update_layout(height=400, xaxis_rangeslider_visible=False)
+    return fig
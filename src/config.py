@@ -14,6 +14,19 @@ LOG_DIR = PROJECT_ROOT / "logs"
 DATABASE_PATH = Path(os.getenv("DATABASE_PATH", DATA_DIR / "altcoins.db"))
 PRICES_CSV = DATA_DIR / "altcoin_prices.csv"
 RESULTS_CSV = DATA_DIR / "analysis_results.csv"
+RESULTS_JSON = DATA_DIR / "analysis_results.json"
+RANKING_PATH = DATA_DIR / "full_ranking.pkl"  # every ranked coin, no top-N cut
+RANKING_EXPORT_CSV = DATA_DIR / "full_ranking.csv.gz"
+RANKING_EXPORT_JSON = DATA_DIR / "full_ranking.json.gz"
+PANEL_PATH = DATA_DIR / "price_panel.npz"
+RANK_HISTORY_PATH = DATA_DIR / "rank_history.npz"
+INDICATORS_PATH = DATA_DIR / "indicators.pkl"
+CORRELATION_PATH = DATA_DIR / "correlation.npz"
+BENCHMARK_CSV = DATA_DIR / "benchmark_prices.csv"
+QUARANTINE_CSV = DATA_DIR / "quarantine.csv"
+QUALITY_REPORT_CSV = DATA_DIR / "quality_report.csv"
+SKETCHES_PATH = DATA_DIR / "summary_sketches.npz"
+ANALYSIS_LOCK = DATA_DIR / "analysis.lock"  # held while a background analysis runs
 
 # Exchange via CCXT
 EXCHANGE_ID = os.getenv("EXCHANGE_ID", "bybit")
@@ -29,13 +42,45 @@ EXCLUDE_SYMBOLS = frozenset({
     "USDE", "USD", "PYUSD",
 })
 
+# Benchmarks for beta; stored apart from the altcoin data so they never rank
+BENCHMARK_SYMBOLS = ("BTC", "ETH")
+
 # Analysis
 MIN_DATA_DAYS = 30
 TOP_N_RANKING = 50
 DEFAULT_COIN_LIMIT = 200
+STREAM_CHUNKSIZE = 100_000  # rows per chunk in streaming (out-of-core) mode
+CORRELATION_BLOCK = 256  # coins per block in the correlation engine
+MIN_OVERLAP_DAYS = 30  # shared return days needed for a correlation or beta
+BOOTSTRAP_PATHS = 1000  # simulated paths per coin for confidence intervals
+BOOTSTRAP_BLOCK_DAYS = 10  # block length of the return bootstrap
+SIMULATION_HORIZON_DAYS = 365
+CONFIDENCE_LEVEL = 0.90  # two-sided interval (5th to 95th percentile)
+SKETCH_ACCURACY = 0.01  # relative error of sketched percentiles
+VOLATILITY_WINDOW = 30  # days in the rolling volatility of daily summaries
+
+# Data quality
+SPIKE_RATIO = 3.0  # close this many times above/below its local median is a spike
+SPIKE_WINDOW = 7  # days in the centered median window for spike detection
+STALE_CLOSE_DAYS = 5  # identical closes in a row before they count as stale
+ZERO_VOLUME_DAYS = 3  # zero-volume days in a row before they are flagged
 
 # Date range
 START_DATE = "2025-01-01"
 
 # Dashboard
-CACHE_TTL = 3600  # 1 hour
+COIN_CACHE_SIZE = 32  # recently viewed coin histories kept in memory
+CHART_POINT_BUDGET = 2000  # max points per chart series sent to the browser
+CHART_CACHE_SIZE = 64  # downsampled series and figures kept per cache
+TABLE_PAGE_SIZE = 50  # rows per page in the ranking tables
+EXPORT_CACHE_SIZE = 16  # filtered download payloads kept per table
+ANALYSIS_LOCK_TIMEOUT = 3600  # seconds before an analysis lock counts as abandoned
+PROGRESS_REFRESH = 2  # seconds between background analysis progress checks
+
+# API
+API_HOST = "127.0.0.1"
+API_PORT = 8502
+API_CACHE_SIZE = 256  # rendered responses kept per data version
+API_GZIP_MIN_BYTES = 1024  # smaller bodies are sent uncompressed
+API_VERSION_INTERVAL = 1.0  # seconds between data version checks
+API_BACKLOG = 512  # pending connections queued by the listening socket
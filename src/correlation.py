@@ -0,0 +1,370 @@
+"""Blocked pairwise return correlations and betas versus benchmark assets.
+
+Daily returns are taken from the price panel, so every coin is already
+aligned on one calendar. A return is missing when either of its two days
+has no price, and each pair of coins is compared only over the days where
+both have a return (pairwise-complete, like DataFrame.corr). Instead of
+looping over pairs, the engine expresses the overlap counts and co-moments
+as matrix products of value and mask arrays, and walks the upper triangle
+in square blocks of coins so peak memory stays at a few block-sized
+matrices. The correlation matrix is cached to disk keyed on the input
+fingerprint.
+
+Betas are measured against BTC/ETH, which the fetcher stores in a separate
+BENCHMARK_CSV (``python -m src.data_fetcher --benchmarks``) so they never
+enter the drop ranking.
+"""
+
+import argparse
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer import input_fingerprint
+from src.config import (
+    BENCHMARK_CSV,
+    CORRELATION_BLOCK,
+    CORRELATION_PATH,
+    MIN_OVERLAP_DAYS,
+)
+from src.fingerprint import is_fresh, write_stamp
+from src.panel import Panel, build_panel, get_panel
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CorrelationMatrix:
+    """Symmetric matrix of daily return correlations.
+
+    Attributes:
+        coins: Coin identifiers, one per row/column.
+        matrix: float32 correlations, NaN where two coins share fewer than
+            the minimum number of return days.
+    """
+
+    coins: np.ndarray
+    matrix: np.ndarray
+
+    def _index(self, coin_id: str) -> int:
+        """Return the row of a coin, raising KeyError if unknown."""
+        matches = np.flatnonzero(self.coins == coin_id)
+        if matches.size == 0:
+            raise KeyError(coin_id)
+        return int(matches[0])
+
+    def pair(self, coin_a: str, coin_b: str) -> float:
+        """Return the correlation between two coins.
+
+        Raises:
+            KeyError: If either coin is unknown.
+        """
+        return float(self.matrix[self._index(coin_a), self._index(coin_b)])
+
+    def most_correlated(self, coin_id: str, n: int = 10) -> pd.DataFrame:
+        """List the coins whose returns move most closely with a coin.
+
+        Args:
+            coin_id: Coin identifier.
+            n: Number of coins to return.
+
+        Returns:
+            DataFrame with coin_id and correlation, highest first, excluding
+            the coin itself and pairs without enough overlap.
+
+        Raises:
+            KeyError: If the coin is unknown.
+        """
+        row = self._index(coin_id)
+        frame = pd.DataFrame({"coin_id": self.coins, "correlation": self.matrix[row]})
+        frame = frame.drop(index=row).dropna(subset=["correlation"])
+        return frame.sort_values("correlation", ascending=False, kind="stable").head(n)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the matrix as a DataFrame labeled by coin_id."""
+        return pd.DataFrame(self.matrix, index=self.coins, columns=self.coins)
+
+
+def daily_returns(prices: np.ndarray) -> np.ndarray:
+    """Compute simple daily returns along the day axis.
+
+    Args:
+        prices: Array of shape (coins, days) with NaN for missing days.
+
+    Returns:
+        Array of shape (coins, days - 1); NaN where either day is missing.
+    """
+    if prices.shape[-1] < 2:
+        return np.empty(prices.shape[:-1] + (0,))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = prices[..., 1:] / prices[..., :-1] - 1
+    returns[~np.isfinite(returns)] = np.nan
+    return returns
+
+
+def _centered(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return (values minus row mean with NaN as 0, observed mask as float)."""
+    mask = ~np.isnan(values)
+    filled = np.where(mask, values, 0.0)
+    counts = mask.sum(axis=1, keepdims=True)
+    means = np.zeros_like(counts, dtype=float)
+    np.divide(filled.sum(axis=1, keepdims=True), counts, out=means, where=counts > 0)
+    return np.where(mask, filled - means, 0.0), mask.astype(float)
+
+
+def _co_moments(
+    xa: np.ndarray, ma: np.ndarray, xb: np.ndarray, mb: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Pairwise-complete overlap counts and (unnormalized) co-moments.
+
+    Rows of a are compared with rows of b over the columns where both are
+    observed. Inputs come from _centered(); centering each row first keeps
+    the sum-of-products formulas numerically stable.
+
+    Returns:
+        (count, covariance, variance of a, variance of b), each of shape
+        (rows of a, rows of b). Moments are sums over the overlap, i.e. not
+        divided by the count, which cancels in correlations and betas.
+    """
+    count = ma @ mb.T
+    sum_a = xa @ mb.T
+    sum_b = ma @ xb.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = xa @ xb.T - sum_a * sum_b / count
+        var_a = (xa * xa) @ mb.T - sum_a * sum_a / count
+        var_b = ma @ (xb * xb).T - sum_b * sum_b / count
+    return count, cov, var_a, var_b
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Divide where valid and the denominator is positive, NaN elsewhere."""
+    ok = valid & (denominator > 0)
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=ok)
+    return out
+
+
+def _correlation(cov: np.ndarray, var_a: np.ndarray, var_b: np.ndarray,
+                 valid: np.ndarray) -> np.ndarray:
+    """Turn co-moments into correlations clipped to [-1, 1]."""
+    scale = np.sqrt(np.clip(var_a, 0, None) * np.clip(var_b, 0, None))
+    return np.clip(_ratio(cov, scale, valid), -1, 1)
+
+
+def pairwise_correlation(
+    returns: np.ndarray,
+    block_size: int = CORRELATION_BLOCK,
+    min_periods: int = MIN_OVERLAP_DAYS,
+) -> np.ndarray:
+    """Compute the pairwise-complete correlation matrix of return rows.
+
+    Args:
+        returns: Array of shape (coins, days) with NaN for missing returns.
+        block_size: Coins per block; bounds memory to O(block_size * days).
+        min_periods: Minimum shared days for a correlation; NaN below it.
+
+    Returns:
+        float32 array of shape (coins, coins).
+    """
+    n_coins = returns.shape[0]
+    result = np.full((n_coins, n_coins), np.nan, dtype=np.float32)
+    values, mask = _centered(returns)
+    block_size = max(int(block_size), 1)
+
+    for i in range(0, n_coins, block_size):
+        xa, ma = values[i:i + block_size], mask[i:i + block_size]
+        for j in range(i, n_coins, block_size):
+            xb, mb = values[j:j + block_size], mask[j:j + block_size]
+            count, cov, var_a, var_b = _co_moments(xa, ma, xb, mb)
+            corr = _correlation(cov, var_a, var_b, count >= min_periods)
+            result[i:i + block_size, j:j + block_size] = corr
+            result[j:j + block_size, i:i + block_size] = corr.T
+    return result
+
+
+def compute_correlation(
+    panel: Panel,
+    block_size: int = CORRELATION_BLOCK,
+    min_periods: int = MIN_OVERLAP_DAYS,
+) -> CorrelationMatrix:
+    """Correlate the daily returns of every coin in a panel.
+
+    Args:
+        panel: Price panel.
+        block_size: Coins per block.
+        min_periods: Minimum shared return days per pair.
+
+    Returns:
+        CorrelationMatrix over the panel's coins.
+    """
+    returns = daily_returns(panel.price)
+    logger.info("Correlating %d coins over %d return days in blocks of %d",
+                returns.shape[0], returns.shape[1], block_size)
+    return CorrelationMatrix(
+        coins=panel.coins,
+        matrix=pairwise_correlation(returns, block_size, min_periods),
+    )
+
+
+def save_correlation(corr: CorrelationMatrix, path: Path | str | None = None) -> Path:
+    """Write a correlation matrix to a compressed .npz file.
+
+    Args:
+        corr: Matrix to save.
+        path: Target file (defaults to CORRELATION_PATH).
+
+    Returns:
+        Path to the written file.
+    """
+    path = Path(path) if path else CORRELATION_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        np.savez_compressed(f, coins=corr.coins, matrix=corr.matrix)
+    return path
+
+
+def load_correlation(path: Path | str | None = None) -> CorrelationMatrix:
+    """Load a correlation matrix written by save_correlation().
+
+    Args:
+        path: Matrix file (defaults to CORRELATION_PATH).
+
+    Returns:
+        The stored CorrelationMatrix.
+    """
+    path = Path(path) if path else CORRELATION_PATH
+    with np.load(path) as data:
+        return CorrelationMatrix(coins=data["coins"], matrix=data["matrix"])
+
+
+def get_correlation(source: str = "csv", path: Path | str | None = None) -> CorrelationMatrix:
+    """Return the correlation matrix, recomputing it only when the inputs changed.
+
+    Args:
+        source: Data source, either 'csv' or 'sqlite'.
+        path: Matrix cache file (defaults to CORRELATION_PATH).
+
+    Returns:
+        Up-to-date CorrelationMatrix.
+    """
+    path = Path(path) if path else CORRELATION_PATH
+    fingerprint = input_fingerprint(source)
+    if is_fresh(path, fingerprint):
+        return load_correlation(path)
+
+    corr = compute_correlation(get_panel(source))
+    save_correlation(corr, path)
+    write_stamp(path, fingerprint, coins=len(corr.coins))
+    return corr
+
+
+def align_prices(panel: Panel, other: Panel) -> np.ndarray:
+    """Place another panel's prices on a panel's calendar.
+
+    Args:
+        panel: Panel whose dates define the columns.
+        other: Panel to align (e.g. benchmark assets).
+
+    Returns:
+        Array of shape (other coins, panel days); NaN outside other's range.
+    """
+    aligned = np.full((len(other.coins), len(panel.dates)), np.nan)
+    if not panel.dates.size or not other.dates.size:
+        return aligned
+    offset = int((other.dates[0] - panel.dates[0]).astype(int))
+    lo, hi = max(offset, 0), min(offset + len(other.dates), len(panel.dates))
+    if lo < hi:
+        aligned[:, lo:hi] = other.price[:, lo - offset:hi - offset]
+    return aligned
+
+
+def compute_betas(
+    panel: Panel,
+    benchmarks: Panel,
+    min_periods: int = MIN_OVERLAP_DAYS,
+) -> pd.DataFrame:
+    """Compute each coin's beta and correlation to every benchmark asset.
+
+    Beta is cov(coin, benchmark) / var(benchmark) over the days both have
+    a return.
+
+    Args:
+        panel: Altcoin price panel.
+        benchmarks: Panel of benchmark assets (e.g. BTC and ETH).
+        min_periods: Minimum shared return days; NaN below it.
+
+    Returns:
+        DataFrame with coin_id plus beta_<symbol> and corr_<symbol> columns
+        for each benchmark (symbols lowercased).
+    """
+    values, mask = _centered(daily_returns(panel.price))
+    bench_values, bench_mask = _centered(daily_returns(align_prices(panel, benchmarks)))
+    count, cov, var_coin, var_bench = _co_moments(values, mask, bench_values, bench_mask)
+    valid = count >= min_periods
+
+    betas = pd.DataFrame({"coin_id": panel.coins})
+    beta = _ratio(cov, var_bench, valid)
+    corr = _correlation(cov, var_coin, var_bench, valid)
+    for k, symbol in enumerate(benchmarks.symbols):
+        betas[f"beta_{symbol.lower()}"] = beta[:, k]
+        betas[f"corr_{symbol.lower()}"] = corr[:, k]
+    return betas
+
+
+def load_benchmarks(path: Path | str | None = None) -> Panel | None:
+    """Load the benchmark price file as a panel.
+
+    Args:
+        path: Benchmark CSV (defaults to BENCHMARK_CSV).
+
+    Returns:
+        Panel of benchmark assets, or None if they have not been fetched.
+    """
+    path = Path(path) if path else BENCHMARK_CSV
+    if not path.exists():
+        return None
+    return build_panel(pd.read_csv(path, parse_dates=["date"]), fields=("price",))
+
+
+def get_betas(source: str = "csv", benchmark_path: Path | str | None = None) -> pd.DataFrame:
+    """Compute betas of every stored coin against the fetched benchmarks.
+
+    Args:
+        source: Data source, either 'csv' or 'sqlite'.
+        benchmark_path: Benchmark CSV (defaults to BENCHMARK_CSV).
+
+    Returns:
+        Output of compute_betas(), or an empty DataFrame if no benchmark
+        prices are available.
+    """
+    benchmarks = load_benchmarks(benchmark_path)
+    if benchmarks is None or not benchmarks.coins.size:
+        logger.warning("No benchmark prices; run `python -m src.data_fetcher --benchmarks`")
+        return pd.DataFrame()
+    return compute_betas(get_panel(source), benchmarks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Return correlations and benchmark betas")
+    parser.add_argument("--source", choices=["csv", "sqlite"], default="csv",
+                        help="Price store to analyze")
+    parser.add_argument("--coin", help="Show the coins most correlated with this coin_id")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Number of correlated coins to show")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    matrix = get_correlation(args.source)
+    if args.coin:
+        print(f"\nCoins most correlated with {args.coin}:")
+        print(matrix.most_correlated(args.coin, args.top).to_string(index=False))
+
+    coin_betas = get_betas(args.source)
+    if not coin_betas.empty:
+        if args.coin:
+            coin_betas = coin_betas[coin_betas["coin_id"] == args.coin]
+        print("\nBetas versus benchmarks:")
+        print(coin_betas.round(3).to_string(index=False))
@@ -22,8 +22,9 @@ st.set_page_config(
 st.sidebar.title("📉 Altcoin Analyzer")
 st.sidebar.markdown("---")
 
+# Cached data is keyed on the data files' versions, so a rerun picks up
+# anything fetched or analyzed since the last render
 if st.sidebar.button("🔄 Refresh Data"):
-    st.cache_data.clear()
     st.rerun()
 
 st.sidebar.markdown("---")
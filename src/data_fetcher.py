@@ -20,6 +20,8 @@ import pandas as pd
 from tqdm import tqdm
 
 from src.config import (
+    BENCHMARK_CSV,
+    BENCHMARK_SYMBOLS,
     DATA_DIR,
     DATABASE_PATH,
     EXCHANGE_ID,
@@ -280,13 +282,15 @@ def validate_data(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def main(update: bool = False, coins: list[str] | None = None,
-         num_coins: int = 200) -> None:
+         num_coins: int = 200, benchmarks: bool = False) -> None:
     """Main fetch pipeline.
 
     Args:
         update: If True, only fetch new data since last download.
         coins: Optional list of specific coin symbols to fetch (e.g., ["SOL", "ADA"]).
         num_coins: Number of top altcoins to fetch (default 200).
+        benchmarks: Fetch BENCHMARK_SYMBOLS into BENCHMARK_CSV instead. They
+            are kept out of the altcoin CSV/SQLite store and so never ranked.
     """
     setup_logging()
     DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -297,7 +301,10 @@ def main(update: bool = False, coins: list[str] | None = None,
     logger.info("Starting data fetch pipeline (%s via CCXT)", EXCHANGE_ID)
     logger.info("Date range: %s to now", START_DATE)
 
-    if coins:
+    if benchmarks:
+        coin_list = [{"id": s, "symbol": s, "name": s} for s in BENCHMARK_SYMBOLS]
+        logger.info("Fetching %d benchmark assets", len(coin_list))
+    elif coins:
         coin_list = [{"id": c.upper(), "symbol": c.upper(), "name": c.upper()}
                      for c in coins]
         logger.info("Fetching %d specified coins", len(coin_list))
@@ -306,7 +313,8 @@ def main(update: bool = False, coins: list[str] | None = None,
         coin_list = get_top_altcoins(exchange, num_coins)
         logger.info("Got %d altcoins", len(coin_list))
 
-    existing = load_existing_data() if update else {}
+    target_csv = BENCHMARK_CSV if benchmarks else PRICES_CSV
+    existing = load_existing_data(target_csv) if update else {}
 
     all_rows: list[pd.DataFrame] = []
 
@@ -348,8 +356,9 @@ def main(update: bool = False, coins: list[str] | None = None,
 
     if all_rows:
         combined = pd.concat(all_rows, ignore_index=True)
-        save_to_csv(combined)
-        save_to_sqlite(combined)
+        save_to_csv(combined, target_csv)
+        if not benchmarks:
+            save_to_sqlite(combined)
         logger.info("Pipeline complete. Total new rows: %d", len(combined))
     else:
         logger.info("No new data to save")
@@ -363,5 +372,8 @@ if __name__ == "__main__":
                         help="Specific coin symbols to fetch (e.g., SOL ADA)")
     parser.add_argument("--num-coins", type=int, default=200,
                         help="Number of top altcoins to fetch")
+    parser.add_argument("--benchmarks", action="store_true",
+                        help="Fetch BTC/ETH benchmark prices for beta (kept out of rankings)")
     args = parser.parse_args()
-    main(update=args.update, coins=args.coins, num_coins=args.num_coins)
+    main(update=args.update, coins=args.coins, num_coins=args.num_coins,
+         benchmarks=args.benchmarks)
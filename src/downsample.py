@@ -0,0 +1,146 @@
+"""Downsample chart series to a point budget while keeping their shape.
+
+Plotting every stored row sends tens of thousands of points per chart to
+the browser once data is hourly. Two reducers pick which rows to keep:
+
+- Min/max buckets split the series into equal-width buckets and keep each
+  bucket's lowest and highest point (plus the endpoints), so every peak
+  and trough survives. Fully vectorized; used for prices and volume.
+- LTTB (Largest-Triangle-Three-Buckets, Steinarsson 2013) keeps one point
+  per bucket, the one forming the largest triangle with the previously
+  kept point and the next bucket's average. It follows the visual shape
+  closely and suits smooth lines such as indicator overlays.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.config import CHART_POINT_BUDGET
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("minmax", "lttb")
+
+
+def minmax_indices(y: np.ndarray, budget: int) -> np.ndarray:
+    """Pick at most budget positions keeping every bucket's min and max.
+
+    Args:
+        y: Values without NaNs.
+        budget: Maximum number of points to keep (at least 2).
+
+    Returns:
+        Sorted positions into y.
+    """
+    n = len(y)
+    if n <= max(budget, 2):
+        return np.arange(n)
+    buckets = max((budget - 2) // 2, 1)
+    width = -(-n // buckets)
+    buckets = -(-n // width)
+    padded = np.full(buckets * width, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, width)
+    offsets = np.arange(buckets) * width
+    keep = np.concatenate([
+        [0, n - 1],
+        offsets + np.nanargmin(padded, axis=1),
+        offsets + np.nanargmax(padded, axis=1),
+    ])
+    return np.unique(keep)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """Pick budget positions with Largest-Triangle-Three-Buckets.
+
+    Args:
+        x: Increasing x values (numeric).
+        y: Values without NaNs.
+        budget: Number of points to keep (at least 3).
+
+    Returns:
+        Sorted positions into x and y, always including both endpoints.
+    """
+    n = len(y)
+    if n <= budget or budget < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # budget - 2 buckets over the interior points, then the last point alone
+    edges = np.append(np.linspace(1, n - 1, budget - 1).astype(np.int64), n)
+    keep = np.empty(budget, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(budget - 2):
+        lo, hi, next_hi = edges[i], edges[i + 1], edges[i + 2]
+        avg_x, avg_y = x[hi:next_hi].mean(), y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(
+    frame: pd.DataFrame,
+    y: str,
+    budget: int = CHART_POINT_BUDGET,
+    x: str = "date",
+    method: str = "minmax",
+) -> pd.DataFrame:
+    """Reduce a frame to about budget rows for plotting y against x.
+
+    Args:
+        frame: Rows sorted by x.
+        y: Column to preserve the shape of; rows where it is NaN are dropped.
+        budget: Maximum number of rows to return.
+        x: Column on the x axis (dates or numbers).
+        method: 'minmax' to keep every bucket's extremes, or 'lttb'.
+
+    Returns:
+        Subset of frame's rows, in order.
+
+    Raises:
+        ValueError: If method is not one of METHODS.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method: {method!r}")
+    data = frame[frame[y].notna()]
+    if len(data) <= budget:
+        return data
+    values = data[y].to_numpy(dtype=float)
+    if method == "minmax":
+        keep = minmax_indices(values, budget)
+    else:
+        xs = data[x]
+        if pd.api.types.is_datetime64_any_dtype(xs):
+            xs = xs.astype("int64")
+        keep = lttb_indices(xs.to_numpy(dtype=float), values, budget)
+    logger.debug("Downsampled %s from %d to %d points (%s)", y, len(data), len(keep), method)
+    return data.iloc[keep]
+
+
+def in_window(
+    frame: pd.DataFrame,
+    start: pd.Timestamp | None,
+    end: pd.Timestamp,
+    column: str = "date",
+) -> pd.DataFrame:
+    """Keep the rows dated from start through the whole of end's day.
+
+    Args:
+        frame: Rows with a datetime column.
+        start: First day, or None for no lower bound.
+        end: Last day (intraday rows on that day are kept).
+        column: Datetime column to filter on.
+
+    Returns:
+        Rows inside the window.
+    """
+    dates = frame[column]
+    mask = dates < pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    if start is not None:
+        mask &= dates >= pd.Timestamp(start)
+    return frame[mask]
@@ -0,0 +1,150 @@
+"""Drawdown analytics: underwater curves, episodes and per-coin risk stats.
+
+Everything is computed on the long price frame returned by load_data() with
+vectorized group operations: a per-coin cumulative max gives the running
+peak, and run-length encoding of the "below peak" flag splits each coin's
+history into drawdown episodes. Cost is linear in the number of rows.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+STATS_COLUMNS = [
+    "coin_id", "max_drawdown_pct", "longest_underwater_days", "days_since_peak",
+    "recovery_days", "drawdown_episodes",
+]
+
+EPISODE_COLUMNS = [
+    "coin_id", "peak_date", "peak_price", "trough_date", "trough_price",
+    "depth_pct", "recovery_date", "duration_days", "recovered",
+]
+
+
+def underwater_curve(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute the running peak and drawdown for every row.
+
+    Args:
+        df: Price DataFrame with coin_id, date and price columns.
+
+    Returns:
+        DataFrame sorted by coin_id and date with coin_id, date, price,
+        running_peak and drawdown_pct (0 at a new peak, negative below it).
+    """
+    curve = df[["coin_id", "date", "price"]].copy()
+    curve["date"] = pd.to_datetime(curve["date"])
+    curve.sort_values(["coin_id", "date"], kind="stable", inplace=True)
+    curve.reset_index(drop=True, inplace=True)
+
+    curve["running_peak"] = curve.groupby("coin_id", sort=False)["price"].cummax()
+    curve["drawdown_pct"] = (curve["price"] / curve["running_peak"] - 1) * 100
+    return curve
+
+
+def _label_episodes(curve: pd.DataFrame) -> np.ndarray:
+    """Assign an episode number to every underwater row, -1 elsewhere."""
+    codes = pd.factorize(curve["coin_id"])[0]
+    underwater = (curve["price"] < curve["running_peak"]).to_numpy()
+    same_coin = np.r_[False, codes[1:] == codes[:-1]]
+    prev_underwater = np.r_[False, underwater[:-1]] & same_coin
+    starts = underwater & ~prev_underwater
+    return np.where(underwater, np.cumsum(starts) - 1, -1)
+
+
+def drawdown_episodes(df: pd.DataFrame) -> pd.DataFrame:
+    """Split each coin's history into peak-to-recovery drawdown episodes.
+
+    An episode starts on the first day below the running peak and ends on
+    the day the price gets back to that peak (or at the last stored day if
+    it has not recovered).
+
+    Args:
+        df: Price DataFrame with coin_id, date and price columns.
+
+    Returns:
+        DataFrame with EPISODE_COLUMNS, one row per episode.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=EPISODE_COLUMNS)
+
+    curve = underwater_curve(df)
+    episode = _label_episodes(curve)
+    rows = np.flatnonzero(episode >= 0)
+    if rows.size == 0:
+        return pd.DataFrame(columns=EPISODE_COLUMNS)
+
+    ids = episode[rows]
+    first = rows[np.r_[True, ids[1:] != ids[:-1]]]
+    last = rows[np.r_[ids[1:] != ids[:-1], True]]
+    trough = (
+        curve["price"].iloc[rows].groupby(ids).idxmin().to_numpy()
+    )
+
+    dates = curve["date"].to_numpy()
+    coin_ids = curve["coin_id"].to_numpy()
+    peak_row = first - 1  # the day before going underwater sits at the peak
+    after = np.minimum(last + 1, len(curve) - 1)
+    recovered = (last + 1 < len(curve)) & (coin_ids[after] == coin_ids[last])
+    end_date = np.where(recovered, dates[after], dates[last])
+
+    peak_price = curve["price"].to_numpy()[peak_row]
+    trough_price = curve["price"].to_numpy()[trough]
+    return pd.DataFrame({
+        "coin_id": coin_ids[first],
+        "peak_date": dates[peak_row],
+        "peak_price": peak_price,
+        "trough_date": dates[trough],
+        "trough_price": trough_price,
+        "depth_pct": np.round((trough_price / peak_price - 1) * 100, 2),
+        "recovery_date": np.where(recovered, dates[after], np.datetime64("NaT")),
+        "duration_days": (end_date - dates[peak_row]).astype("timedelta64[D]").astype(int),
+        "recovered": recovered,
+    })
+
+
+def drawdown_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute per-coin drawdown risk statistics.
+
+    Args:
+        df: Price DataFrame with coin_id, date and price columns.
+
+    Returns:
+        DataFrame with STATS_COLUMNS, one row per coin:
+
+        - max_drawdown_pct: deepest peak-to-trough drop (<= 0)
+        - longest_underwater_days: longest peak-to-recovery (or to date) span
+        - days_since_peak: days from the all-time peak to the latest price
+        - recovery_days: days the deepest drawdown took to recover (NaN if
+          it has not recovered)
+        - drawdown_episodes: number of distinct underwater periods
+    """
+    if df.empty:
+        return pd.DataFrame(columns=STATS_COLUMNS)
+
+    curve = underwater_curve(df)
+    grouped = curve.groupby("coin_id", sort=False)
+    stats = pd.DataFrame({
+        "max_drawdown_pct": grouped["drawdown_pct"].min().round(2),
+    })
+
+    # Days since the running peak was last set, measured at the latest row
+    at_peak = curve["price"] >= curve["running_peak"]
+    last_peak_date = curve["date"].where(at_peak).groupby(curve["coin_id"], sort=False).max()
+    stats["days_since_peak"] = (grouped["date"].max() - last_peak_date).dt.days
+
+    episodes = drawdown_episodes(df)
+    by_coin = episodes.groupby("coin_id", sort=False)
+    stats["longest_underwater_days"] = by_coin["duration_days"].max()
+    stats["drawdown_episodes"] = by_coin.size()
+
+    deepest = episodes.loc[by_coin["depth_pct"].idxmin()].set_index("coin_id")
+    stats["recovery_days"] = deepest["duration_days"].where(deepest["recovered"]).astype(float)
+
+    stats[["longest_underwater_days", "drawdown_episodes"]] = (
+        stats[["longest_underwater_days", "drawdown_episodes"]].fillna(0).astype(int)
+    )
+    stats.index.name = "coin_id"
+    return stats.reset_index()[STATS_COLUMNS]
@@ -0,0 +1,92 @@
+"""Serialize ranking tables for export and download.
+
+The analyzer writes its exports through write_frame(), and the dashboard
+builds download payloads with to_bytes() or serves the analyzer's files
+with artifact_bytes(), so a downloaded file has the same layout whichever
+path produced it. Pages hand these to st.download_button as callables, so
+nothing is serialized unless someone clicks.
+"""
+
+import gzip
+import io
+import logging
+from pathlib import Path
+from typing import IO
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MIME = {"csv": "text/csv", "json": "application/json"}
+GZIP_MIME = "application/gzip"
+
+
+def write_frame(
+    frame: pd.DataFrame,
+    fmt: str,
+    target: Path | str | IO[bytes],
+    compression: str | None = "infer",
+) -> None:
+    """Write a table as CSV or JSON records.
+
+    A named index (the rank) is written as the first CSV column and as a
+    field of every JSON record; an unnamed index is dropped.
+
+    Args:
+        frame: Table to write.
+        fmt: 'csv' or 'json'.
+        target: File path or binary buffer.
+        compression: Pandas compression; 'infer' gzips '.gz' paths.
+    """
+    if fmt == "json":
+        records = frame.reset_index() if frame.index.name else frame
+        records.to_json(target, orient="records", indent=2, compression=compression)
+    else:
+        frame.to_csv(target, index=frame.index.name is not None, compression=compression)
+
+
+def to_bytes(frame: pd.DataFrame, fmt: str, compress: bool = False) -> bytes:
+    """Serialize a table in memory for a download.
+
+    Args:
+        frame: Table to export.
+        fmt: 'csv' or 'json'.
+        compress: Gzip the payload.
+
+    Returns:
+        File contents.
+    """
+    buffer = io.BytesIO()
+    write_frame(frame, fmt, buffer, "gzip" if compress else None)
+    logger.debug("Serialized %d rows to %s (%d bytes)", len(frame), fmt, buffer.tell())
+    return buffer.getvalue()
+
+
+def artifact_bytes(path: Path | str, compress: bool = False) -> bytes:
+    """Read an exported file, gzipping or un-gzipping it to match compress.
+
+    Args:
+        path: File written by the analyzer; a '.gz' suffix means gzipped.
+        compress: Whether the caller wants gzipped contents.
+
+    Returns:
+        File contents.
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    gzipped = path.suffix == ".gz"
+    if compress and not gzipped:
+        return gzip.compress(data)
+    if gzipped and not compress:
+        return gzip.decompress(data)
+    return data
+
+
+def export_name(stem: str, fmt: str, compress: bool = False) -> str:
+    """File name for a download, e.g. 'altcoin_drops_all.csv.gz'."""
+    return f"{stem}.{fmt}.gz" if compress else f"{stem}.{fmt}"
+
+
+def export_mime(fmt: str, compress: bool = False) -> str:
+    """MIME type for a download."""
+    return GZIP_MIME if compress else EXPORT_MIME[fmt]
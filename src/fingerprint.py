@@ -0,0 +1,155 @@
+"""Cheap input fingerprints for deciding whether derived data is stale.
+
+A fingerprint combines the size and modification time of the input files
+(optionally their content hash) with the analysis parameters that shape the
+output. It is stored in a small JSON stamp file next to each derived
+artifact, so consumers can check freshness with a couple of stat() calls.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.config import MIN_DATA_DAYS, START_DATE, TOP_N_RANKING
+
+logger = logging.getLogger(__name__)
+
+STAMP_SUFFIX = ".stamp.json"
+
+
+def analysis_params() -> dict[str, Any]:
+    """Return the configuration values that affect analysis output."""
+    return {
+        "min_data_days": MIN_DATA_DAYS,
+        "top_n_ranking": TOP_N_RANKING,
+        "start_date": START_DATE,
+    }
+
+
+def file_signature(path: Path | str, hash_content: bool = False) -> dict[str, Any] | None:
+    """Describe a file by size, mtime and optionally a content hash.
+
+    Args:
+        path: File to describe.
+        hash_content: Also include a SHA-256 of the file contents.
+
+    Returns:
+        Dict with 'name', 'size' and 'mtime_ns' (plus 'sha256'), or None if
+        the file does not exist.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    stat = path.stat()
+    signature: dict[str, Any] = {
+        "name": path.name,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    if hash_content:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        signature["sha256"] = digest.hexdigest()
+    return signature
+
+
+def compute_fingerprint(
+    paths: Iterable[Path | str],
+    params: dict[str, Any] | None = None,
+    hash_content: bool = False,
+) -> str:
+    """Compute a fingerprint over input files and parameters.
+
+    Args:
+        paths: Input files. Missing files contribute a null signature.
+        params: Parameters that affect the derived output.
+        hash_content: Hash file contents instead of trusting size/mtime.
+
+    Returns:
+        Hex digest that changes whenever any input or parameter changes.
+    """
+    payload = {
+        "files": [file_signature(p, hash_content) for p in paths],
+        "params": params or {},
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def data_version(*paths: Path | str) -> str:
+    """Cheap version of a set of files for keying in-memory caches.
+
+    Only stats the files (size and mtime), so it can run on every page
+    render; a cache keyed on it reloads exactly when a file is rewritten.
+
+    Args:
+        *paths: Files the cached value was built from.
+
+    Returns:
+        Hex digest that changes whenever any of the files changes.
+    """
+    return compute_fingerprint(paths)
+
+
+def stamp_path(artifact: Path | str) -> Path:
+    """Return the stamp file path that accompanies a derived artifact."""
+    artifact = Path(artifact)
+    return artifact.with_name(artifact.name + STAMP_SUFFIX)
+
+
+def read_stamp(artifact: Path | str) -> dict[str, Any]:
+    """Read the stamp stored next to an artifact.
+
+    Args:
+        artifact: Derived file whose stamp to read.
+
+    Returns:
+        Stamp contents, or an empty dict if missing or unreadable.
+    """
+    path = stamp_path(artifact)
+    if not path.exists():
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable stamp %s: %s", path, e)
+        return {}
+
+
+def write_stamp(artifact: Path | str, fingerprint: str, **extra: Any) -> Path:
+    """Record the fingerprint an artifact was built from.
+
+    Args:
+        artifact: Derived file the stamp describes.
+        fingerprint: Input fingerprint from compute_fingerprint().
+        **extra: Additional JSON-serializable metadata to store.
+
+    Returns:
+        Path to the written stamp file.
+    """
+    path = stamp_path(artifact)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"fingerprint": fingerprint, **extra}, f, indent=2, default=str)
+    return path
+
+
+def is_fresh(artifact: Path | str, fingerprint: str) -> bool:
+    """Check whether an artifact exists and was built from the given inputs.
+
+    Args:
+        artifact: Derived file to check.
+        fingerprint: Current input fingerprint.
+
+    Returns:
+        True if the artifact exists and its stamp matches.
+    """
+    if not Path(artifact).exists():
+        return False
+    return read_stamp(artifact).get("fingerprint") == fingerprint
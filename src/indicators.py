@@ -0,0 +1,170 @@
+"""Vectorized technical indicators for every coin in one grouped pass.
+
+Indicators are computed over the long price frame returned by load_data()
+with pandas' grouped rolling/ewm kernels, so there is no Python loop over
+coins. The set of indicators is configurable, and the result is cached next
+to the analysis results keyed on the input fingerprint, so the dashboard
+can overlay indicators without recomputing them per request.
+
+Run with: python -m src.indicators
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer import input_fingerprint, load_data
+from src.config import INDICATORS_PATH
+from src.fingerprint import is_fresh, write_stamp
+
+logger = logging.getLogger(__name__)
+
+# Indicator name -> list of window lengths
+DEFAULT_INDICATORS: dict[str, list[int]] = {
+    "sma": [20, 50],
+    "ema": [12, 26],
+    "rsi": [14],
+    "bollinger": [20],
+    "atr": [14],
+    "volatility": [30],
+}
+
+BOLLINGER_STD = 2.0
+
+
+def _per_coin(result: pd.Series) -> pd.Series:
+    """Drop the coin level that grouped rolling/ewm adds to the index."""
+    return result.droplevel(0)
+
+
+def _wilder(values: pd.Series, keys: pd.Series, window: int) -> pd.Series:
+    """Wilder's smoothing (EMA with alpha = 1/window) per coin."""
+    return _per_coin(
+        values.groupby(keys, sort=False)
+        .ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    )
+
+
+def compute_indicators(
+    df: pd.DataFrame,
+    spec: dict[str, list[int]] | None = None,
+) -> pd.DataFrame:
+    """Compute technical indicators for all coins.
+
+    Supported indicators: sma, ema, rsi, bollinger (mid/upper/lower), atr
+    (needs high and low columns) and volatility (rolling standard deviation
+    of daily returns).
+
+    Args:
+        df: Price DataFrame with coin_id, date and price (plus high/low).
+        spec: Indicator name -> window lengths (defaults to DEFAULT_INDICATORS).
+
+    Returns:
+        DataFrame sorted by coin_id and date with one column per indicator
+        and window, e.g. sma_20, rsi_14, bb_upper_20.
+
+    Raises:
+        ValueError: If spec names an unknown indicator.
+    """
+    spec = DEFAULT_INDICATORS if spec is None else spec
+    unknown = set(spec) - set(DEFAULT_INDICATORS)
+    if unknown:
+        raise ValueError(f"Unknown indicators: {sorted(unknown)}")
+
+    frame = df.sort_values(["coin_id", "date"], kind="stable", ignore_index=True)
+    out = frame[["coin_id", "date"]].copy()
+    if frame.empty:
+        return out
+
+    keys = frame["coin_id"]
+    price = frame["price"].astype(float)
+    by_coin = price.groupby(keys, sort=False)
+
+    for window in spec.get("sma", []):
+        out[f"sma_{window}"] = _per_coin(by_coin.rolling(window).mean())
+
+    for window in spec.get("ema", []):
+        out[f"ema_{window}"] = _per_coin(by_coin.ewm(span=window, adjust=False).mean())
+
+    if spec.get("rsi"):
+        delta = by_coin.diff()
+        gain, loss = delta.clip(lower=0), -delta.clip(upper=0)
+        for window in spec["rsi"]:
+            avg_gain = _wilder(gain, keys, window)
+            avg_loss = _wilder(loss, keys, window)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+            out[f"rsi_{window}"] = rsi.where(avg_loss > 0, 100.0).where(avg_gain.notna())
+
+    for window in spec.get("bollinger", []):
+        mid = _per_coin(by_coin.rolling(window).mean())
+        std = _per_coin(by_coin.rolling(window).std(ddof=0))
+        out[f"bb_mid_{window}"] = mid
+        out[f"bb_upper_{window}"] = mid + BOLLINGER_STD * std
+        out[f"bb_lower_{window}"] = mid - BOLLINGER_STD * std
+
+    if spec.get("atr") and {"high", "low"} <= set(frame.columns):
+        prev_close = by_coin.shift()
+        high, low = frame["high"].astype(float), frame["low"].astype(float)
+        true_range = pd.concat(
+            [high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1
+        ).max(axis=1)
+        for window in spec["atr"]:
+            out[f"atr_{window}"] = _wilder(true_range, keys, window)
+
+    if spec.get("volatility"):
+        returns = by_coin.pct_change()
+        for window in spec["volatility"]:
+            out[f"volatility_{window}"] = _per_coin(
+                returns.groupby(keys, sort=False).rolling(window).std()
+            )
+
+    return out
+
+
+def _fingerprint(source: str, spec: dict[str, Any]) -> str:
+    """Combine the input fingerprint with the indicator spec."""
+    return f"{input_fingerprint(source)}:{sorted((k, list(v)) for k, v in spec.items())}"
+
+
+def get_indicators(
+    source: str = "csv",
+    spec: dict[str, list[int]] | None = None,
+    path: Path | str | None = None,
+) -> pd.DataFrame:
+    """Return cached indicators, recomputing only when inputs or spec changed.
+
+    Args:
+        source: Data source, either 'csv' or 'sqlite'.
+        spec: Indicator name -> window lengths (defaults to DEFAULT_INDICATORS).
+        path: Cache file (defaults to INDICATORS_PATH).
+
+    Returns:
+        Output of compute_indicators() for the whole store.
+    """
+    spec = DEFAULT_INDICATORS if spec is None else spec
+    path = Path(path) if path else INDICATORS_PATH
+    fingerprint = _fingerprint(source, spec)
+    if is_fresh(path, fingerprint):
+        return pd.read_pickle(path)
+
+    indicators = compute_indicators(load_data(source), spec)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    indicators.to_pickle(path)
+    write_stamp(path, fingerprint, spec=spec)
+    logger.info("Cached %d indicator columns to %s", indicators.shape[1] - 2, path)
+    return indicators
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute technical indicators")
+    parser.add_argument("--source", choices=["csv", "sqlite"], default="csv",
+                        help="Price store to analyze")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    get_indicators(args.source)
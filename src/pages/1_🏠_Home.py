@@ -3,32 +3,61 @@
 import sys
 from pathlib import Path
 
-import plotly.express as px
-import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.auto_fetch import ensure_data
-from src.config import CACHE_TTL, PRICES_CSV, RESULTS_CSV
+from src.charts import drop_bar, percentile_bands
+from src.config import PRICES_CSV, RESULTS_CSV
+from src.fingerprint import data_version
+from src.sketch import QuantileSketch, get_sketches
+from src.store import shared_store, store_version
 
 st.set_page_config(page_title="Home - Altcoin Analyzer", page_icon="🏠", layout="wide")
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def load_results() -> pd.DataFrame:
-    """Load analysis results."""
-    if not RESULTS_CSV.exists():
-        return pd.DataFrame()
-    return pd.read_csv(RESULTS_CSV)
+@st.cache_resource(max_entries=1)
+def load_sketches(version: str) -> dict[str, QuantileSketch]:
+    """Load the daily percentile sketches across all coins."""
+    if not PRICES_CSV.exists():
+        return {}
+    return get_sketches()
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def load_prices() -> pd.DataFrame:
-    """Load price data."""
-    if not PRICES_CSV.exists():
-        return pd.DataFrame()
-    return pd.read_csv(PRICES_CSV, parse_dates=["date"])
+SKETCH_LABELS = {
+    "drawdown_pct": "% below peak",
+    "volatility_pct": "30d volatility %",
+    "volume": "Volume",
+}
+
+
+@st.cache_resource(max_entries=1)
+def top10_chart(version: str) -> go.Figure:
+    """Bar chart of the ten biggest drops."""
+    return drop_bar(shared_store().results.head(10),
+                    ["coin_name", "peak_price", "current_price"],
+                    height=450, y_label="% Change from Peak")
+
+
+@st.cache_resource(max_entries=len(SKETCH_LABELS))
+def bands_chart(version: str, metric: str) -> go.Figure:
+    """Daily percentile bands of one metric across all coins."""
+    return percentile_bands(load_sketches(version)[metric].to_frame(), SKETCH_LABELS[metric])
+
+
+@st.fragment
+def market_percentiles() -> None:
+    """Percentile chart; picking a metric reruns only this fragment."""
+    version = data_version(PRICES_CSV)
+    sketches = load_sketches(version)
+    if not sketches:
+        return
+    st.subheader("Market Percentiles Over Time")
+    metric = st.selectbox("Metric", [m for m in SKETCH_LABELS if m in sketches],
+                          format_func=SKETCH_LABELS.get)
+    st.plotly_chart(bands_chart(version, metric), width="stretch")
 
 
 st.title("🏠 Dashboard Home")
@@ -37,7 +66,7 @@ st.markdown("Overview of altcoin price drops from 2025 peaks.")
 if not ensure_data():
     st.stop()
 
-results = load_results()
+results = shared_store().results
 if results.empty:
     st.warning("No data available. Run the data pipeline first.")
     st.stop()
@@ -80,23 +109,10 @@ st.dataframe(
 
 # Quick stats bar chart
 st.subheader("Top 10 by Drop Percentage")
-fig = px.bar(
-    top10,
-    x="symbol",
-    y="pct_change",
-    color="pct_change",
-    color_continuous_scale="RdYlGn",
-    labels={"pct_change": "% Change from Peak", "symbol": "Coin"},
-    hover_data=["coin_name", "peak_price", "current_price"],
-    text="pct_change",
-)
-fig.update_traces(texttemplate="%{text:.1f}%", textposition="outside")
-fig.update_layout(
-    height=450,
-    xaxis_tickangle=-45,
-    showlegend=False,
-)
-st.plotly_chart(fig, width="stretch")
+st.plotly_chart(top10_chart(store_version()), width="stretch")
+
+# Universe-wide percentiles per day, read from the precomputed sketches
+market_percentiles()
 
 st.markdown("---")
 st.page_link("pages/2_📊_Top_50.py", label="📊 View Full Top 50 Rankings →",
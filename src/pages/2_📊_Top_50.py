@@ -1,26 +1,96 @@
 """Top 50 altcoins ranked by biggest price drop from 2025 peak."""
 
 import sys
+from functools import partial
 from pathlib import Path
 
-import plotly.express as px
-import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.auto_fetch import ensure_data
-from src.config import CACHE_TTL, RESULTS_CSV
+from src.charts import drop_bar, drop_histogram
+from src.config import EXPORT_CACHE_SIZE, RESULTS_CSV, RESULTS_JSON
+from src.exports import artifact_bytes, export_mime, export_name, to_bytes
+from src.store import shared_store, store_version
+from src.table import filter_positions, page_count, page_slice, style_table
 
 st.set_page_config(page_title="Top 50 - Altcoin Analyzer", page_icon="📊", layout="wide")
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def load_results() -> pd.DataFrame:
-    """Load analysis results."""
-    if not RESULTS_CSV.exists():
-        return pd.DataFrame()
-    return pd.read_csv(RESULTS_CSV)
+@st.cache_resource(max_entries=1)
+def overview_charts(version: str) -> tuple[go.Figure, go.Figure]:
+    """Top 20 bar chart and drop histogram of the current results."""
+    results = shared_store().results
+    hover = ["coin_name", "peak_price", "current_price", "peak_date"]
+    return drop_bar(results.head(20), hover), drop_histogram(results["pct_change"], nbins=20)
+
+
+@st.cache_data(max_entries=EXPORT_CACHE_SIZE)
+def export_payload(version: str, search: str, min_mcap: int, fmt: str, compress: bool) -> bytes:
+    """Filtered results as a download, built on the first click per filter state."""
+    store = shared_store()
+    positions = filter_positions(store.results, store.results_search, search,
+                                 min_market_cap=min_mcap)
+    return to_bytes(store.results.iloc[positions], fmt, compress)
+
+
+@st.fragment
+def ranking_table() -> None:
+    """Filters, one page of the table and the exports.
+
+    Runs as a fragment: changing a filter or the page reruns only this.
+    """
+    store = shared_store()
+    results = store.results
+
+    col_filter1, col_filter2 = st.columns(2)
+    with col_filter1:
+        search = st.text_input("🔍 Search by name or symbol", "")
+    with col_filter2:
+        min_mcap = st.number_input("Min Market Cap ($)", value=0, step=1_000_000,
+                                   format="%d")
+
+    # Row positions only: nothing is copied until a page or export needs rows
+    positions = filter_positions(results, store.results_search, search,
+                                 min_market_cap=min_mcap)
+
+    # Interactive table, one page at a time
+    st.subheader(f"Showing {len(positions)} coins")
+
+    pages = page_count(len(positions))
+    page = 1
+    if pages > 1:
+        # Keyed on max_value too, so a filter change starts again at page 1
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+
+    display_cols = ["coin_name", "symbol", "peak_price", "peak_date",
+                    "current_price", "current_date", "pct_change", "market_cap"]
+
+    available_cols = [c for c in display_cols if c in results.columns]
+
+    st.dataframe(style_table(page_slice(results, positions, page)[available_cols]),
+                 width="stretch")
+
+    # Download buttons: payloads are only built when clicked, and the
+    # unfiltered table is served from the analyzer's export files
+    col_dl1, col_dl2, col_dl3, _ = st.columns([1, 1, 1, 3])
+    compress = col_dl3.checkbox("gzip", help="Compress the download")
+    artifacts = {"csv": RESULTS_CSV, "json": RESULTS_JSON}
+    version = store_version()
+    for column, fmt in zip((col_dl1, col_dl2), artifacts):
+        if len(positions) == len(results) and artifacts[fmt].exists():
+            data = partial(artifact_bytes, artifacts[fmt], compress)
+        else:
+            data = partial(export_payload, version, search, min_mcap, fmt, compress)
+        column.download_button(
+            f"📥 Download {fmt.upper()}",
+            data,
+            export_name("altcoin_drops_top50", fmt, compress),
+            export_mime(fmt, compress),
+            on_click="ignore",
+        )
 
 
 st.title("📊 Top 50 Biggest Drops")
@@ -29,108 +99,20 @@ st.markdown("Altcoins ranked by largest percentage drop from their 2025 peak pri
 if not ensure_data():
     st.stop()
 
-results = load_results()
+results = shared_store().results
 if results.empty:
     st.warning("No data available. Run the data pipeline first.")
     st.stop()
 
-# Filters
-col_filter1, col_filter2 = st.columns(2)
-with col_filter1:
-    search = st.text_input("🔍 Search by name or symbol", "")
-with col_filter2:
-    min_mcap = st.number_input("Min Market Cap ($)", value=0, step=1_000_000,
-                               format="%d")
-
-filtered = results.copy()
-if search:
-    name_match = filtered["coin_name"].str.contains(search, case=False, na=False)
-    sym_match = filtered["symbol"].str.contains(search, case=False, na=False)
-    mask = name_match | sym_match
-    filtered = filtered[mask]
-if min_mcap > 0:
-    filtered = filtered[filtered["market_cap"] >= min_mcap]
-
-
-# Color-code by drop severity
-def drop_color(val: float) -> str:
-    """Return CSS color based on drop severity."""
-    if val <= -80:
-        return "color: #ff4444; font-weight: bold"
-    elif val <= -60:
-        return "color: #ff8800"
-    else:
-        return "color: #ffcc00"
-
-
-# Interactive table
-st.subheader(f"Showing {len(filtered)} coins")
-
-display_cols = ["coin_name", "symbol", "peak_price", "peak_date",
-                "current_price", "current_date", "pct_change", "market_cap"]
-
-available_cols = [c for c in display_cols if c in filtered.columns]
-
-styled = filtered[available_cols].style.format({
-    "peak_price": "${:.4f}",
-    "current_price": "${:.4f}",
-    "pct_change": "{:+.2f}%",
-    "market_cap": "${:,.0f}",
-}).map(drop_color, subset=["pct_change"] if "pct_change" in available_cols else [])
-
-st.dataframe(styled, width="stretch", height=600)
-
-# Download buttons
-col_dl1, col_dl2, _ = st.columns([1, 1, 4])
-with col_dl1:
-    csv_data = filtered.to_csv(index=False)
-    st.download_button(
-        "📥 Download CSV",
-        csv_data,
-        "altcoin_drops_top50.csv",
-        "text/csv",
-    )
-with col_dl2:
-    json_data = filtered.to_json(orient="records", indent=2)
-    st.download_button(
-        "📥 Download JSON",
-        json_data,
-        "altcoin_drops_top50.json",
-        "application/json",
-    )
+ranking_table()
 
 st.markdown("---")
 
-# Bar chart - Top 20
+# Charts cover the whole ranking, so filtering the table leaves them alone
+fig, fig_hist = overview_charts(store_version())
+
 st.subheader("Top 20 by Drop Percentage")
-chart_data = filtered.head(20)
-
-fig = px.bar(
-    chart_data,
-    x="symbol",
-    y="pct_change",
-    color="pct_change",
-    color_continuous_scale="RdYlGn",
-    labels={"pct_change": "% Drop from Peak", "symbol": "Coin"},
-    hover_data=["coin_name", "peak_price", "current_price", "peak_date"],
-    text="pct_change",
-)
-fig.update_traces(texttemplate="%{text:.1f}%", textposition="outside")
-fig.update_layout(
-    height=500,
-    xaxis_tickangle=-45,
-    showlegend=False,
-)
 st.plotly_chart(fig, width="stretch")
 
-# Distribution chart
 st.subheader("Drop Distribution")
-fig_hist = px.histogram(
-    filtered,
-    x="pct_change",
-    nbins=20,
-    labels={"pct_change": "% Drop from Peak"},
-    color_discrete_sequence=["#667eea"],
-)
-fig_hist.update_layout(height=350)
 st.plotly_chart(fig_hist, width="stretch")
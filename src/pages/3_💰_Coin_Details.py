@@ -11,26 +11,213 @@ import streamlit as st
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.auto_fetch import ensure_data
-from src.config import CACHE_TTL, PRICES_CSV, RESULTS_CSV
+from src.charts import (
+    candlestick,
+    drawdown_area,
+    price_history,
+    rank_line,
+    volume_bars,
+)
+from src.config import BENCHMARK_CSV, CHART_CACHE_SIZE, CHART_POINT_BUDGET, PRICES_CSV
+from src.correlation import CorrelationMatrix, get_betas, get_correlation
+from src.downsample import downsample, in_window
+from src.fingerprint import data_version
+from src.indicators import get_indicators
+from src.panel import get_panel
+from src.range_max import RangeMaxIndex, resolve_window
+from src.rank_history import RankHistory, get_rank_history
+from src.store import shared_store, store_version
 
 st.set_page_config(page_title="Coin Details - Altcoin Analyzer", page_icon="💰",
                    layout="wide")
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def load_results() -> pd.DataFrame:
-    """Load analysis results."""
-    if not RESULTS_CSV.exists():
+@st.cache_resource(max_entries=1)
+def load_range_index(version: str) -> RangeMaxIndex | None:
+    """Build the range-max index over the cached price panel."""
+    if not PRICES_CSV.exists():
+        return None
+    return RangeMaxIndex(get_panel())
+
+
+@st.cache_resource(max_entries=1)
+def load_rank_history(version: str) -> RankHistory | None:
+    """Load the precomputed daily drop/rank history."""
+    if not PRICES_CSV.exists():
+        return None
+    return get_rank_history()
+
+
+@st.cache_resource(max_entries=1)
+def load_indicators(version: str) -> pd.DataFrame:
+    """Load the cached indicator table for every coin."""
+    if not PRICES_CSV.exists():
         return pd.DataFrame()
-    return pd.read_csv(RESULTS_CSV)
+    return get_indicators()
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def load_prices() -> pd.DataFrame:
-    """Load price data."""
+@st.cache_resource(max_entries=1)
+def load_correlation(version: str) -> CorrelationMatrix | None:
+    """Load the cached return correlation matrix."""
+    if not PRICES_CSV.exists():
+        return None
+    return get_correlation()
+
+
+@st.cache_data(max_entries=1)
+def load_betas(version: str) -> pd.DataFrame:
+    """Load betas versus the fetched benchmark assets."""
     if not PRICES_CSV.exists():
         return pd.DataFrame()
-    return pd.read_csv(PRICES_CSV, parse_dates=["date"])
+    return get_betas()
+
+
+@st.cache_data(max_entries=CHART_CACHE_SIZE)
+def chart_series(version: str, coin_id: str, timeframe: str,
+                 budget: int) -> tuple[pd.DataFrame, pd.DataFrame, int]:
+    """Price and volume points for one coin's charts, reduced to budget.
+
+    Min/max buckets keep every peak and trough. Returns the price points,
+    the volume points and the number of rows in the timeframe.
+    """
+    prices = shared_store().coin_history(coin_id)
+    window = in_window(prices, *resolve_window(timeframe, prices["date"].max()))
+    volume = downsample(window, "volume", budget) if "volume" in window else pd.DataFrame()
+    return downsample(window, "price", budget), volume, len(window)
+
+
+@st.cache_data(max_entries=CHART_CACHE_SIZE)
+def overlay_series(version: str, coin_id: str, timeframe: str, budget: int,
+                   columns: tuple[str, ...]) -> dict[str, pd.DataFrame]:
+    """Indicator overlay points for one coin, reduced to budget with LTTB."""
+    indicators = load_indicators(data_version(PRICES_CSV))
+    if indicators.empty:
+        return {}
+    coin_indicators = indicators[indicators["coin_id"] == coin_id]
+    window = in_window(coin_indicators,
+                       *resolve_window(timeframe, coin_indicators["date"].max()))
+    return {column: downsample(window, column, budget, method="lttb")
+            for column in columns if column in window.columns}
+
+
+@st.cache_resource(max_entries=CHART_CACHE_SIZE)
+def price_chart(version: str, coin_id: str, timeframe: str, budget: int,
+                columns: tuple[str, ...], peak_date: str, peak_price: float) -> go.Figure:
+    """Price history figure for one coin, timeframe, budget and overlay set."""
+    price_points, _, _ = chart_series(version, coin_id, timeframe, budget)
+    overlays = overlay_series(version, coin_id, timeframe, budget, columns) if columns else {}
+    return price_history(price_points, pd.to_datetime(peak_date), peak_price, overlays)
+
+
+@st.cache_resource(max_entries=CHART_CACHE_SIZE)
+def volume_chart(version: str, coin_id: str, timeframe: str, budget: int) -> go.Figure | None:
+    """Volume figure for one coin, timeframe and budget (None without volume)."""
+    _, volume_points, _ = chart_series(version, coin_id, timeframe, budget)
+    return None if volume_points.empty else volume_bars(volume_points)
+
+
+@st.cache_resource(max_entries=CHART_CACHE_SIZE)
+def rank_history_charts(version: str, coin_id: str) -> tuple[go.Figure, go.Figure] | None:
+    """Drawdown and rank figures from the precomputed history, if any."""
+    history = load_rank_history(version)
+    series = history.coin_series(coin_id) if history is not None else pd.DataFrame()
+    if series.empty:
+        return None
+    return drawdown_area(series), rank_line(series)
+
+
+@st.cache_resource(max_entries=CHART_CACHE_SIZE)
+def candle_chart(version: str, coin_id: str) -> go.Figure | None:
+    """Candlestick of the coin's last 30 rows (None if fewer than two)."""
+    last_30 = shared_store().coin_history(coin_id).tail(30)
+    return candlestick(last_30) if len(last_30) >= 2 else None
+
+
+INDICATOR_OVERLAYS = {
+    "SMA 20": ["sma_20"],
+    "SMA 50": ["sma_50"],
+    "EMA 12": ["ema_12"],
+    "EMA 26": ["ema_26"],
+    "Bollinger Bands (20)": ["bb_upper_20", "bb_mid_20", "bb_lower_20"],
+}
+
+PEAK_WINDOWS = {
+    "all": "All data (2025 peak)",
+    "ytd": "Year to date",
+    "90d": "Last 90 days",
+    "365d": "Last 365 days",
+    "custom": "Custom range",
+}
+
+CHART_TIMEFRAMES = {
+    "all": "All",
+    "365d": "1 year",
+    "90d": "90 days",
+    "30d": "30 days",
+    "7d": "7 days",
+}
+
+CHART_BUDGETS = [500, 1000, CHART_POINT_BUDGET, 5000]
+
+
+@st.fragment
+def peak_window(coin_id: str, current_price: float, version: str) -> None:
+    """Drop from the peak of a chosen window, answered by the range-max index.
+
+    Runs as a fragment: changing the window reruns only this.
+    """
+    range_index = load_range_index(version)
+    if range_index is None or not range_index.panel.dates.size:
+        return
+    first_day = pd.Timestamp(range_index.panel.dates[0])
+    last_day = pd.Timestamp(range_index.panel.dates[-1])
+
+    win_col1, win_col2, win_col3 = st.columns([1, 2, 1])
+    with win_col1:
+        window = st.selectbox("Peak window", list(PEAK_WINDOWS),
+                              format_func=PEAK_WINDOWS.get)
+    if window == "custom":
+        with win_col2:
+            picked = st.date_input("Window", (first_day, last_day),
+                                   min_value=first_day, max_value=last_day)
+        window = tuple(picked) if len(picked) == 2 else "all"
+
+    start, end = resolve_window(window, last_day)
+    window_peak = range_index.peak_in_window(coin_id, start, end)
+    if window_peak:
+        window_drop = (current_price / window_peak["price"] - 1) * 100
+        win_col3.metric(f"Drop from peak ({window_peak['date']})", f"{window_drop:+.2f}%")
+
+
+@st.fragment
+def price_charts(coin_id: str, peak_date: str, peak_price: float, version: str) -> None:
+    """Price and volume charts with their overlay, timeframe and budget controls.
+
+    Runs as a fragment: changing a control reruns only these two charts.
+    """
+    st.subheader("Price History (2025 - Present)")
+    chart_col1, chart_col2, chart_col3 = st.columns([2, 1, 1])
+    with chart_col1:
+        overlays = st.multiselect("Indicator overlays", list(INDICATOR_OVERLAYS))
+    with chart_col2:
+        # Narrow the timeframe to zoom: points are re-picked for the window
+        timeframe = st.selectbox("Timeframe", list(CHART_TIMEFRAMES),
+                                 format_func=CHART_TIMEFRAMES.get)
+    with chart_col3:
+        budget = st.select_slider("Max points", CHART_BUDGETS, value=CHART_POINT_BUDGET)
+
+    price_points, _, window_rows = chart_series(version, coin_id, timeframe, budget)
+    if len(price_points) < window_rows:
+        st.caption(f"Showing {len(price_points):,} of {window_rows:,} points "
+                   "(every peak and trough kept).")
+    columns = tuple(column for overlay in overlays for column in INDICATOR_OVERLAYS[overlay])
+    st.plotly_chart(price_chart(version, coin_id, timeframe, budget, columns,
+                                peak_date, peak_price), width="stretch")
+
+    fig_vol = volume_chart(version, coin_id, timeframe, budget)
+    if fig_vol is not None:
+        st.subheader("Trading Volume")
+        st.plotly_chart(fig_vol, width="stretch")
 
 
 st.title("💰 Coin Details")
@@ -38,8 +225,10 @@ st.title("💰 Coin Details")
 if not ensure_data():
     st.stop()
 
-results = load_results()
-prices = load_prices()
+store = shared_store()
+results = store.results
+# Loaders below are keyed on this, so they reload only when prices change
+prices_version = data_version(PRICES_CSV)
 
 if results.empty:
     st.warning("No data available. Run the data pipeline first.")
@@ -70,67 +259,33 @@ col2.metric("Current Price", f"${coin_info['current_price']:.4f}")
 col3.metric("Drop from Peak", f"{coin_info['pct_change']:+.2f}%")
 col4.metric("Market Cap", f"${coin_info.get('market_cap', 0):,.0f}")
 
+peak_window(selected, float(coin_info["current_price"]), prices_version)
+
 st.markdown("---")
 
 # Price history chart
-if not prices.empty:
-    coin_prices = prices[prices["coin_id"] == selected].sort_values("date").copy()
+if store.uses_index or store.coins:
+    coin_prices = store.coin_history(selected)
 
     if not coin_prices.empty:
-        # Line chart with peak marker
-        st.subheader("Price History (2025 - Present)")
-
-        peak_date = pd.to_datetime(coin_info["peak_date"])
-        peak_price = coin_info["peak_price"]
-
-        fig_line = px.line(
-            coin_prices,
-            x="date",
-            y="price",
-            labels={"price": "Price (USD)", "date": "Date"},
-        )
-        fig_line.add_trace(go.Scatter(
-            x=[peak_date],
-            y=[peak_price],
-            mode="markers+text",
-            marker=dict(size=12, color="red", symbol="star"),
-            text=[f"Peak: ${peak_price:.4f}"],
-            textposition="top center",
-            name="2025 Peak",
-            showlegend=True,
-        ))
-        fig_line.update_layout(height=450, hovermode="x unified")
-        st.plotly_chart(fig_line, width="stretch")
+        version = store_version()
+        price_charts(selected, str(coin_info["peak_date"]), float(coin_info["peak_price"]),
+                     version)
+
+        # Drop and rank trajectory from the precomputed history
+        rank_figures = rank_history_charts(prices_version, selected)
+        if rank_figures is not None:
+            st.subheader("Drop & Rank History")
+            hist_col1, hist_col2 = st.columns(2)
+            hist_col1.plotly_chart(rank_figures[0], width="stretch")
+            hist_col2.plotly_chart(rank_figures[1], width="stretch")
 
         # Last 30 days candlestick
         st.subheader("Last 30 Days")
-        last_30 = coin_prices.tail(30)
-
-        if len(last_30) >= 2:
-            fig_candle = go.Figure(data=[go.Candlestick(
-                x=last_30["date"],
-                open=last_30["price"].shift(1).fillna(last_30["price"]),
-                high=last_30.get("high", last_30["price"]),
-                low=last_30.get("low", last_30["price"]),
-                close=last_30["price"],
-                name="Price",
-            )])
-            fig_candle.update_layout(height=400, xaxis_rangeslider_visible=False)
+        fig_candle = candle_chart(version, selected)
+        if fig_candle is not None:
             st.plotly_chart(fig_candle, width="stretch")
 
-        # Volume chart
-        if "volume" in coin_prices.columns:
-            st.subheader("Trading Volume")
-            fig_vol = px.bar(
-                coin_prices,
-                x="date",
-                y="volume",
-                labels={"volume": "Volume (USD)", "date": "Date"},
-                color_discrete_sequence=["#667eea"],
-            )
-            fig_vol.update_layout(height=300)
-            st.plotly_chart(fig_vol, width="stretch")
-
         # Statistics table
         st.subheader("Statistics")
         stats_col1, stats_col2 = st.columns(2)
@@ -169,6 +324,27 @@ if not prices.empty:
             | Market Cap | ${coin_info.get('market_cap', 0):,.0f} |
             """)
 
+        # Co-movement with other coins and with the benchmarks
+        correlation = load_correlation(prices_version)
+        if correlation is not None and selected in correlation.coins:
+            st.subheader("Correlation & Beta")
+            corr_col1, corr_col2 = st.columns([2, 1])
+            with corr_col1:
+                st.markdown("**Most correlated coins (daily returns)**")
+                st.dataframe(correlation.most_correlated(selected, 10), hide_index=True,
+                             width="stretch")
+            with corr_col2:
+                betas = load_betas(data_version(PRICES_CSV, BENCHMARK_CSV))
+                coin_betas = betas[betas["coin_id"] == selected] if not betas.empty else betas
+                if coin_betas.empty:
+                    st.caption("Fetch BTC/ETH with `python -m src.data_fetcher --benchmarks` "
+                               "to see betas.")
+                for column in coin_betas.columns.drop("coin_id", errors="ignore"):
+                    if column.startswith("beta_"):
+                        value = coin_betas[column].iloc[0]
+                        st.metric(f"Beta vs {column[5:].upper()}",
+                                  "N/A" if pd.isna(value) else f"{value:.2f}")
+
         # Compare with market average
         st.markdown("---")
         st.subheader("Compare with Market Average")
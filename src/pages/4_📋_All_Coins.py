@@ -1,28 +1,108 @@
 """All coins ranked by price drop from 2025 peak."""
 
 import sys
+from functools import partial
 from pathlib import Path
 
-import plotly.express as px
-import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.analyzer import rank_by_drop
 from src.auto_fetch import ensure_data
-from src.config import CACHE_TTL, PRICES_CSV
+from src.charts import drop_histogram
+from src.config import EXPORT_CACHE_SIZE, RANKING_EXPORT_CSV, RANKING_EXPORT_JSON
+from src.exports import artifact_bytes, export_mime, export_name, to_bytes
+from src.store import shared_store, store_version
+from src.table import filter_positions, page_count, page_slice, style_table
 
 st.set_page_config(page_title="All Coins - Altcoin Analyzer", page_icon="📋", layout="wide")
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def load_all_drops() -> pd.DataFrame:
-    """Load price data and rank ALL coins by drop (no top-N limit)."""
-    if not PRICES_CSV.exists():
-        return pd.DataFrame()
-    df = pd.read_csv(PRICES_CSV, parse_dates=["date"])
-    return rank_by_drop(df, top_n=len(df["coin_id"].unique()))
+@st.cache_resource(max_entries=1)
+def distribution_chart(version: str) -> go.Figure:
+    """Histogram of every coin's drop from peak."""
+    return drop_histogram(shared_store().all_drops["pct_change"], nbins=30)
+
+
+@st.cache_data(max_entries=EXPORT_CACHE_SIZE)
+def export_payload(version: str, search: str, drop_range: tuple[int, int], fmt: str,
+                   compress: bool) -> bytes:
+    """Filtered ranking as a download, built on the first click per filter state."""
+    store = shared_store()
+    positions = filter_positions(store.all_drops, store.all_drops_search, search,
+                                 drop_range=drop_range)
+    return to_bytes(store.all_drops.iloc[positions], fmt, compress)
+
+
+@st.fragment
+def coin_table() -> None:
+    """Filters, summary metrics, one page of the table and the exports.
+
+    Runs as a fragment: changing a filter or the page reruns only this.
+    """
+    store = shared_store()
+    results = store.all_drops
+
+    col_filter1, col_filter2 = st.columns(2)
+    with col_filter1:
+        search = st.text_input("🔍 Search by name or symbol", "", key="all_coins_search")
+    with col_filter2:
+        drop_range = st.slider(
+            "Drop % range",
+            min_value=int(results["pct_change"].min()) - 1,
+            max_value=0,
+            value=(int(results["pct_change"].min()) - 1, 0),
+        )
+
+    # Row positions only: nothing is copied until a page or export needs rows
+    positions = filter_positions(results, store.all_drops_search, search,
+                                 drop_range=drop_range)
+    drops = results["pct_change"].iloc[positions]
+
+    # Summary metrics
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total Coins", len(positions))
+    col2.metric("Avg Drop", f"{drops.mean():.1f}%")
+    col3.metric("Median Drop", f"{drops.median():.1f}%")
+    col4.metric("Worst Drop", f"{drops.min():.1f}%")
+
+    st.markdown("---")
+
+    # Interactive table, one page at a time
+    st.subheader(f"Showing {len(positions)} coins")
+
+    pages = page_count(len(positions))
+    page = 1
+    if pages > 1:
+        # Keyed on max_value too, so a filter change starts again at page 1
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+
+    display_cols = ["coin_name", "symbol", "peak_price", "peak_date",
+                    "current_price", "current_date", "pct_change", "volume"]
+    available_cols = [c for c in display_cols if c in results.columns]
+
+    st.dataframe(style_table(page_slice(results, positions, page)[available_cols]),
+                 width="stretch")
+
+    # Download buttons: payloads are only built when clicked, and the
+    # unfiltered ranking streams from the analyzer's gzipped exports
+    col_dl1, col_dl2, col_dl3, _ = st.columns([1, 1, 1, 3])
+    compress = col_dl3.checkbox("gzip", help="Compress the download")
+    artifacts = {"csv": RANKING_EXPORT_CSV, "json": RANKING_EXPORT_JSON}
+    version = store_version()
+    for column, fmt in zip((col_dl1, col_dl2), artifacts):
+        if len(positions) == len(results) and artifacts[fmt].exists():
+            data = partial(artifact_bytes, artifacts[fmt], compress)
+        else:
+            data = partial(export_payload, version, search, tuple(drop_range), fmt, compress)
+        column.download_button(
+            f"📥 Download {fmt.upper()}",
+            data,
+            export_name("altcoin_drops_all", fmt, compress),
+            export_mime(fmt, compress),
+            on_click="ignore",
+        )
 
 
 st.title("📋 All Coins")
@@ -31,98 +111,14 @@ st.markdown("Every tracked altcoin ranked by percentage drop from their 2025 pea
 if not ensure_data():
     st.stop()
 
-results = load_all_drops()
-if results.empty:
+if shared_store().all_drops.empty:
     st.warning("No data available. Run the data pipeline first.")
     st.stop()
 
-# Filters
-col_filter1, col_filter2 = st.columns(2)
-with col_filter1:
-    search = st.text_input("🔍 Search by name or symbol", "", key="all_coins_search")
-with col_filter2:
-    drop_range = st.slider(
-        "Drop % range",
-        min_value=int(results["pct_change"].min()) - 1,
-        max_value=0,
-        value=(int(results["pct_change"].min()) - 1, 0),
-    )
-
-filtered = results.copy()
-if search:
-    name_match = filtered["coin_name"].str.contains(search, case=False, na=False)
-    sym_match = filtered["symbol"].str.contains(search, case=False, na=False)
-    filtered = filtered[name_match | sym_match]
-filtered = filtered[
-    (filtered["pct_change"] >= drop_range[0]) & (filtered["pct_change"] <= drop_range[1])
-]
-
-
-# Color-code by drop severity
-def drop_color(val: float) -> str:
-    """Return CSS color based on drop severity."""
-    if val <= -80:
-        return "color: #ff4444; font-weight: bold"
-    elif val <= -60:
-        return "color: #ff8800"
-    else:
-        return "color: #ffcc00"
-
-
-# Summary metrics
-col1, col2, col3, col4 = st.columns(4)
-col1.metric("Total Coins", len(filtered))
-col2.metric("Avg Drop", f"{filtered['pct_change'].mean():.1f}%")
-col3.metric("Median Drop", f"{filtered['pct_change'].median():.1f}%")
-col4.metric("Worst Drop", f"{filtered['pct_change'].min():.1f}%")
+coin_table()
 
 st.markdown("---")
 
-# Interactive table
-st.subheader(f"Showing {len(filtered)} coins")
-
-display_cols = ["coin_name", "symbol", "peak_price", "peak_date",
-                "current_price", "current_date", "pct_change", "volume"]
-available_cols = [c for c in display_cols if c in filtered.columns]
-
-styled = filtered[available_cols].style.format({
-    "peak_price": "${:.4f}",
-    "current_price": "${:.4f}",
-    "pct_change": "{:+.2f}%",
-    "volume": "${:,.0f}",
-}).map(drop_color, subset=["pct_change"] if "pct_change" in available_cols else [])
-
-st.dataframe(styled, width="stretch", height=600)
-
-# Download buttons
-col_dl1, col_dl2, _ = st.columns([1, 1, 4])
-with col_dl1:
-    csv_data = filtered.to_csv(index=False)
-    st.download_button(
-        "📥 Download CSV",
-        csv_data,
-        "altcoin_drops_all.csv",
-        "text/csv",
-    )
-with col_dl2:
-    json_data = filtered.to_json(orient="records", indent=2)
-    st.download_button(
-        "📥 Download JSON",
-        json_data,
-        "altcoin_drops_all.json",
-        "application/json",
-    )
-
-st.markdown("---")
-
-# Distribution chart
+# Distribution of every coin, so filtering the table leaves it alone
 st.subheader("Drop Distribution")
-fig_hist = px.histogram(
-    filtered,
-    x="pct_change",
-    nbins=30,
-    labels={"pct_change": "% Drop from Peak"},
-    color_discrete_sequence=["#667eea"],
-)
-fig_hist.update_layout(height=350)
-st.plotly_chart(fig_hist, width="stretch")
+st.plotly_chart(distribution_chart(store_version()), width="stretch")
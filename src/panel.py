@@ -0,0 +1,373 @@
+"""Dense coins x dates NumPy panel built from the long price table.
+
+The long/tidy DataFrame returned by load_data() is convenient for storage but
+every per-coin question has to filter it again. This module pivots the price
+fields into aligned 2-D arrays (one row per coin, one column per calendar
+day, NaN where a coin has no candle) so universe-wide metrics become single
+array operations. The panel is cached to disk and extended in place when the
+store only gained newer days.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer import (
+    SUMMARY_COLUMNS,
+    input_fingerprint,
+    load_data,
+    rank_summary,
+)
+from src.config import PANEL_PATH, TOP_N_RANKING
+from src.fingerprint import is_fresh, read_stamp, write_stamp
+
+logger = logging.getLogger(__name__)
+
+PANEL_FIELDS = ("price", "high", "low", "volume", "market_cap")
+
+# How several rows of one coin on one day combine; other fields keep the last
+DAILY_AGGREGATES = {"high": "max", "low": "min", "volume": "sum"}
+
+
+@dataclass
+class Panel:
+    """Aligned coins x days arrays for every stored price field.
+
+    Attributes:
+        coins: Coin identifiers, one per row.
+        names: Display names aligned with coins.
+        symbols: Ticker symbols aligned with coins.
+        dates: Consecutive calendar days (datetime64[D]), one per column.
+        fields: Field name -> float array of shape (len(coins), len(dates)).
+    """
+
+    coins: np.ndarray
+    names: np.ndarray
+    symbols: np.ndarray
+    dates: np.ndarray
+    fields: dict[str, np.ndarray]
+
+    @property
+    def price(self) -> np.ndarray:
+        """Closing price array."""
+        return self.fields["price"]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """(number of coins, number of days)."""
+        return (len(self.coins), len(self.dates))
+
+    def coin_index(self, coin_id: str) -> int:
+        """Return the row of a coin.
+
+        Raises:
+            KeyError: If the coin is not in the panel.
+        """
+        matches = np.flatnonzero(self.coins == coin_id)
+        if matches.size == 0:
+            raise KeyError(coin_id)
+        return int(matches[0])
+
+    def date_index(self, date: str | np.datetime64 | pd.Timestamp) -> int:
+        """Return the column of a calendar day (may fall outside the panel)."""
+        day = np.datetime64(pd.Timestamp(date).date(), "D")
+        return int((day - self.dates[0]).astype(int)) if self.dates.size else 0
+
+    def to_frame(self) -> pd.DataFrame:
+        """Convert back to the long format used by the analyzer functions.
+
+        Returns:
+            DataFrame sorted by coin_id and date, one row per observed price.
+        """
+        observed = ~np.isnan(self.price)
+        rows, cols = np.nonzero(observed)
+        frame = pd.DataFrame({
+            "date": pd.to_datetime(self.dates[cols]),
+            "coin_id": self.coins[rows],
+            "coin_name": self.names[rows],
+            "symbol": self.symbols[rows],
+        })
+        for name, values in self.fields.items():
+            frame[name] = values[observed]
+        return frame
+
+
+def _empty_panel(fields: tuple[str, ...] = PANEL_FIELDS) -> Panel:
+    """Return a panel with no coins and no days."""
+    empty = np.array([], dtype=str)
+    return Panel(
+        coins=empty, names=empty, symbols=empty,
+        dates=np.array([], dtype="datetime64[D]"),
+        fields={name: np.empty((0, 0)) for name in fields},
+    )
+
+
+def build_panel(df: pd.DataFrame, fields: tuple[str, ...] = PANEL_FIELDS) -> Panel:
+    """Pivot a long price DataFrame into a dense panel.
+
+    Args:
+        df: Price DataFrame as returned by load_data().
+        fields: Value columns to pivot. Columns missing from df are skipped.
+
+    Returns:
+        Panel with coins sorted by id and one column per calendar day. Several
+        rows of one coin on one day are combined per DAILY_AGGREGATES (max
+        high, min low, summed volume, last price and market cap).
+    """
+    fields = tuple(f for f in fields if f in df.columns)
+    if df.empty:
+        return _empty_panel(fields)
+
+    days = pd.to_datetime(df["date"]).to_numpy().astype("datetime64[D]")
+    codes, coins = pd.factorize(df["coin_id"], sort=True)
+    first_day = days.min()
+    offsets = (days - first_day).astype(np.int64)
+    n_days = int(offsets.max()) + 1
+
+    # Metadata from the first row of each coin
+    first_rows = pd.Series(np.arange(len(df))).groupby(codes).first().to_numpy()
+    names = (df["coin_name"].to_numpy()[first_rows] if "coin_name" in df.columns
+             else np.asarray(coins))
+    symbols = (df["symbol"].to_numpy()[first_rows] if "symbol" in df.columns
+               else np.full(len(coins), ""))
+
+    cells = pd.DataFrame({name: pd.to_numeric(df[name], errors="coerce").to_numpy(float)
+                          for name in fields})
+    keys = codes.astype(np.int64) * n_days + offsets
+    if pd.Index(keys).has_duplicates:
+        # Intraday rows: combine each (coin, day) explicitly, in time order
+        order = np.argsort(pd.to_datetime(df["date"]).to_numpy(), kind="stable")
+        daily = cells.iloc[order].groupby(keys[order], sort=False)
+        cells = pd.DataFrame({name: daily[name].agg(DAILY_AGGREGATES.get(name, "last"),
+                                                    min_count=1)
+                              for name in fields})
+        keys = cells.index.to_numpy()
+        codes, offsets = keys // n_days, keys % n_days
+
+    arrays = {}
+    for name in fields:
+        values = np.full((len(coins), n_days), np.nan)
+        values[codes, offsets] = cells[name].to_numpy()
+        arrays[name] = values
+
+    return Panel(
+        coins=np.asarray(coins, dtype=str),
+        names=np.asarray(names, dtype=str),
+        symbols=np.asarray(symbols, dtype=str),
+        dates=first_day + np.arange(n_days),
+        fields=arrays,
+    )
+
+
+def merge_panels(base: Panel, update: Panel) -> Panel:
+    """Combine two panels, letting observed values in update win.
+
+    Args:
+        base: Existing panel.
+        update: Panel built from newly added rows.
+
+    Returns:
+        Panel covering the union of coins and days of both inputs.
+    """
+    if not base.dates.size:
+        return update
+    if not update.dates.size:
+        return base
+
+    new_coins = update.coins[~np.isin(update.coins, base.coins)]
+    coins = np.concatenate([base.coins, new_coins])
+    new_meta = np.isin(update.coins, new_coins)
+    names = np.concatenate([base.names, update.names[new_meta]])
+    symbols = np.concatenate([base.symbols, update.symbols[new_meta]])
+
+    first_day = min(base.dates[0], update.dates[0])
+    last_day = max(base.dates[-1], update.dates[-1])
+    n_days = int((last_day - first_day).astype(int)) + 1
+    base_off = int((base.dates[0] - first_day).astype(int))
+    update_off = int((update.dates[0] - first_day).astype(int))
+    order = np.argsort(coins)
+    update_rows = order[np.searchsorted(coins, update.coins, sorter=order)]
+
+    arrays = {}
+    for name in base.fields.keys() | update.fields.keys():
+        values = np.full((len(coins), n_days), np.nan)
+        if name in base.fields:
+            values[:len(base.coins), base_off:base_off + len(base.dates)] = base.fields[name]
+        if name in update.fields:
+            block = values[update_rows, update_off:update_off + len(update.dates)]
+            incoming = update.fields[name]
+            values[update_rows, update_off:update_off + len(update.dates)] = np.where(
+                np.isnan(incoming), block, incoming
+            )
+        arrays[name] = values
+
+    return Panel(coins=coins, names=names, symbols=symbols,
+                 dates=first_day + np.arange(n_days), fields=arrays)
+
+
+def save_panel(panel: Panel, path: Path | str | None = None) -> Path:
+    """Write a panel to an uncompressed .npz file.
+
+    Args:
+        panel: Panel to save.
+        path: Target file (defaults to PANEL_PATH).
+
+    Returns:
+        Path to the written file.
+    """
+    path = Path(path) if path else PANEL_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {f"field_{name}": values for name, values in panel.fields.items()}
+    with open(path, "wb") as f:
+        np.savez(f, coins=panel.coins, names=panel.names, symbols=panel.symbols,
+                 dates=panel.dates, **arrays)
+    logger.info("Saved %dx%d panel to %s", *panel.shape, path)
+    return path
+
+
+def load_panel(path: Path | str | None = None) -> Panel:
+    """Load a panel written by save_panel().
+
+    Args:
+        path: Panel file (defaults to PANEL_PATH).
+
+    Returns:
+        The stored Panel.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    path = Path(path) if path else PANEL_PATH
+    with np.load(path) as data:
+        fields = {key[len("field_"):]: data[key] for key in data.files
+                  if key.startswith("field_")}
+        return Panel(coins=data["coins"], names=data["names"], symbols=data["symbols"],
+                     dates=data["dates"], fields=fields)
+
+
+def _rows_digest(row_hashes: np.ndarray) -> str:
+    """Order-independent digest of per-row content hashes."""
+    return hashlib.sha256(np.sort(row_hashes).tobytes()).hexdigest()
+
+
+def get_panel(source: str = "csv", path: Path | str | None = None) -> Panel:
+    """Return the price panel, reusing or extending the on-disk cache.
+
+    The cache is reused as-is when the input fingerprint is unchanged. When
+    the store only gained days after the cached range (the normal
+    ``data_fetcher --update`` case) only those rows are pivoted and merged.
+    The stamp keeps a content digest of the rows the cache was built from,
+    so any other change, including a revised price inside the cached range,
+    triggers a full rebuild.
+
+    Args:
+        source: Data source, either 'csv' or 'sqlite'.
+        path: Panel cache file (defaults to PANEL_PATH).
+
+    Returns:
+        Up-to-date Panel.
+    """
+    path = Path(path) if path else PANEL_PATH
+    fingerprint = input_fingerprint(source)
+    if is_fresh(path, fingerprint):
+        return load_panel(path)
+
+    df = load_data(source)
+    days = pd.to_datetime(df["date"]).to_numpy().astype("datetime64[D]")
+    row_hashes = pd.util.hash_pandas_object(df[sorted(df.columns)], index=False).to_numpy()
+
+    panel = None
+    stamp = read_stamp(path)
+    if path.exists() and "digest" in stamp:
+        cached = load_panel(path)
+        if cached.dates.size:
+            known = days <= cached.dates[-1]
+            if (int(known.sum()) == stamp["observations"]
+                    and _rows_digest(row_hashes[known]) == stamp["digest"]):
+                panel = merge_panels(cached, build_panel(df[~known]))
+                logger.info("Extended cached panel with %d new rows", int((~known).sum()))
+
+    if panel is None:
+        panel = build_panel(df)
+
+    save_panel(panel, path)
+    write_stamp(path, fingerprint, observations=len(df), digest=_rows_digest(row_hashes))
+    return panel
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Carry the last observed value of each row forward over NaN gaps.
+
+    Days before a coin's first observation stay NaN.
+
+    Args:
+        values: 2-D array of shape (coins, days).
+
+    Returns:
+        New array with gaps filled.
+    """
+    if values.size == 0:
+        return values.copy()
+    cols = np.where(np.isnan(values), 0, np.arange(values.shape[1]))
+    np.maximum.accumulate(cols, axis=1, out=cols)
+    return values[np.arange(values.shape[0])[:, None], cols]
+
+
+def _field_at(panel: Panel, name: str, cols: np.ndarray) -> np.ndarray:
+    """Pick one value per coin from a field, 0 where missing."""
+    if name not in panel.fields:
+        return np.zeros(len(panel.coins))
+    return np.nan_to_num(panel.fields[name][np.arange(len(panel.coins)), cols])
+
+
+def summarize_panel(panel: Panel) -> pd.DataFrame:
+    """Reduce a panel to the per-coin summary used for ranking.
+
+    Args:
+        panel: Price panel.
+
+    Returns:
+        DataFrame with SUMMARY_COLUMNS, one row per coin with data.
+    """
+    price = panel.price
+    observed = ~np.isnan(price)
+    counts = observed.sum(axis=1)
+    has_data = counts > 0
+    if not has_data.any():
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    rows = np.arange(len(panel.coins))
+    peak_col = np.where(observed, price, -np.inf).argmax(axis=1)
+    latest_col = price.shape[1] - 1 - observed[:, ::-1].argmax(axis=1)
+
+    dates = pd.to_datetime(panel.dates).strftime("%Y-%m-%d").to_numpy()
+    summary = pd.DataFrame({
+        "coin_id": panel.coins,
+        "coin_name": panel.names,
+        "symbol": panel.symbols,
+        "peak_price": price[rows, peak_col],
+        "peak_date": dates[peak_col],
+        "current_price": price[rows, latest_col],
+        "current_date": dates[latest_col],
+        "market_cap": _field_at(panel, "market_cap", latest_col),
+        "volume": _field_at(panel, "volume", latest_col),
+        "data_points": counts,
+    })
+    return summary[has_data].reset_index(drop=True)
+
+
+def rank_panel(panel: Panel, top_n: int = TOP_N_RANKING) -> pd.DataFrame:
+    """Rank the coins of a panel by biggest drop from peak.
+
+    Args:
+        panel: Price panel.
+        top_n: Number of top losers to return.
+
+    Returns:
+        Same layout as analyzer.rank_by_drop().
+    """
+    return rank_summary(summarize_panel(panel), top_n)
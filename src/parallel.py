@@ -0,0 +1,202 @@
+"""Process-pool analysis sharded by coin.
+
+The sorted price frame is copied once into shared memory as plain NumPy
+columns, with the coin name and symbol stored as integer codes. Each worker
+attaches to those blocks, slices out its contiguous
+range of coins and computes the per-coin summary and drawdown statistics
+for that shard, so the full frame is never pickled. The parent merges the
+small per-shard results and ranks them with the usual rank_summary().
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer import rank_summary, summarize_coins
+from src.config import TOP_N_RANKING
+from src.drawdown import drawdown_stats
+
+logger = logging.getLogger(__name__)
+
+# Shards per worker; more than one keeps workers busy when coin sizes differ
+SHARDS_PER_WORKER = 4
+
+# Per-row text columns, shared as codes so renamed coins keep every name
+LABEL_COLUMNS = ("coin_name", "symbol")
+
+
+@dataclass(frozen=True)
+class SharedColumn:
+    """Handle to a NumPy column stored in a shared memory block."""
+
+    name: str
+    dtype: str
+    length: int
+
+
+@dataclass(frozen=True)
+class Shard:
+    """A contiguous range of rows covering whole coins.
+
+    labels maps each shared text column to the sorted codes its rows use
+    and the values those codes stand for.
+    """
+
+    start: int
+    stop: int
+    coins: list[str]
+    first_code: int
+    labels: dict[str, tuple[list[int], list]]
+
+
+def _share(values: np.ndarray) -> tuple[SharedMemory, SharedColumn]:
+    """Copy an array into a new shared memory block."""
+    shm = SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+    return shm, SharedColumn(shm.name, values.dtype.str, len(values))
+
+
+def _read_shard(columns: dict[str, SharedColumn], shard: Shard) -> pd.DataFrame:
+    """Attach to the shared columns and copy out one shard as a DataFrame."""
+    data = {}
+    for key, column in columns.items():
+        shm = SharedMemory(name=column.name)
+        try:
+            values = np.ndarray((column.length,), dtype=column.dtype, buffer=shm.buf)
+            data[key] = values[shard.start:shard.stop].copy()
+        finally:
+            shm.close()
+
+    local = data.pop("code") - shard.first_code
+    frame = {
+        "date": data.pop("date"),
+        "coin_id": np.asarray(shard.coins, dtype=object)[local],
+    }
+    for key, (used, values) in shard.labels.items():
+        frame[key] = np.asarray(values, dtype=object)[np.searchsorted(used, data.pop(key))]
+    return pd.DataFrame({**frame, **data})
+
+
+def analyze_shard(
+    columns: dict[str, SharedColumn], shard: Shard
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Compute the summary and drawdown statistics for one shard.
+
+    Runs inside a worker process.
+
+    Args:
+        columns: Shared memory handles for the price columns.
+        shard: Row range and coin metadata to analyze.
+
+    Returns:
+        (summary, drawdown stats) DataFrames for the shard's coins.
+    """
+    frame = _read_shard(columns, shard)
+    return summarize_coins(frame), drawdown_stats(frame)
+
+
+def plan_shards(
+    df: pd.DataFrame,
+    codes: np.ndarray,
+    n_shards: int,
+    labels: dict[str, tuple[np.ndarray, np.ndarray]] | None = None,
+) -> list[Shard]:
+    """Split a coin-sorted frame into row ranges of roughly equal size.
+
+    Args:
+        df: Price frame sorted by coin_id and date.
+        codes: Integer coin code per row (non-decreasing).
+        n_shards: Desired number of shards.
+        labels: Text column -> (code per row, value per code), as returned
+            by pd.factorize(); each shard gets the values its rows use.
+
+    Returns:
+        Shards that never split a coin.
+    """
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    bounds = np.r_[starts, len(df)]
+    targets = np.linspace(0, len(df), n_shards + 1)[1:-1]
+    cuts = np.unique(np.r_[0, bounds[np.searchsorted(bounds, targets)], len(df)])
+
+    coin_ids = df["coin_id"].iloc[starts].astype(str).tolist()
+
+    shards = []
+    for start, stop in zip(cuts[:-1], cuts[1:]):
+        lo, hi = np.searchsorted(starts, [start, stop])
+        used = {}
+        for key, (label_codes, values) in (labels or {}).items():
+            present = np.unique(label_codes[start:stop])
+            used[key] = (present.tolist(), np.asarray(values, dtype=object)[present].tolist())
+        shards.append(Shard(
+            start=int(start), stop=int(stop), coins=coin_ids[lo:hi],
+            first_code=int(codes[start]), labels=used,
+        ))
+    return shards
+
+
+def rank_parallel(
+    df: pd.DataFrame,
+    workers: int,
+    top_n: int | None = TOP_N_RANKING,
+) -> pd.DataFrame:
+    """Rank coins with drawdown columns using a process pool.
+
+    Produces the same output as rank_by_drop(df, top_n, drawdowns=True).
+
+    Args:
+        df: Full price DataFrame.
+        workers: Number of worker processes; 1 analyzes shards in-process.
+        top_n: Number of top losers to return; None keeps every coin.
+
+    Returns:
+        DataFrame ranked by drop percentage (biggest drops first).
+    """
+    if df.empty:
+        return pd.DataFrame()
+
+    df = df.sort_values(["coin_id", "date"], kind="stable", ignore_index=True)
+    codes = pd.factorize(df["coin_id"])[0].astype(np.int32)
+    labels = {key: pd.factorize(df[key], use_na_sentinel=False)
+              for key in LABEL_COLUMNS if key in df.columns}
+    shards = plan_shards(df, codes, max(workers, 1) * SHARDS_PER_WORKER, labels)
+
+    blocks: list[SharedMemory] = []
+    columns: dict[str, SharedColumn] = {}
+    try:
+        arrays = {
+            "code": codes,
+            "date": pd.to_datetime(df["date"]).to_numpy().astype("datetime64[ns]"),
+            "price": df["price"].to_numpy(float),
+            **{key: label_codes.astype(np.int32) for key, (label_codes, _) in labels.items()},
+        }
+        for optional in ("market_cap", "volume"):
+            if optional in df.columns:
+                arrays[optional] = df[optional].to_numpy(float)
+        for key, values in arrays.items():
+            shm, columns[key] = _share(values)
+            blocks.append(shm)
+
+        logger.info("Analyzing %d coins in %d shards on %d workers",
+                    codes[-1] + 1, len(shards), workers)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(analyze_shard, [columns] * len(shards), shards))
+        else:
+            parts = [analyze_shard(columns, shard) for shard in shards]
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    summary = pd.concat([part[0] for part in parts], ignore_index=True)
+    stats = pd.concat([part[1] for part in parts], ignore_index=True)
+    results = rank_summary(summary, top_n)
+    if results.empty:
+        return results
+    results = results.join(stats.set_index("coin_id"), on="coin_id")
+    results.index.name = "rank"
+    return results
@@ -0,0 +1,282 @@
+"""Vectorized data-quality checks over the stored price data.
+
+validate_data() in the fetcher only cleans one freshly downloaded coin at a
+time. This module checks the whole stored dataset in one pass: the frame is
+sorted by coin and date once, and every check is a column operation using
+coin-aware shifts, run-length labels or a grouped rolling median, so no
+Python loop over coins is needed.
+
+Checks (one boolean flag column each):
+
+- non_positive: price is missing, zero or negative
+- duplicate: repeated (coin_id, date) row (all but the first)
+- high_below_low: candle high below its low
+- close_outside_range: close above the high or below the low
+- spike: close at least SPIKE_RATIO times above or below the median of the
+  surrounding SPIKE_WINDOW days, with neighbours on both sides
+- stale_close: part of a run of at least STALE_CLOSE_DAYS identical closes
+- zero_volume_streak: part of a run of at least ZERO_VOLUME_DAYS days with
+  zero volume
+
+Rows flagged by OUTLIER_CHECKS corrupt peaks; they can be ignored by
+rank_by_drop(ignore_outliers=True) or moved out of the stores with
+quarantine().
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer import load_data
+from src.config import (
+    DATABASE_PATH,
+    PRICES_CSV,
+    QUALITY_REPORT_CSV,
+    QUARANTINE_CSV,
+    SPIKE_RATIO,
+    SPIKE_WINDOW,
+    STALE_CLOSE_DAYS,
+    ZERO_VOLUME_DAYS,
+)
+
+logger = logging.getLogger(__name__)
+
+CHECKS = (
+    "non_positive", "duplicate", "high_below_low", "close_outside_range",
+    "spike", "stale_close", "zero_volume_streak",
+)
+
+# Checks whose rows are treated as bad prices rather than just suspicious
+OUTLIER_CHECKS = ("non_positive", "duplicate", "high_below_low", "spike")
+
+
+def _run_lengths(flag: np.ndarray, same_coin: np.ndarray) -> np.ndarray:
+    """Length of the run of consecutive True rows (within a coin) each row is in.
+
+    Args:
+        flag: Boolean per row, rows sorted by coin and date.
+        same_coin: True where a row has the same coin as the previous row.
+
+    Returns:
+        Run length for flagged rows, 0 elsewhere.
+    """
+    continues = np.r_[False, flag[:-1]] & same_coin
+    run_id = np.cumsum(flag & ~continues) - 1
+    lengths = np.zeros(len(flag), dtype=np.int64)
+    if flag.any():
+        lengths[flag] = np.bincount(run_id[flag])[run_id[flag]]
+    return lengths
+
+
+def _numeric(df: pd.DataFrame, column: str) -> pd.Series:
+    """Return a column as floats, all NaN if it is missing."""
+    if column not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[column], errors="coerce")
+
+
+def check_quality(df: pd.DataFrame) -> pd.DataFrame:
+    """Flag suspicious rows of a price DataFrame.
+
+    Args:
+        df: Price DataFrame as returned by load_data(), in any order.
+
+    Returns:
+        DataFrame aligned with df's index with one boolean column per name
+        in CHECKS plus 'flagged' (any check) and 'outlier' (any of
+        OUTLIER_CHECKS).
+    """
+    if df.empty:
+        return pd.DataFrame(columns=[*CHECKS, "flagged", "outlier"], dtype=bool)
+
+    data = df.reset_index(drop=True).assign(date=lambda d: pd.to_datetime(d["date"]))
+    data = data.sort_values(["coin_id", "date"], kind="stable")
+    codes = pd.factorize(data["coin_id"])[0]
+    same_coin = np.r_[False, codes[1:] == codes[:-1]]
+    has_prev = pd.Series(same_coin, index=data.index)
+    has_next = pd.Series(np.r_[same_coin[1:], False], index=data.index)
+
+    price, high, low = _numeric(data, "price"), _numeric(data, "high"), _numeric(data, "low")
+    volume = _numeric(data, "volume")
+    flags = pd.DataFrame(index=data.index)
+
+    flags["non_positive"] = ~(price > 0)
+    flags["duplicate"] = data.duplicated(["coin_id", "date"], keep="first")
+    flags["high_below_low"] = high < low
+    flags["close_outside_range"] = (price > high) | (price < low)
+
+    valid_price = price.where(price > 0)
+    median = (valid_price.groupby(codes, sort=False)
+              .rolling(SPIKE_WINDOW, center=True, min_periods=3).median()
+              .droplevel(0))
+    ratio = valid_price / median
+    flags["spike"] = ((ratio >= SPIKE_RATIO) | (ratio <= 1 / SPIKE_RATIO)) & has_prev & has_next
+
+    repeated = (price.to_numpy() == np.r_[np.nan, price.to_numpy()[:-1]]) & same_coin
+    flags["stale_close"] = _run_lengths(repeated, same_coin) + 1 >= STALE_CLOSE_DAYS
+    flags["stale_close"] &= repeated
+
+    zero_volume = (volume == 0).to_numpy()
+    flags["zero_volume_streak"] = _run_lengths(zero_volume, same_coin) >= ZERO_VOLUME_DAYS
+
+    flags = flags[list(CHECKS)].fillna(False).astype(bool)
+    flags["flagged"] = flags.any(axis=1)
+    flags["outlier"] = flags[list(OUTLIER_CHECKS)].any(axis=1)
+    return flags.sort_index().set_axis(df.index)
+
+
+def quality_report(df: pd.DataFrame, flags: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Summarize the checks per coin.
+
+    Args:
+        df: Price DataFrame.
+        flags: Output of check_quality(df); computed if omitted.
+
+    Returns:
+        DataFrame with coin_id, rows, one count column per check,
+        flagged_rows and flagged_pct, worst coins first.
+    """
+    flags = check_quality(df) if flags is None else flags
+    if df.empty:
+        return pd.DataFrame(columns=["coin_id", "rows", *CHECKS, "flagged_rows", "flagged_pct"])
+
+    grouped = flags[[*CHECKS, "flagged"]].groupby(df["coin_id"].to_numpy())
+    report = grouped.sum().astype(int).rename(columns={"flagged": "flagged_rows"})
+    report.insert(0, "rows", grouped.size())
+    report["flagged_pct"] = (report["flagged_rows"] / report["rows"] * 100).round(2)
+    report.index.name = "coin_id"
+    return report.reset_index().sort_values(["flagged_rows", "coin_id"],
+                                            ascending=[False, True], ignore_index=True)
+
+
+def drop_outliers(df: pd.DataFrame, flags: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Remove rows flagged by OUTLIER_CHECKS.
+
+    Args:
+        df: Price DataFrame.
+        flags: Output of check_quality(df); computed if omitted.
+
+    Returns:
+        df without outlier rows.
+    """
+    flags = check_quality(df) if flags is None else flags
+    if flags.empty:
+        return df
+    removed = int(flags["outlier"].sum())
+    if removed:
+        logger.info("Ignoring %d outlier rows", removed)
+    return df[~flags["outlier"].to_numpy()]
+
+
+def _append_quarantine(rows: pd.DataFrame, path: Path, reasons: pd.Series) -> None:
+    """Append quarantined rows and their reasons to the quarantine CSV."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_header = not path.exists() or path.stat().st_size == 0
+    rows.assign(reason=reasons.to_numpy()).to_csv(path, mode="a", header=write_header,
+                                                  index=False)
+
+
+def _reasons(flags: pd.DataFrame) -> pd.Series:
+    """Join the names of the outlier checks each row failed."""
+    reasons = pd.Series("", index=flags.index)
+    for name in OUTLIER_CHECKS:
+        reasons = reasons.mask(flags[name], reasons + name + ",")
+    return reasons.str.rstrip(",")
+
+
+def _replace_csv(df: pd.DataFrame, path: Path) -> None:
+    """Rewrite a CSV atomically, so readers never see a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            df.to_csv(f, index=False)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def quarantine(
+    csv_path: Path | str | None = None,
+    db_path: Path | str | None = None,
+    quarantine_path: Path | str | None = None,
+) -> int:
+    """Move outlier rows out of the CSV and SQLite stores.
+
+    Removed rows are appended to the quarantine CSV with the failed checks.
+    The CSV is rewritten through a temporary file, so concurrent readers see
+    either the old or the new store, never a truncated one.
+    Rewriting a store changes its fingerprint, so derived artifacts are
+    rebuilt on their next use.
+
+    Args:
+        csv_path: Price CSV (defaults to PRICES_CSV).
+        db_path: SQLite database (defaults to DATABASE_PATH).
+        quarantine_path: Quarantine CSV (defaults to QUARANTINE_CSV).
+
+    Returns:
+        Number of rows removed across both stores.
+    """
+    csv_path = Path(csv_path) if csv_path else PRICES_CSV
+    db_path = Path(db_path) if db_path else DATABASE_PATH
+    quarantine_path = Path(quarantine_path) if quarantine_path else QUARANTINE_CSV
+    removed = 0
+
+    if csv_path.exists():
+        df = pd.read_csv(csv_path)
+        flags = check_quality(df)
+        bad = flags["outlier"].to_numpy()
+        if bad.any():
+            _append_quarantine(df[bad], quarantine_path, _reasons(flags[bad]))
+            _replace_csv(df[~bad], csv_path)
+            removed += int(bad.sum())
+            logger.info("Quarantined %d rows from %s", int(bad.sum()), csv_path)
+
+    if db_path.exists():
+        conn = sqlite3.connect(str(db_path))
+        try:
+            df = pd.read_sql("SELECT rowid AS row_id, * FROM prices", conn)
+            flags = check_quality(df)
+            bad = flags["outlier"].to_numpy()
+            if bad.any():
+                rows = df[bad]
+                _append_quarantine(rows.drop(columns="row_id"), quarantine_path,
+                                   _reasons(flags[bad]))
+                conn.executemany("DELETE FROM prices WHERE rowid = ?",
+                                 [(int(r),) for r in rows["row_id"]])
+                conn.commit()
+                removed += int(bad.sum())
+                logger.info("Quarantined %d rows from %s", int(bad.sum()), db_path)
+        finally:
+            conn.close()
+
+    return removed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check stored price data quality")
+    parser.add_argument("--source", choices=["csv", "sqlite"], default="csv",
+                        help="Price store to check")
+    parser.add_argument("--quarantine", action="store_true",
+                        help="Move outlier rows out of the CSV and SQLite stores")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    prices = load_data(args.source)
+    report = quality_report(prices)
+    QUALITY_REPORT_CSV.parent.mkdir(parents=True, exist_ok=True)
+    report.to_csv(QUALITY_REPORT_CSV, index=False)
+
+    flagged = report[report["flagged_rows"] > 0]
+    print(f"\n{len(flagged)} of {len(report)} coins have flagged rows "
+          f"(report: {QUALITY_REPORT_CSV})")
+    if not flagged.empty:
+        print(flagged.head(20).to_string(index=False))
+    if args.quarantine:
+        print(f"\nQuarantined {quarantine()} rows to {QUARANTINE_CSV}")
@@ -0,0 +1,192 @@
+"""Range-maximum index for peak prices over arbitrary windows.
+
+The analyzer's "2025 peak" is the maximum over everything since START_DATE.
+To answer "drop from the 90-day high" or "from the peak between two dates"
+without rescanning the data, this module builds a sparse table of argmax
+positions over the panel's price array. Each level k stores, for every
+start column, the column of the maximum over the next 2**k days, so any
+window is covered by two overlapping blocks and answered in O(1).
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer import rank_summary
+from src.config import TOP_N_RANKING
+from src.panel import Panel, summarize_panel
+
+logger = logging.getLogger(__name__)
+
+WINDOW_CHOICES = ("all", "ytd", "30d", "90d", "180d", "365d")
+
+
+class RangeMaxIndex:
+    """Sparse table answering max-price queries over any day range.
+
+    Memory is coins x days x log2(days) indices (int16 while the panel spans
+    fewer than 32768 days), built with one vectorized pass per level.
+    """
+
+    def __init__(self, panel: Panel) -> None:
+        self.panel = panel
+        self._values = np.where(np.isnan(panel.price), -np.inf, panel.price)
+        n_coins, n_days = panel.shape
+        dtype = np.int16 if n_days < np.iinfo(np.int16).max else np.int32
+
+        level = np.broadcast_to(np.arange(n_days, dtype=dtype), (n_coins, n_days))
+        self._levels = [np.ascontiguousarray(level)]
+        rows = np.arange(n_coins)[:, None]
+        span = 1
+        while 2 * span <= n_days:
+            prev = self._levels[-1]
+            left, right = prev[:, :-span], prev[:, span:]
+            # Strict comparison keeps the earliest day on ties
+            take_right = self._values[rows, right] > self._values[rows, left]
+            self._levels.append(np.where(take_right, right, left).astype(dtype))
+            span *= 2
+        logger.debug("Built range-max index with %d levels for %dx%d panel",
+                     len(self._levels), n_coins, n_days)
+
+    def _query(self, rows: np.ndarray, start: int, end: int) -> np.ndarray:
+        """Return the argmax column over [start, end] for the given rows."""
+        k = int(np.log2(end - start + 1))
+        left = self._levels[k][rows, start]
+        right = self._levels[k][rows, end - (1 << k) + 1]
+        take_right = self._values[rows, right] > self._values[rows, left]
+        return np.where(take_right, right, left)
+
+    def _clip(self, start: str | pd.Timestamp | None,
+              end: str | pd.Timestamp | None) -> tuple[int, int] | None:
+        """Convert a date range to inclusive column bounds inside the panel."""
+        n_days = len(self.panel.dates)
+        if n_days == 0:
+            return None
+        lo = 0 if start is None else max(self.panel.date_index(start), 0)
+        hi = n_days - 1 if end is None else min(self.panel.date_index(end), n_days - 1)
+        if lo > hi:
+            return None
+        return lo, hi
+
+    def peak_in_window(
+        self,
+        coin_id: str,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+    ) -> dict[str, float | str]:
+        """Find a coin's peak price between two dates (inclusive).
+
+        Args:
+            coin_id: Coin identifier.
+            start: First day of the window (defaults to the first stored day).
+            end: Last day of the window (defaults to the last stored day).
+
+        Returns:
+            Dict with 'price' and 'date' of the peak, or empty dict if the coin
+            is unknown or has no prices in the window.
+        """
+        bounds = self._clip(start, end)
+        try:
+            row = self.panel.coin_index(coin_id)
+        except KeyError:
+            return {}
+        if bounds is None:
+            return {}
+
+        col = int(self._query(np.array([row]), *bounds)[0])
+        price = self._values[row, col]
+        if not np.isfinite(price):
+            return {}
+        return {
+            "price": float(price),
+            "date": str(self.panel.dates[col]),
+        }
+
+    def window_peaks(
+        self,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """Find every coin's peak between two dates in one vectorized query.
+
+        Args:
+            start: First day of the window (defaults to the first stored day).
+            end: Last day of the window (defaults to the last stored day).
+
+        Returns:
+            DataFrame with coin_id, peak_price and peak_date. Coins without
+            prices in the window have NaN peak_price.
+        """
+        bounds = self._clip(start, end)
+        rows = np.arange(len(self.panel.coins))
+        if bounds is None:
+            return pd.DataFrame({"coin_id": self.panel.coins, "peak_price": np.nan,
+                                 "peak_date": None})
+
+        cols = self._query(rows, *bounds)
+        prices = self._values[rows, cols]
+        return pd.DataFrame({
+            "coin_id": self.panel.coins,
+            "peak_price": np.where(np.isfinite(prices), prices, np.nan),
+            "peak_date": np.datetime_as_string(self.panel.dates[cols], unit="D"),
+        })
+
+
+def resolve_window(
+    window: str | tuple[str, str],
+    last_date: str | pd.Timestamp,
+) -> tuple[pd.Timestamp | None, pd.Timestamp]:
+    """Translate a window name into a (start, end) date range.
+
+    Args:
+        window: One of WINDOW_CHOICES, any "<N>d" trailing window, or an
+            explicit (start, end) tuple of dates.
+        last_date: Most recent day in the data, used as the window end.
+
+    Returns:
+        (start, end) timestamps; start is None for the full history.
+
+    Raises:
+        ValueError: If the window is not recognised.
+    """
+    end = pd.Timestamp(last_date).normalize()
+    if isinstance(window, tuple):
+        return pd.Timestamp(window[0]), pd.Timestamp(window[1])
+    if window == "all":
+        return None, end
+    if window == "ytd":
+        return pd.Timestamp(year=end.year, month=1, day=1), end
+    if window.endswith("d") and window[:-1].isdigit() and int(window[:-1]) > 0:
+        return end - pd.Timedelta(days=int(window[:-1]) - 1), end
+    raise ValueError(f"Unknown peak window: {window!r}")
+
+
+def rank_by_window(
+    index: RangeMaxIndex,
+    window: str | tuple[str, str] = "all",
+    top_n: int = TOP_N_RANKING,
+) -> pd.DataFrame:
+    """Rank coins by drop from their peak within a window.
+
+    The current price is always each coin's latest stored price; only the
+    peak is restricted to the window.
+
+    Args:
+        index: Range-max index over the price panel.
+        window: Window accepted by resolve_window().
+        top_n: Number of top losers to return.
+
+    Returns:
+        Same layout as analyzer.rank_by_drop().
+    """
+    summary = summarize_panel(index.panel)
+    if summary.empty:
+        return pd.DataFrame()
+
+    start, end = resolve_window(window, index.panel.dates[-1])
+    peaks = index.window_peaks(start, end).set_index("coin_id")
+    summary["peak_price"] = peaks.loc[summary["coin_id"], "peak_price"].to_numpy()
+    summary["peak_date"] = peaks.loc[summary["coin_id"], "peak_date"].to_numpy()
+    summary = summary.dropna(subset=["peak_price"])
+    return rank_summary(summary, top_n)
@@ -0,0 +1,166 @@
+"""Daily drop-from-peak and rank history for every coin.
+
+Charting how a coin's drop and rank evolved would otherwise mean calling
+rank_by_drop once per historical day. Here the whole history is computed in
+one pass over the price panel: a running maximum along the day axis gives
+the drawdown from peak for every coin and day, and a single stable argsort
+along the coin axis ranks each day. The result is stored as float32
+drawdowns and int16 ranks (int32 past 32767 coins) so the dashboard can
+load it instantly.
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer import input_fingerprint
+from src.config import MIN_DATA_DAYS, RANK_HISTORY_PATH
+from src.fingerprint import is_fresh, write_stamp
+from src.panel import Panel, forward_fill, get_panel
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RankHistory:
+    """Per-day drop from running peak and drop rank for every coin.
+
+    Attributes:
+        coins: Coin identifiers, one per row.
+        dates: Calendar days (datetime64[D]), one per column.
+        drawdown: Percent change from the running peak (NaN before the
+            coin's first price), shape (coins, days).
+        rank: 1-based drop rank on each day; 0 where the coin was not ranked
+            (fewer than MIN_DATA_DAYS prices or no drop from peak).
+    """
+
+    coins: np.ndarray
+    dates: np.ndarray
+    drawdown: np.ndarray
+    rank: np.ndarray
+
+    def coin_series(self, coin_id: str) -> pd.DataFrame:
+        """Return one coin's history as a DataFrame.
+
+        Args:
+            coin_id: Coin identifier.
+
+        Returns:
+            DataFrame with date, drawdown_pct and rank (NaN when unranked),
+            or an empty DataFrame if the coin is unknown.
+        """
+        matches = np.flatnonzero(self.coins == coin_id)
+        if matches.size == 0:
+            return pd.DataFrame(columns=["date", "drawdown_pct", "rank"])
+        row = matches[0]
+        rank = self.rank[row].astype(float)
+        rank[rank == 0] = np.nan
+        series = pd.DataFrame({
+            "date": pd.to_datetime(self.dates),
+            "drawdown_pct": self.drawdown[row].astype(float),
+            "rank": rank,
+        })
+        return series.dropna(subset=["drawdown_pct"]).reset_index(drop=True)
+
+
+def compute_rank_history(panel: Panel, min_data_days: int = MIN_DATA_DAYS) -> RankHistory:
+    """Compute drawdown and rank for all coins and all days in one pass.
+
+    On every day the values match rank_by_drop(df, as_of=day) over the full
+    universe: the current price is the last known price, the peak is the
+    running maximum, and the same eligibility and rounding rules apply.
+
+    Args:
+        panel: Price panel.
+        min_data_days: Minimum number of prices before a coin is ranked.
+
+    Returns:
+        RankHistory aligned with the panel.
+    """
+    price = panel.price
+    observed = ~np.isnan(price)
+    current = forward_fill(price)
+    running_peak = np.fmax.accumulate(price, axis=1) if price.size else price.copy()
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drawdown = np.round((current - running_peak) / running_peak * 100, 2)
+
+    eligible = (
+        (np.cumsum(observed, axis=1) >= min_data_days)
+        & (running_peak > 0)
+        & (current > 0)
+        & (drawdown < 0)
+    )
+
+    # Stable sort keeps panel (coin id) order for ties, like rank_summary
+    order = np.argsort(np.where(eligible, drawdown, np.inf), axis=0, kind="stable")
+    dtype = np.int16 if price.shape[0] <= np.iinfo(np.int16).max else np.int32
+    rank = np.zeros(price.shape, dtype=dtype)
+    np.put_along_axis(rank, order, np.arange(1, price.shape[0] + 1, dtype=dtype)[:, None],
+                      axis=0)
+    rank[~eligible] = 0
+
+    logger.info("Computed rank history for %d coins over %d days", *price.shape)
+    return RankHistory(
+        coins=panel.coins,
+        dates=panel.dates,
+        drawdown=drawdown.astype(np.float32),
+        rank=rank,
+    )
+
+
+def save_rank_history(history: RankHistory, path: Path | str | None = None) -> Path:
+    """Write a rank history to a compressed .npz file.
+
+    Args:
+        history: History to save.
+        path: Target file (defaults to RANK_HISTORY_PATH).
+
+    Returns:
+        Path to the written file.
+    """
+    path = Path(path) if path else RANK_HISTORY_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        np.savez_compressed(f, coins=history.coins, dates=history.dates,
+                            drawdown=history.drawdown, rank=history.rank)
+    return path
+
+
+def load_rank_history(path: Path | str | None = None) -> RankHistory:
+    """Load a rank history written by save_rank_history().
+
+    Args:
+        path: History file (defaults to RANK_HISTORY_PATH).
+
+    Returns:
+        The stored RankHistory.
+    """
+    path = Path(path) if path else RANK_HISTORY_PATH
+    with np.load(path) as data:
+        return RankHistory(coins=data["coins"], dates=data["dates"],
+                           drawdown=data["drawdown"], rank=data["rank"])
+
+
+def get_rank_history(source: str = "csv", path: Path | str | None = None) -> RankHistory:
+    """Return the rank history, recomputing it only when the inputs changed.
+
+    Args:
+        source: Data source, either 'csv' or 'sqlite'.
+        path: History cache file (defaults to RANK_HISTORY_PATH).
+
+    Returns:
+        Up-to-date RankHistory.
+    """
+    path = Path(path) if path else RANK_HISTORY_PATH
+    fingerprint = input_fingerprint(source)
+    if is_fresh(path, fingerprint):
+        return load_rank_history(path)
+
+    history = compute_rank_history(get_panel(source))
+    save_rank_history(history, path)
+    write_stamp(path, fingerprint)
+    return history
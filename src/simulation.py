@@ -0,0 +1,297 @@
+"""Block-bootstrap confidence bands for drawdown depth and recovery time.
+
+Each coin's observed daily log returns are resampled in contiguous blocks
+(a circular moving-block bootstrap keeps short-range volatility clustering)
+to build many hypothetical price paths over a fixed horizon. From every
+path we take
+
+- the deepest drawdown from the running peak, and
+- the first day the price gets back to the coin's historical peak, starting
+  from its current price (censored at the horizon),
+
+and report quantiles across paths. Paths for a batch of coins are built as
+one (coins, paths, days) array, so the work is a handful of NumPy gathers,
+cumulative sums and reductions. Every coin draws from its own child of one
+SeedSequence, which makes results reproducible and independent of the batch
+size or the number of worker processes.
+"""
+
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    BOOTSTRAP_BLOCK_DAYS,
+    BOOTSTRAP_PATHS,
+    CONFIDENCE_LEVEL,
+    MIN_DATA_DAYS,
+    SIMULATION_HORIZON_DAYS,
+)
+from src.panel import Panel, get_panel
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on coins x paths x days simulated at once per batch
+MAX_BATCH_CELLS = 2_000_000
+
+INTERVAL_COLUMNS = [
+    "coin_id", "observations", "current_drop_pct",
+    "max_drawdown_lo", "max_drawdown_median", "max_drawdown_hi",
+    "recovery_prob_pct", "recovery_days_lo", "recovery_days_median", "recovery_days_hi",
+]
+
+
+def coin_log_returns(panel: Panel) -> tuple[np.ndarray, np.ndarray]:
+    """Pack each coin's observed daily log returns to the left of a row.
+
+    A return is observed when the coin has a price on both days; gaps are
+    dropped rather than bridged.
+
+    Args:
+        panel: Price panel.
+
+    Returns:
+        (returns, lengths): returns has shape (coins, max length), NaN
+        padded; lengths holds each coin's number of returns.
+    """
+    prices = panel.price
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_returns = np.log(prices[:, 1:] / prices[:, :-1])
+    valid = np.isfinite(log_returns)
+    lengths = valid.sum(axis=1)
+
+    packed = np.full((len(panel.coins), int(lengths.max(initial=0))), np.nan)
+    rows, _ = np.nonzero(valid)
+    packed[rows, (np.cumsum(valid, axis=1) - 1)[valid]] = log_returns[valid]
+    return packed, lengths
+
+
+def bootstrap_paths(
+    returns: np.ndarray,
+    lengths: np.ndarray,
+    seeds: list[np.random.SeedSequence],
+    n_paths: int,
+    horizon: int,
+    block_days: int,
+) -> np.ndarray:
+    """Resample cumulative log-price paths with a circular block bootstrap.
+
+    Args:
+        returns: Packed log returns, shape (coins, max length).
+        lengths: Returns per coin (all > 0).
+        seeds: One SeedSequence per coin.
+        n_paths: Paths per coin.
+        horizon: Days per path.
+        block_days: Length of each resampled block.
+
+    Returns:
+        Cumulative log returns, shape (coins, n_paths, horizon).
+    """
+    n_coins = len(lengths)
+    n_blocks = -(-horizon // block_days)
+    starts = np.stack([
+        np.random.default_rng(seed).integers(0, length, size=(n_paths, n_blocks))
+        for seed, length in zip(seeds, lengths)
+    ])
+
+    # Append each coin's first block_days returns after its last one so a
+    # circular block never wraps, then gather from the flattened rows
+    width = returns.shape[1] + block_days
+    cols = np.arange(width)
+    wrapped = np.where(cols < lengths[:, None], cols, (cols - lengths[:, None]) % lengths[:, None])
+    extended = np.take_along_axis(returns, wrapped, axis=1)
+
+    base = (starts + (np.arange(n_coins) * width)[:, None, None]).astype(np.int32)
+    days = base[..., None] + np.arange(block_days, dtype=np.int32)
+    days = days.reshape(n_coins, n_paths, -1)[..., :horizon]
+    return np.cumsum(extended.ravel().take(days), axis=2)
+
+
+def path_statistics(log_paths: np.ndarray, gaps: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Measure drawdown depth and recovery time on each simulated path.
+
+    Args:
+        log_paths: Cumulative log returns, shape (coins, paths, days); the
+            path starts at 0 on day 0, which is not stored.
+        gaps: Log distance from each coin's current price up to its peak.
+
+    Returns:
+        (max_drawdown, recovery_days), each of shape (coins, paths).
+        max_drawdown is the deepest fractional drop from the running peak
+        (<= 0); recovery_days is the first day the path regains the peak,
+        0 for coins at their peak and inf if it never does.
+    """
+    running_peak = np.maximum(np.maximum.accumulate(log_paths, axis=2), 0.0)
+    max_drawdown = np.expm1((log_paths - running_peak).min(axis=2))
+
+    reached = log_paths >= gaps[:, None, None]
+    recovery_days = np.where(reached.any(axis=2), reached.argmax(axis=2) + 1.0, np.inf)
+    recovery_days[gaps <= 0] = 0.0
+    return max_drawdown, recovery_days
+
+
+def _quantiles(values: np.ndarray, confidence: float) -> np.ndarray:
+    """Lower, median and upper quantiles along the path axis.
+
+    Uses observed values (no interpolation) so censored paths at inf stay
+    inf instead of turning into NaN.
+    """
+    tail = (1 - confidence) / 2
+    return np.quantile(values, [tail, 0.5, 1 - tail], axis=1, method="inverted_cdf")
+
+
+def simulate_batch(
+    returns: np.ndarray,
+    lengths: np.ndarray,
+    gaps: np.ndarray,
+    seeds: list[np.random.SeedSequence],
+    n_paths: int,
+    horizon: int,
+    block_days: int,
+    confidence: float,
+) -> np.ndarray:
+    """Simulate a batch of coins and reduce the paths to quantiles.
+
+    Returns:
+        Array of shape (coins, 7): drawdown lo/median/hi (fractions),
+        recovery probability, recovery days lo/median/hi (inf if beyond the
+        horizon).
+    """
+    log_paths = bootstrap_paths(returns, lengths, seeds, n_paths, horizon, block_days)
+    max_drawdown, recovery_days = path_statistics(log_paths, gaps)
+    return np.column_stack([
+        _quantiles(max_drawdown, confidence).T,
+        np.isfinite(recovery_days).mean(axis=1),
+        _quantiles(recovery_days, confidence).T,
+    ])
+
+
+def _batches(n_coins: int, n_paths: int, horizon: int) -> list[slice]:
+    """Split coins so each batch holds at most MAX_BATCH_CELLS path days."""
+    size = max(MAX_BATCH_CELLS // max(n_paths * horizon, 1), 1)
+    return [slice(start, start + size) for start in range(0, n_coins, size)]
+
+
+def simulate_drawdowns(
+    panel: Panel,
+    n_paths: int = BOOTSTRAP_PATHS,
+    horizon: int = SIMULATION_HORIZON_DAYS,
+    block_days: int = BOOTSTRAP_BLOCK_DAYS,
+    confidence: float = CONFIDENCE_LEVEL,
+    seed: int | None = 0,
+    workers: int = 1,
+    min_observations: int = MIN_DATA_DAYS,
+) -> pd.DataFrame:
+    """Bootstrap confidence intervals of drawdown depth and recovery time.
+
+    Args:
+        panel: Price panel.
+        n_paths: Simulated paths per coin.
+        horizon: Days per path.
+        block_days: Block length of the bootstrap.
+        confidence: Two-sided interval level (e.g. 0.9 for 5%-95%).
+        seed: Seed for the SeedSequence; None draws fresh entropy.
+        workers: Worker processes; 1 simulates in-process.
+        min_observations: Coins with fewer daily returns are skipped.
+
+    Returns:
+        DataFrame with INTERVAL_COLUMNS, one row per simulated coin.
+        Drawdowns and drops are percentages (negative); recovery days are
+        NaN where that quantile lies beyond the horizon.
+    """
+    returns, lengths = coin_log_returns(panel)
+    keep = np.flatnonzero(lengths >= max(min_observations, 1))
+    if keep.size == 0:
+        return pd.DataFrame(columns=INTERVAL_COLUMNS)
+
+    prices = panel.price[keep]
+    latest = prices[np.arange(len(keep)),
+                    prices.shape[1] - 1 - (~np.isnan(prices))[:, ::-1].argmax(axis=1)]
+    gaps = np.log(np.nanmax(prices, axis=1) / latest)
+    seeds = np.random.SeedSequence(seed).spawn(len(panel.coins))
+    returns, lengths = returns[keep], lengths[keep]
+
+    batches = _batches(len(keep), n_paths, horizon)
+    jobs = [(returns[b], lengths[b], gaps[b], [seeds[i] for i in keep[b]],
+             n_paths, horizon, block_days, confidence) for b in batches]
+    logger.info("Simulating %d paths x %d days for %d coins in %d batches on %d workers",
+                n_paths, horizon, len(keep), len(batches), workers)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(simulate_batch, *zip(*jobs)))
+    else:
+        parts = [simulate_batch(*job) for job in jobs]
+    stats = np.vstack(parts)
+
+    recovery = np.where(np.isfinite(stats[:, 4:]), stats[:, 4:], np.nan)
+    return pd.DataFrame({
+        "coin_id": panel.coins[keep],
+        "observations": lengths,
+        "current_drop_pct": np.round(np.expm1(-gaps) * 100, 2),
+        "max_drawdown_lo": np.round(stats[:, 0] * 100, 2),
+        "max_drawdown_median": np.round(stats[:, 1] * 100, 2),
+        "max_drawdown_hi": np.round(stats[:, 2] * 100, 2),
+        "recovery_prob_pct": np.round(stats[:, 3] * 100, 1),
+        "recovery_days_lo": recovery[:, 0],
+        "recovery_days_median": recovery[:, 1],
+        "recovery_days_hi": recovery[:, 2],
+    })[INTERVAL_COLUMNS]
+
+
+def summary_intervals(
+    results_df: pd.DataFrame,
+    n_resamples: int = BOOTSTRAP_PATHS,
+    confidence: float = CONFIDENCE_LEVEL,
+    seed: int | None = 0,
+) -> dict[str, tuple[float, float]]:
+    """Bootstrap intervals for the average and median drop of generate_summary().
+
+    Coins are resampled with replacement; every resample is one row of an
+    index matrix, so all resamples are reduced in one call.
+
+    Args:
+        results_df: Ranked results from rank_by_drop().
+        n_resamples: Number of bootstrap resamples.
+        confidence: Two-sided interval level.
+        seed: Random seed.
+
+    Returns:
+        Dict mapping 'avg_drop_pct' and 'median_drop_pct' to (low, high)
+        bounds, or an empty dict when there are no results.
+    """
+    if results_df.empty:
+        return {}
+
+    drops = results_df["pct_change"].to_numpy(float)
+    rng = np.random.default_rng(seed)
+    samples = drops[rng.integers(0, len(drops), size=(n_resamples, len(drops)))]
+    tail = (1 - confidence) / 2
+    bounds = {
+        "avg_drop_pct": np.quantile(samples.mean(axis=1), [tail, 1 - tail]),
+        "median_drop_pct": np.quantile(np.median(samples, axis=1), [tail, 1 - tail]),
+    }
+    return {key: (round(float(lo), 2), round(float(hi), 2)) for key, (lo, hi) in bounds.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bootstrap drawdown and recovery intervals")
+    parser.add_argument("--source", choices=["csv", "sqlite"], default="csv",
+                        help="Price store to analyze")
+    parser.add_argument("--paths", type=int, default=BOOTSTRAP_PATHS,
+                        help="Simulated paths per coin")
+    parser.add_argument("--horizon", type=int, default=SIMULATION_HORIZON_DAYS,
+                        help="Days per simulated path")
+    parser.add_argument("--block", type=int, default=BOOTSTRAP_BLOCK_DAYS,
+                        help="Bootstrap block length in days")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    intervals = simulate_drawdowns(get_panel(args.source), args.paths, args.horizon,
+                                   args.block, seed=args.seed, workers=args.workers)
+    print(intervals.sort_values("current_drop_pct").to_string(index=False))
@@ -0,0 +1,478 @@
+"""Mergeable quantile sketches for universe-wide daily summary statistics.
+
+Percentiles of drops, volatility and volume across every coin on every day
+would otherwise need one sort per day and metric. Instead each day gets a
+compact relative-error sketch (DDSketch-style): a value v falls into the
+logarithmic bucket ceil(log_gamma(|v|)) with gamma = (1 + a) / (1 - a), so
+any quantile read back is within a relative error a of a true sample value.
+
+Sketches for all days of a metric share one bucket range and are stored as
+a (days, buckets) count matrix, so building them is a single bincount over
+the panel and merging two sketches is an element-wise add. When the store
+only gained new days, get_sketches() sketches just those days and merges
+them into the cached matrix. Quantiles come from a cumulative sum along the
+bucket axis and histograms from one matrix product.
+
+Run with: python -m src.sketch
+"""
+
+import argparse
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer import input_fingerprint
+from src.config import SKETCH_ACCURACY, SKETCHES_PATH, VOLATILITY_WINDOW
+from src.correlation import daily_returns
+from src.fingerprint import is_fresh, read_stamp, write_stamp
+from src.panel import Panel, get_panel
+
+logger = logging.getLogger(__name__)
+
+# Magnitudes below this are counted in the zero bucket
+MIN_INDEXABLE = 1e-12
+
+SKETCH_METRICS = ("drawdown_pct", "volatility_pct", "volume")
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def _gamma(alpha: float) -> float:
+    """Bucket growth factor for a relative accuracy."""
+    return (1 + alpha) / (1 - alpha)
+
+
+def _bucket_counts(keys: np.ndarray, mask: np.ndarray) -> tuple[int, np.ndarray]:
+    """Count masked bucket keys per row.
+
+    Returns:
+        (offset, counts): counts has shape (rows, buckets) and column j
+        holds key offset + j.
+    """
+    rows = np.nonzero(mask)[0]
+    if rows.size == 0:
+        return 0, np.zeros((mask.shape[0], 0), dtype=np.int64)
+    selected = keys[mask].astype(np.int64)
+    offset = int(selected.min())
+    width = int(selected.max()) - offset + 1
+    counts = np.bincount(rows * width + (selected - offset), minlength=mask.shape[0] * width)
+    return offset, counts.reshape(mask.shape[0], width)
+
+
+def _combine(
+    parts: list[tuple[int, np.ndarray, np.ndarray]],
+    n_rows: int,
+) -> tuple[int, np.ndarray]:
+    """Add (offset, counts, target rows) bucket matrices on a common key range."""
+    used = [(offset, counts, rows) for offset, counts, rows in parts if counts.shape[1]]
+    if not used:
+        return 0, np.zeros((n_rows, 0), dtype=np.int64)
+    start = min(offset for offset, _, _ in used)
+    stop = max(offset + counts.shape[1] for offset, counts, _ in used)
+    out = np.zeros((n_rows, stop - start), dtype=np.int64)
+    for offset, counts, rows in used:
+        out[rows, offset - start:offset - start + counts.shape[1]] += counts
+    return start, out
+
+
+@dataclass
+class QuantileSketch:
+    """Relative-error quantile sketches, one per label (usually a day).
+
+    Attributes:
+        labels: One label per sketch, sorted and unique.
+        alpha: Relative accuracy of the quantiles.
+        pos_offset: Bucket key of the first column of pos.
+        pos: Counts of positive values, shape (labels, buckets).
+        neg_offset: Bucket key of the first column of neg.
+        neg: Counts of negative values by magnitude, shape (labels, buckets).
+        zeros: Count of (near) zero values per label.
+        total: Sum of the values per label, for exact means.
+        low: Minimum value per label (NaN when empty).
+        high: Maximum value per label (NaN when empty).
+    """
+
+    labels: np.ndarray
+    alpha: float
+    pos_offset: int
+    pos: np.ndarray
+    neg_offset: int
+    neg: np.ndarray
+    zeros: np.ndarray
+    total: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+
+    @classmethod
+    def from_values(
+        cls,
+        values: np.ndarray,
+        labels: Iterable,
+        alpha: float = SKETCH_ACCURACY,
+    ) -> "QuantileSketch":
+        """Sketch each row of a value matrix.
+
+        Args:
+            values: Array of shape (labels, items); NaN and inf are ignored.
+            labels: One sorted, unique label per row.
+            alpha: Relative accuracy, between 0 and 1.
+
+        Returns:
+            QuantileSketch with one sketch per row.
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        finite = np.isfinite(values)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            keys = np.ceil(np.log(np.abs(values)) / np.log(_gamma(alpha)))
+        positive = finite & (values > MIN_INDEXABLE)
+        negative = finite & (values < -MIN_INDEXABLE)
+        pos_offset, pos = _bucket_counts(keys, positive)
+        neg_offset, neg = _bucket_counts(keys, negative)
+
+        low = np.where(finite, values, np.inf).min(axis=1, initial=np.inf)
+        high = np.where(finite, values, -np.inf).max(axis=1, initial=-np.inf)
+        empty = ~finite.any(axis=1)
+        low[empty] = high[empty] = np.nan
+        return cls(
+            labels=np.asarray(labels),
+            alpha=float(alpha),
+            pos_offset=pos_offset,
+            pos=pos,
+            neg_offset=neg_offset,
+            neg=neg,
+            zeros=(finite & ~positive & ~negative).sum(axis=1),
+            total=np.where(finite, values, 0.0).sum(axis=1),
+            low=low,
+            high=high,
+        )
+
+    @property
+    def count(self) -> np.ndarray:
+        """Number of values per label."""
+        return self.pos.sum(axis=1) + self.neg.sum(axis=1) + self.zeros
+
+    def mean(self) -> np.ndarray:
+        """Exact mean per label (NaN when empty)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 0, self.total / self.count, np.nan)
+
+    def _ordered(self) -> tuple[np.ndarray, np.ndarray]:
+        """Bucket counts and representative values in ascending value order."""
+        gamma = _gamma(self.alpha)
+        neg_keys = self.neg_offset + np.arange(self.neg.shape[1])
+        pos_keys = self.pos_offset + np.arange(self.pos.shape[1])
+        values = np.concatenate([
+            -(2 * gamma ** neg_keys / (gamma + 1))[::-1],
+            [0.0],
+            2 * gamma ** pos_keys / (gamma + 1),
+        ])
+        counts = np.hstack([self.neg[:, ::-1], self.zeros[:, None], self.pos])
+        return counts, values
+
+    def quantiles(self, qs: Iterable[float] = DEFAULT_QUANTILES) -> np.ndarray:
+        """Estimate quantiles for every label.
+
+        The q-quantile is the value at rank floor(q * (count - 1)) in sorted
+        order, within the relative accuracy and clipped to [low, high]; the
+        0 and 1 quantiles are the exact minimum and maximum.
+
+        Args:
+            qs: Quantiles between 0 and 1.
+
+        Returns:
+            Array of shape (labels, len(qs)); NaN for empty labels.
+        """
+        qs = np.asarray(list(qs), dtype=float)
+        counts, values = self._ordered()
+        cumulative = np.cumsum(counts, axis=1)
+        n = self.count
+        out = np.full((len(self.labels), len(qs)), np.nan)
+        for j, q in enumerate(qs):
+            rank = np.floor(q * (n - 1))
+            out[:, j] = values[(cumulative > rank[:, None]).argmax(axis=1)]
+        out = np.clip(out, self.low[:, None], self.high[:, None])
+        out[:, qs <= 0] = self.low[:, None]
+        out[:, qs >= 1] = self.high[:, None]
+        out[n == 0] = np.nan
+        return out
+
+    def histogram(self, edges: np.ndarray) -> np.ndarray:
+        """Count values per bin for every label.
+
+        Values are placed by their bucket's representative value; values
+        outside the edges are dropped and the last bin includes its right
+        edge, like numpy.histogram.
+
+        Args:
+            edges: Increasing bin edges.
+
+        Returns:
+            Array of shape (labels, len(edges) - 1).
+        """
+        edges = np.asarray(edges, dtype=float)
+        counts, values = self._ordered()
+        bins = np.searchsorted(edges, values, side="right") - 1
+        bins[values == edges[-1]] = len(edges) - 2
+        inside = (bins >= 0) & (bins < len(edges) - 1)
+        one_hot = np.zeros((int(inside.sum()), len(edges) - 1))
+        one_hot[np.arange(len(one_hot)), bins[inside]] = 1
+        return (counts[:, inside] @ one_hot).astype(np.int64)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Combine with another sketch, adding up sketches with equal labels.
+
+        Args:
+            other: Sketch with the same alpha (e.g. of newly fetched days).
+
+        Returns:
+            New QuantileSketch over the union of labels.
+
+        Raises:
+            ValueError: If the relative accuracies differ.
+        """
+        if self.alpha != other.alpha:
+            raise ValueError(f"Cannot merge sketches with alpha {self.alpha} and {other.alpha}")
+        labels = np.union1d(self.labels, other.labels)
+        rows = [np.searchsorted(labels, part.labels) for part in (self, other)]
+        n = len(labels)
+        pos_offset, pos = _combine([(self.pos_offset, self.pos, rows[0]),
+                                    (other.pos_offset, other.pos, rows[1])], n)
+        neg_offset, neg = _combine([(self.neg_offset, self.neg, rows[0]),
+                                    (other.neg_offset, other.neg, rows[1])], n)
+
+        zeros, total = np.zeros(n, dtype=np.int64), np.zeros(n)
+        low, high = np.full(n, np.nan), np.full(n, np.nan)
+        for part, part_rows in zip((self, other), rows):
+            zeros[part_rows] += part.zeros
+            total[part_rows] += part.total
+            low[part_rows] = np.fmin(low[part_rows], part.low)
+            high[part_rows] = np.fmax(high[part_rows], part.high)
+        return QuantileSketch(labels, self.alpha, pos_offset, pos, neg_offset, neg,
+                              zeros, total, low, high)
+
+    def collapse(self, label: str = "all") -> "QuantileSketch":
+        """Merge all labels into one sketch (e.g. the whole date range)."""
+        return QuantileSketch(
+            labels=np.array([label]),
+            alpha=self.alpha,
+            pos_offset=self.pos_offset,
+            pos=self.pos.sum(axis=0, keepdims=True),
+            neg_offset=self.neg_offset,
+            neg=self.neg.sum(axis=0, keepdims=True),
+            zeros=self.zeros.sum(keepdims=True),
+            total=self.total.sum(keepdims=True),
+            low=np.array([np.nanmin(self.low, initial=np.inf)]),
+            high=np.array([np.nanmax(self.high, initial=-np.inf)]),
+        )
+
+    def to_frame(self, qs: Iterable[float] = DEFAULT_QUANTILES) -> pd.DataFrame:
+        """Tabulate count, mean and quantiles per label.
+
+        Returns:
+            DataFrame with label, count, mean and one p<NN> column per quantile.
+        """
+        qs = list(qs)
+        frame = pd.DataFrame({"label": self.labels, "count": self.count, "mean": self.mean()})
+        quantiles = self.quantiles(qs)
+        for j, q in enumerate(qs):
+            frame[f"p{round(q * 100):02d}"] = quantiles[:, j]
+        return frame
+
+
+def rolling_volatility(returns: np.ndarray, window: int = VOLATILITY_WINDOW) -> np.ndarray:
+    """Rolling standard deviation of daily returns along the day axis.
+
+    Uses windowed cumulative sums, so the cost does not grow with the
+    window. A value needs at least half the window's returns observed.
+
+    Args:
+        returns: Array of shape (coins, days) with NaN for missing returns.
+        window: Window length in days.
+
+    Returns:
+        Array of the same shape; NaN where too few returns are observed.
+    """
+    observed = ~np.isnan(returns)
+    filled = np.where(observed, returns, 0.0)
+
+    def windowed(values: np.ndarray) -> np.ndarray:
+        sums = np.cumsum(values, axis=1)
+        sums[:, window:] -= sums[:, :-window].copy()
+        return sums
+
+    n = windowed(observed.astype(float))
+    total, squares = windowed(filled), windowed(filled ** 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (squares - total ** 2 / n) / (n - 1)
+    enough = n >= max(window // 2, 2)
+    return np.where(enough, np.sqrt(np.clip(variance, 0, None)), np.nan)
+
+
+def compute_sketches(
+    panel: Panel,
+    alpha: float = SKETCH_ACCURACY,
+    start: int = 0,
+) -> dict[str, QuantileSketch]:
+    """Sketch every metric in SKETCH_METRICS across coins, per day.
+
+    Metrics: drawdown_pct (percent below the running peak on days with a
+    price), volatility_pct (rolling VOLATILITY_WINDOW-day standard deviation
+    of daily returns, in percent) and volume, which is skipped when the
+    panel has no volume field.
+
+    Args:
+        panel: Price panel.
+        alpha: Relative accuracy.
+        start: First day column to sketch. Earlier days only feed the
+            running peak and the volatility window.
+
+    Returns:
+        Dict mapping metric name to a QuantileSketch labelled by day.
+    """
+    context = max(start - VOLATILITY_WINDOW, 0)
+    price = panel.price[:, context:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        prior_peak = (np.fmax.reduce(panel.price[:, :context], axis=1) if context
+                      else np.full(len(price), np.nan))
+        running_peak = np.fmax.accumulate(np.column_stack([prior_peak, price]), axis=1)
+        drawdown = (price / running_peak[:, 1:] - 1) * 100
+
+    volatility = np.full(price.shape, np.nan)
+    volatility[:, 1:] = rolling_volatility(daily_returns(price)) * 100
+    metrics = {"drawdown_pct": drawdown, "volatility_pct": volatility}
+    if "volume" in panel.fields:
+        metrics["volume"] = np.where(np.isnan(price), np.nan,
+                                     panel.fields["volume"][:, context:])
+    skip = start - context
+    logger.info("Sketching %d metrics for %d coins over %d days",
+                len(metrics), price.shape[0], price.shape[1] - skip)
+    return {name: QuantileSketch.from_values(values[:, skip:].T, panel.dates[start:], alpha)
+            for name, values in metrics.items()}
+
+
+def _input_digest(panel: Panel, days: int) -> str:
+    """Digest of the sketch inputs on the first days of a panel.
+
+    Covers the first date, and the ids, prices and volumes of the coins
+    observed in that range, so it only changes when a sketch of those days
+    would.
+    """
+    price = panel.price[:, :days]
+    observed = (~np.isnan(price)).any(axis=1)
+    order = np.argsort(panel.coins[observed])
+    digest = hashlib.sha256(panel.dates[:1].tobytes())
+    digest.update("\0".join(panel.coins[observed][order]).encode())
+    for name in ("price", "volume"):
+        if name in panel.fields:
+            values = panel.fields[name][:, :days][observed][order]
+            digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def save_sketches(sketches: dict[str, QuantileSketch], path: Path | str | None = None) -> Path:
+    """Write sketches to a compressed .npz file.
+
+    Args:
+        sketches: Metric name -> sketch.
+        path: Target file (defaults to SKETCHES_PATH).
+
+    Returns:
+        Path to the written file.
+    """
+    path = Path(path) if path else SKETCHES_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {
+        f"{name}/{field}": np.asarray(value)
+        for name, sketch in sketches.items()
+        for field, value in vars(sketch).items()
+    }
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    return path
+
+
+def load_sketches(path: Path | str | None = None) -> dict[str, QuantileSketch]:
+    """Load sketches written by save_sketches().
+
+    Args:
+        path: Sketch file (defaults to SKETCHES_PATH).
+
+    Returns:
+        Metric name -> sketch.
+    """
+    path = Path(path) if path else SKETCHES_PATH
+    fields: dict[str, dict] = {}
+    with np.load(path) as data:
+        for key in data.files:
+            name, field = key.split("/")
+            fields.setdefault(name, {})[field] = data[key]
+    sketches = {}
+    for name, values in fields.items():
+        for scalar, kind in (("alpha", float), ("pos_offset", int), ("neg_offset", int)):
+            values[scalar] = kind(values[scalar])
+        sketches[name] = QuantileSketch(**values)
+    return sketches
+
+
+def get_sketches(source: str = "csv", path: Path | str | None = None) -> dict[str, QuantileSketch]:
+    """Return the daily sketches, recomputing them only when the inputs changed.
+
+    When the cached days are unchanged (same input digest) and the panel
+    only gained newer days, just those days are sketched and merged into
+    the cached sketches; any other change triggers a full rebuild.
+
+    Args:
+        source: Data source, either 'csv' or 'sqlite'.
+        path: Sketch cache file (defaults to SKETCHES_PATH).
+
+    Returns:
+        Metric name -> up-to-date QuantileSketch.
+    """
+    path = Path(path) if path else SKETCHES_PATH
+    fingerprint = input_fingerprint(source)
+    if is_fresh(path, fingerprint):
+        return load_sketches(path)
+
+    panel = get_panel(source)
+    sketches = None
+    stamp = read_stamp(path)
+    days = stamp.get("days", 0)
+    if (path.exists() and 0 < days <= len(panel.dates)
+            and stamp.get("digest") == _input_digest(panel, days)):
+        cached = load_sketches(path)
+        new = compute_sketches(panel, start=days)
+        if set(cached) == set(new) and all(c.alpha == SKETCH_ACCURACY for c in cached.values()):
+            sketches = {name: cached[name].merge(new[name]) for name in new}
+            logger.info("Appended %d new days to the cached sketches", len(panel.dates) - days)
+
+    if sketches is None:
+        sketches = compute_sketches(panel)
+    save_sketches(sketches, path)
+    write_stamp(path, fingerprint, days=len(panel.dates),
+                digest=_input_digest(panel, len(panel.dates)))
+    return sketches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Daily percentiles across all coins")
+    parser.add_argument("--source", choices=["csv", "sqlite"], default="csv",
+                        help="Price store to analyze")
+    parser.add_argument("--metric", choices=SKETCH_METRICS, default="drawdown_pct",
+                        help="Metric to summarize")
+    parser.add_argument("--days", type=int, default=10,
+                        help="Number of most recent days to print")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sketches = get_sketches(args.source)
+    if args.metric not in sketches:
+        parser.error(f"no {args.metric} data in the price store")
+    sketch = sketches[args.metric]
+    print(f"\n{args.metric} across coins, last {args.days} days:")
+    print(sketch.to_frame().tail(args.days).round(2).to_string(index=False))
+    print("\nWhole period:")
+    print(sketch.collapse().to_frame().round(2).to_string(index=False))
@@ -0,0 +1,228 @@
+"""Shared, read-only price and results store for the dashboard pages.
+
+Every page used to read the whole price CSV into its own st.cache_data
+entry, and st.cache_data hands each call a fresh copy. PriceStore holds one
+copy of the prices (sorted by coin and date, with each coin's row range
+indexed) and the ranked results for the whole server process via
+st.cache_resource. Pages get shallow views: pandas 3 is always
+copy-on-write, so adding columns to or editing a view never touches the
+shared data, and no rows are copied until that happens. On pandas 2 views
+would share buffers with the store, so there each caller gets a deep copy.
+
+The full price table is only read when a page needs it. A single coin's
+history is fetched through the SQLite (coin_id, date) index when the
+database exists, with the most recently viewed coins kept in an LRU. The
+ranking of every coin is the analyzer's RANKING_PATH artifact, so the web
+process never re-ranks the raw prices.
+
+shared_store() is keyed on data_version() of those files rather than a TTL,
+so a fetch or analysis run is picked up on the next render and an unchanged
+store is never reloaded.
+"""
+
+import logging
+import sqlite3
+import threading
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.analyzer import load_full_ranking
+from src.config import COIN_CACHE_SIZE, DATABASE_PATH, PRICES_CSV, RANKING_PATH, RESULTS_CSV
+from src.fingerprint import data_version
+from src.table import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+# Before pandas 3 a shallow copy shares buffers with the store, so an in-place
+# edit on one page would change every session's data
+DEEP_COPIES = int(pd.__version__.split(".")[0]) < 3
+
+COIN_HISTORY_SQL = "SELECT * FROM prices WHERE coin_id = ? ORDER BY date"
+
+
+def _view(frame: pd.DataFrame) -> pd.DataFrame:
+    """Copy of shared data that the caller may edit freely."""
+    return frame.copy(deep=DEEP_COPIES)
+
+
+class PriceStore:
+    """Read-only prices and results with a per-coin row index.
+
+    Args:
+        prices: Price DataFrame (any order), or a function that loads it
+            on first use.
+        results: Ranked results as written by the analyzer.
+        db_path: SQLite database for per-coin lookups; when it does not
+            exist, coin_history() slices the in-memory prices instead.
+        ranking: Untruncated ranking of every coin (empty if omitted).
+    """
+
+    def __init__(
+        self,
+        prices: pd.DataFrame | Callable[[], pd.DataFrame],
+        results: pd.DataFrame,
+        db_path: Path | str | None = None,
+        ranking: pd.DataFrame | None = None,
+    ) -> None:
+        self._load_prices = prices if callable(prices) else lambda: prices
+        self._results = results
+        self._ranking = pd.DataFrame() if ranking is None else ranking
+        self._db_path = Path(db_path) if db_path else None
+        self._query_coin = lru_cache(maxsize=COIN_CACHE_SIZE)(self._query_coin_uncached)
+        self._index: tuple[pd.DataFrame, dict[str, tuple[int, int]]] | None = None
+        self._index_lock = threading.Lock()
+
+    @property
+    def _indexed(self) -> tuple[pd.DataFrame, dict[str, tuple[int, int]]]:
+        """Prices sorted by coin and date, and each coin's row range.
+
+        Loaded on first use; concurrent first requests wait for one load.
+        """
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = self._build_index()
+        return self._index
+
+    def _build_index(self) -> tuple[pd.DataFrame, dict[str, tuple[int, int]]]:
+        """Load the prices and index each coin's row range."""
+        prices = self._load_prices()
+        if prices.empty:
+            return prices, {}
+        prices = prices.sort_values(["coin_id", "date"], kind="stable", ignore_index=True)
+        codes, coins = pd.factorize(prices["coin_id"])
+        bounds = np.flatnonzero(np.diff(codes, prepend=-1, append=-1))
+        rows = {coin: (int(start), int(stop))
+                for coin, start, stop in zip(coins, bounds[:-1], bounds[1:])}
+        return prices, rows
+
+    @property
+    def prices(self) -> pd.DataFrame:
+        """All prices, sorted by coin_id and date."""
+        return _view(self._indexed[0])
+
+    @property
+    def results(self) -> pd.DataFrame:
+        """Ranked results (biggest drops first)."""
+        return _view(self._results)
+
+    @property
+    def coins(self) -> list[str]:
+        """Coin identifiers with price data, sorted."""
+        return list(self._indexed[1])
+
+    @property
+    def uses_index(self) -> bool:
+        """Whether coin_history() reads from the SQLite index."""
+        return self._db_path is not None and self._db_path.exists()
+
+    def coin_prices(self, coin_id: str) -> pd.DataFrame:
+        """Return one coin's price history from the in-memory table.
+
+        Args:
+            coin_id: Coin identifier.
+
+        Returns:
+            View of the coin's rows sorted by date; empty if unknown.
+        """
+        prices, rows = self._indexed
+        start, stop = rows.get(coin_id, (0, 0))
+        return _view(prices.iloc[start:stop])
+
+    def _query_coin_uncached(self, coin_id: str) -> pd.DataFrame:
+        """Read one coin's rows through the (coin_id, date) index."""
+        conn = sqlite3.connect(str(self._db_path))
+        try:
+            return pd.read_sql(COIN_HISTORY_SQL, conn, params=(coin_id,), parse_dates=["date"])
+        finally:
+            conn.close()
+
+    def coin_history(self, coin_id: str) -> pd.DataFrame:
+        """Return one coin's price history without loading every coin.
+
+        Uses the SQLite index when the database exists, keeping the last
+        COIN_CACHE_SIZE coins in an LRU; otherwise slices the in-memory
+        prices.
+
+        Args:
+            coin_id: Coin identifier.
+
+        Returns:
+            The coin's rows sorted by date; empty if unknown.
+        """
+        if not self.uses_index:
+            return self.coin_prices(coin_id)
+        return _view(self._query_coin(coin_id))
+
+    @property
+    def all_drops(self) -> pd.DataFrame:
+        """Every coin ranked by drop from its 2025 peak (no top-N limit)."""
+        return _view(self._ranking)
+
+    @cached_property
+    def results_search(self) -> SearchIndex:
+        """Name/symbol search index over results, built on first use."""
+        return SearchIndex(self._results)
+
+    @cached_property
+    def all_drops_search(self) -> SearchIndex:
+        """Name/symbol search index over all_drops, built on first use."""
+        return SearchIndex(self._ranking)
+
+
+def load_store(
+    prices_path: Path | str | None = None,
+    results_path: Path | str | None = None,
+    db_path: Path | str | None = None,
+    ranking_path: Path | str | None = None,
+) -> PriceStore:
+    """Create a PriceStore over the analyzer's outputs and the price stores.
+
+    Results and the full ranking are read now; the price CSV only when a
+    page first needs every coin's prices. Missing files give empty frames.
+
+    Args:
+        prices_path: Price CSV (defaults to PRICES_CSV).
+        results_path: Results CSV (defaults to RESULTS_CSV).
+        db_path: SQLite database (defaults to DATABASE_PATH).
+        ranking_path: Full ranking (defaults to RANKING_PATH).
+
+    Returns:
+        PriceStore over the files' contents.
+    """
+    prices_path = Path(prices_path) if prices_path else PRICES_CSV
+    results_path = Path(results_path) if results_path else RESULTS_CSV
+    db_path = Path(db_path) if db_path else DATABASE_PATH
+    ranking_path = Path(ranking_path) if ranking_path else RANKING_PATH
+
+    def read_prices() -> pd.DataFrame:
+        if not prices_path.exists():
+            return pd.DataFrame()
+        prices = pd.read_csv(prices_path, parse_dates=["date"])
+        logger.info("Loaded %d price rows into the shared store", len(prices))
+        return prices
+
+    results = pd.read_csv(results_path) if results_path.exists() else pd.DataFrame()
+    return PriceStore(read_prices, results, db_path, load_full_ranking(ranking_path))
+
+
+def store_version() -> str:
+    """Return the data version of every file the shared store reads."""
+    return data_version(RESULTS_CSV, RANKING_PATH, PRICES_CSV, DATABASE_PATH)
+
+
+@st.cache_resource(max_entries=1)
+def _load_shared_store(version: str) -> PriceStore:
+    """Load the store for one data version, replacing the previous one."""
+    logger.info("Loading shared store for data version %s", version[:12])
+    return load_store()
+
+
+def shared_store() -> PriceStore:
+    """Return the process-wide PriceStore for the current data files."""
+    return _load_shared_store(store_version())
@@ -0,0 +1,188 @@
+"""Out-of-core analysis: rank coins while reading the price store in chunks.
+
+load_data() reads the whole store into memory. For stores larger than RAM
+this module reads fixed-size chunks from the CSV or SQLite store and folds
+each chunk into per-coin accumulators (peak price/date, latest price/date,
+row count), so memory is bounded by the chunk size plus one row per coin.
+The folded summary feeds the same rank_summary() as the in-memory path.
+"""
+
+import logging
+import sqlite3
+from typing import Iterator
+
+import pandas as pd
+
+from src.analyzer import SUMMARY_COLUMNS, as_of_bound, format_dates, rank_summary
+from src.config import DATABASE_PATH, PRICES_CSV, STREAM_CHUNKSIZE, TOP_N_RANKING
+
+logger = logging.getLogger(__name__)
+
+PEAK_FIELDS = ["coin_id", "peak_price", "peak_date", "coin_name", "symbol"]
+LATEST_FIELDS = ["coin_id", "current_price", "current_date", "market_cap", "volume"]
+
+
+def iter_chunks(
+    source: str = "csv",
+    chunksize: int = STREAM_CHUNKSIZE,
+    coin_ids: list[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield the price store in chunks of at most ``chunksize`` rows.
+
+    Args:
+        source: Data source, either 'csv' or 'sqlite'.
+        chunksize: Rows per chunk.
+        coin_ids: Only yield rows for these coins.
+
+    Yields:
+        DataFrames with the store's columns and parsed dates.
+
+    Raises:
+        FileNotFoundError: If the data source does not exist.
+    """
+    if source == "sqlite" and DATABASE_PATH.exists():
+        query = "SELECT * FROM prices"
+        params: list[str] = []
+        if coin_ids is not None:
+            query += f" WHERE coin_id IN ({', '.join('?' for _ in coin_ids)})"
+            params = list(coin_ids)
+        conn = sqlite3.connect(str(DATABASE_PATH))
+        try:
+            yield from pd.read_sql(query, conn, params=params, parse_dates=["date"],
+                                   chunksize=chunksize)
+        finally:
+            conn.close()
+    elif PRICES_CSV.exists():
+        with pd.read_csv(PRICES_CSV, parse_dates=["date"], chunksize=chunksize) as reader:
+            for chunk in reader:
+                if coin_ids is not None:
+                    chunk = chunk[chunk["coin_id"].isin(coin_ids)]
+                yield chunk
+    else:
+        raise FileNotFoundError(
+            f"No data found. Run the data fetcher first. "
+            f"Checked: {PRICES_CSV}, {DATABASE_PATH}"
+        )
+
+
+def _chunk_accumulators(chunk: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.Series]:
+    """Reduce one chunk to per-coin peak rows, latest rows and row counts."""
+    chunk = chunk.assign(
+        coin_name=chunk["coin_name"] if "coin_name" in chunk else chunk["coin_id"],
+        symbol=chunk["symbol"] if "symbol" in chunk else "",
+        market_cap=chunk["market_cap"] if "market_cap" in chunk else 0.0,
+        volume=chunk["volume"] if "volume" in chunk else 0.0,
+    )
+    peaks = (
+        chunk.sort_values(["price", "date"], ascending=[False, True], kind="stable")
+        .drop_duplicates("coin_id")
+        .rename(columns={"price": "peak_price", "date": "peak_date"})[PEAK_FIELDS]
+    )
+    latest = (
+        chunk.sort_values("date", ascending=False, kind="stable")
+        .drop_duplicates("coin_id")
+        .rename(columns={"price": "current_price", "date": "current_date"})[LATEST_FIELDS]
+    )
+    return peaks, latest, chunk.groupby("coin_id", sort=False).size()
+
+
+def _fold(acc: pd.DataFrame | None, update: pd.DataFrame,
+          by: list[str], ascending: list[bool]) -> pd.DataFrame:
+    """Keep the best row per coin across the accumulator and a chunk."""
+    if acc is None:
+        return update
+    combined = pd.concat([acc, update], ignore_index=True)
+    return (combined.sort_values(by, ascending=ascending, kind="stable")
+            .drop_duplicates("coin_id"))
+
+
+def stream_summary(
+    source: str = "csv",
+    chunksize: int = STREAM_CHUNKSIZE,
+    as_of: str | pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Build the per-coin summary by folding chunks of the price store.
+
+    Produces the same result as summarize_coins(load_data(source), as_of)
+    (up to row order) while holding one chunk at a time.
+
+    Args:
+        source: Data source, either 'csv' or 'sqlite'.
+        chunksize: Rows per chunk.
+        as_of: Only consider prices dated on or before this day.
+
+    Returns:
+        DataFrame with SUMMARY_COLUMNS, one row per coin.
+    """
+    peaks = latest = None
+    counts = pd.Series(dtype="int64")
+    rows = 0
+    bound = None if as_of is None else as_of_bound(as_of)
+
+    for chunk in iter_chunks(source, chunksize):
+        if bound is not None:
+            chunk = chunk[chunk["date"] < bound]
+        if chunk.empty:
+            continue
+        rows += len(chunk)
+        chunk_peaks, chunk_latest, chunk_counts = _chunk_accumulators(chunk)
+        peaks = _fold(peaks, chunk_peaks, ["peak_price", "peak_date"], [False, True])
+        # Later chunks win ties on date, matching the in-memory sort order
+        latest = (chunk_latest if latest is None
+                  else _fold(chunk_latest, latest, ["current_date"], [False]))
+        counts = counts.add(chunk_counts, fill_value=0)
+
+    if peaks is None:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    summary = peaks.merge(latest, on="coin_id")
+    summary["peak_date"] = format_dates(summary["peak_date"])
+    summary["current_date"] = format_dates(summary["current_date"])
+    summary["data_points"] = counts.loc[summary["coin_id"]].astype(int).to_numpy()
+    summary["coin_name"] = summary["coin_name"].fillna(summary["coin_id"])
+    summary["symbol"] = summary["symbol"].fillna("")
+    summary[["market_cap", "volume"]] = summary[["market_cap", "volume"]].fillna(0).astype(float)
+    logger.info("Streamed %d rows for %d coins", rows, len(summary))
+    return summary.sort_values("coin_id").reset_index(drop=True)[SUMMARY_COLUMNS]
+
+
+def stream_rank(
+    source: str = "csv",
+    top_n: int | None = TOP_N_RANKING,
+    chunksize: int = STREAM_CHUNKSIZE,
+    as_of: str | pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Rank coins by drop from peak with bounded memory.
+
+    Args:
+        source: Data source, either 'csv' or 'sqlite'.
+        top_n: Number of top losers to return; None keeps every coin.
+        chunksize: Rows per chunk.
+        as_of: Rank as the data stood at the end of this day.
+
+    Returns:
+        Same layout as analyzer.rank_by_drop().
+    """
+    return rank_summary(stream_summary(source, chunksize, as_of), top_n)
+
+
+def stream_history(
+    coin_ids: list[str],
+    source: str = "csv",
+    chunksize: int = STREAM_CHUNKSIZE,
+) -> pd.DataFrame:
+    """Collect the full history of a few coins in one streaming pass.
+
+    Args:
+        coin_ids: Coins to keep (e.g. the ranked top N).
+        source: Data source, either 'csv' or 'sqlite'.
+        chunksize: Rows per chunk.
+
+    Returns:
+        DataFrame with coin_id, date and price for the selected coins.
+    """
+    parts = [chunk[["coin_id", "date", "price"]]
+             for chunk in iter_chunks(source, chunksize, coin_ids)]
+    if not parts:
+        return pd.DataFrame(columns=["coin_id", "date", "price"])
+    return pd.concat(parts, ignore_index=True)
@@ -0,0 +1,159 @@
+"""Search, filtering, pagination and styling for the ranking tables.
+
+The Top 50 and All Coins pages used to copy the whole results frame on
+every rerun, run a case-insensitive str.contains over every name and
+symbol, and style every row cell by cell. Here the searchable text is
+lowercased once into a SearchIndex, filters produce row positions without
+copying the frame, and only the visible page is sliced and styled, with
+colours picked for a whole column at once.
+"""
+
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.io.formats.style import Styler
+
+from src.config import TABLE_PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Separators that cannot appear in a search query, so no match spans rows
+_FIELD_SEP = "\x1f"
+_ROW_SEP = "\x1e"
+
+# Drop severity thresholds (pct_change <= threshold) and their CSS
+DROP_STYLES = [
+    (-80, "color: #ff4444; font-weight: bold"),
+    (-60, "color: #ff8800"),
+]
+DEFAULT_DROP_STYLE = "color: #ffcc00"
+
+SEARCH_COLUMNS = ["coin_name", "symbol"]
+
+TABLE_FORMATS = {
+    "peak_price": "${:.4f}",
+    "current_price": "${:.4f}",
+    "pct_change": "{:+.2f}%",
+    "market_cap": "${:,.0f}",
+    "volume": "${:,.0f}",
+}
+
+
+class SearchIndex:
+    """Lowercased name/symbol text of every row, searchable as one string.
+
+    Args:
+        frame: Table to index.
+        columns: Text columns to search (missing ones are skipped).
+    """
+
+    def __init__(self, frame: pd.DataFrame, columns: list[str] | None = None) -> None:
+        columns = [c for c in (columns or SEARCH_COLUMNS) if c in frame.columns]
+        self.size = len(frame)
+        texts = [frame[c].fillna("").astype(str).str.lower().tolist() for c in columns]
+        rows = [_FIELD_SEP.join(values) for values in zip(*texts)] if texts else [""] * self.size
+        lengths = np.array([len(row) + 1 for row in rows], dtype=np.int64)
+        self._starts = np.cumsum(lengths) - lengths
+        self._blob = _ROW_SEP.join(rows)
+
+    def match(self, query: str) -> np.ndarray:
+        """Return a mask of rows whose text contains query (case-insensitive).
+
+        Args:
+            query: Search text; empty matches every row.
+
+        Returns:
+            Boolean array with one entry per row.
+        """
+        query = query.strip().lower()
+        if not query:
+            return np.ones(self.size, dtype=bool)
+        mask = np.zeros(self.size, dtype=bool)
+        if _FIELD_SEP in query or _ROW_SEP in query:
+            return mask
+        hits = np.fromiter((m.start() for m in re.finditer(re.escape(query), self._blob)),
+                           dtype=np.int64)
+        mask[np.searchsorted(self._starts, hits, side="right") - 1] = True
+        return mask
+
+
+def filter_positions(
+    frame: pd.DataFrame,
+    index: SearchIndex,
+    search: str = "",
+    min_market_cap: float = 0,
+    drop_range: tuple[float, float] | None = None,
+) -> np.ndarray:
+    """Return the positions of rows passing the table filters, in order.
+
+    Args:
+        frame: Ranked table the index was built from.
+        index: SearchIndex over frame.
+        search: Name or symbol substring.
+        min_market_cap: Minimum market_cap (0 disables the filter).
+        drop_range: Inclusive (low, high) bounds on pct_change.
+
+    Returns:
+        Integer positions into frame.
+    """
+    mask = index.match(search)
+    if min_market_cap > 0 and "market_cap" in frame.columns:
+        mask &= frame["market_cap"].to_numpy(dtype=float, na_value=np.nan) >= min_market_cap
+    if drop_range is not None:
+        pct = frame["pct_change"].to_numpy(dtype=float, na_value=np.nan)
+        mask &= (pct >= drop_range[0]) & (pct <= drop_range[1])
+    return np.flatnonzero(mask)
+
+
+def page_count(rows: int, page_size: int = TABLE_PAGE_SIZE) -> int:
+    """Number of pages needed for rows (at least one)."""
+    return max(-(-rows // page_size), 1)
+
+
+def page_slice(
+    frame: pd.DataFrame,
+    positions: np.ndarray,
+    page: int,
+    page_size: int = TABLE_PAGE_SIZE,
+) -> pd.DataFrame:
+    """Take one page of the filtered rows.
+
+    Args:
+        frame: Full table.
+        positions: Filtered row positions from filter_positions().
+        page: 1-based page number (clamped to the valid range).
+        page_size: Rows per page.
+
+    Returns:
+        The page's rows; only these are copied out of frame.
+    """
+    page = min(max(page, 1), page_count(len(positions), page_size))
+    start = (page - 1) * page_size
+    return frame.iloc[positions[start:start + page_size]]
+
+
+def drop_styles(pct_change: pd.Series) -> np.ndarray:
+    """CSS for a column of drops, picked for all cells at once."""
+    values = pct_change.to_numpy(dtype=float, na_value=np.nan)
+    conditions = [values <= threshold for threshold, _ in DROP_STYLES]
+    return np.select(conditions, [css for _, css in DROP_STYLES], DEFAULT_DROP_STYLE)
+
+
+def style_table(frame: pd.DataFrame, formats: dict[str, str] | None = None) -> Styler:
+    """Format and colour a (page-sized) table for st.dataframe.
+
+    Args:
+        frame: Rows to show.
+        formats: Format string per column (defaults to TABLE_FORMATS);
+            columns not in frame are ignored.
+
+    Returns:
+        Styler with the drop column coloured by severity.
+    """
+    formats = TABLE_FORMATS if formats is None else formats
+    styler = frame.style.format({c: f for c, f in formats.items() if c in frame.columns})
+    if "pct_change" in frame.columns:
+        styler = styler.apply(drop_styles, subset=["pct_change"])
+    return styler
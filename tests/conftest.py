@@ -165,3 +165,19 @@ def single_record_df() -> pd.DataFrame:
         "high": 102.0,
         "low": 98.0,
     }])
+
+
+@pytest.fixture
+def isolated_outputs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point every file analyzer.run() writes into tmp_path."""
+    outputs = {
+        "DATA_DIR": tmp_path,
+        "RESULTS_CSV": tmp_path / "results.csv",
+        "RESULTS_JSON": tmp_path / "results.json",
+        "RANKING_PATH": tmp_path / "ranking.pkl",
+        "RANKING_EXPORT_CSV": tmp_path / "ranking.csv.gz",
+        "RANKING_EXPORT_JSON": tmp_path / "ranking.json.gz",
+    }
+    for name, path in outputs.items():
+        monkeypatch.setattr(f"src.analyzer.{name}", path)
+    return tmp_path
@@ -3,6 +3,7 @@
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -14,7 +15,11 @@ from src.analyzer import (
     get_coin_stats,
     get_current_price,
     load_data,
+    query_coin_summary,
+    rank_as_of,
     rank_by_drop,
+    rank_summary,
+    summarize_coins,
 )
 
 
@@ -165,6 +170,118 @@ class TestRankByDrop:
         results = rank_by_drop(empty_prices_df)
         assert results.empty
 
+    def test_drawdown_columns(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that drawdown statistics can be appended to the ranking."""
+        results = rank_by_drop(sample_prices_df, drawdowns=True)
+        for col in ["max_drawdown_pct", "longest_underwater_days", "days_since_peak",
+                    "recovery_days", "drawdown_episodes"]:
+            assert col in results.columns
+        assert results.index.name == "rank"
+        # Sample coins peak once and never recover
+        assert (results["max_drawdown_pct"] <= results["pct_change"]).all()
+        assert (results["days_since_peak"] == 39).all()
+
+    def test_drawdown_columns_as_of(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that drawdown statistics honour as_of."""
+        results = rank_by_drop(sample_prices_df, as_of="2025-02-10", drawdowns=True)
+        assert (results["days_since_peak"] == 20).all()
+
+
+class TestSummarizeCoins:
+    """Tests for summarize_coins and query_coin_summary."""
+
+    def test_one_row_per_coin(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that the summary has one row per coin."""
+        summary = summarize_coins(sample_prices_df)
+        assert len(summary) == sample_prices_df["coin_id"].nunique()
+        row = summary.set_index("coin_id").loc["coin-a"]
+        assert row["peak_price"] == 250.0
+        assert row["current_price"] == pytest.approx(84.25, abs=0.01)
+        assert row["data_points"] == 60
+
+    def test_empty_input(self, empty_prices_df: pd.DataFrame) -> None:
+        """Test summary of an empty frame."""
+        assert summarize_coins(empty_prices_df).empty
+
+    def test_sqlite_matches_pandas(
+        self, sample_prices_df: pd.DataFrame, sample_sqlite_db: Path
+    ) -> None:
+        """Test that the SQL pushdown matches the in-memory aggregation."""
+        expected = summarize_coins(sample_prices_df).sort_values("coin_id")
+        actual = query_coin_summary(sample_sqlite_db)
+        pd.testing.assert_frame_equal(
+            actual.reset_index(drop=True),
+            expected.reset_index(drop=True),
+            check_dtype=False,
+        )
+
+    def test_sqlite_ranking_matches(
+        self, sample_prices_df: pd.DataFrame, sample_sqlite_db: Path
+    ) -> None:
+        """Test that ranking the SQL summary matches rank_by_drop."""
+        expected = rank_by_drop(sample_prices_df)
+        actual = rank_summary(query_coin_summary(sample_sqlite_db))
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_missing_database(self, tmp_path: Path) -> None:
+        """Test FileNotFoundError for a missing database."""
+        with pytest.raises(FileNotFoundError):
+            query_coin_summary(tmp_path / "missing.db")
+
+
+class TestRankAsOf:
+    """Tests for point-in-time ranking."""
+
+    @pytest.mark.parametrize("as_of", ["2025-01-15", "2025-02-01", "2025-02-20"])
+    def test_matches_truncated_data(
+        self, sample_prices_df: pd.DataFrame, as_of: str
+    ) -> None:
+        """Test that as_of equals ranking a manually truncated frame."""
+        truncated = sample_prices_df[sample_prices_df["date"] <= as_of]
+        pd.testing.assert_frame_equal(
+            rank_by_drop(sample_prices_df, as_of=as_of), rank_by_drop(truncated)
+        )
+
+    def test_summary_as_of(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test the as-of peak, latest price and row count for one coin."""
+        summary = summarize_coins(sample_prices_df, as_of="2025-02-09")
+        row = summary.set_index("coin_id").loc["coin-a"]
+        assert row["peak_date"] == "2025-01-21"
+        assert row["current_date"] == "2025-02-09"
+        assert row["data_points"] == 40
+
+    def test_unsorted_input(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that row order does not affect the answer."""
+        shuffled = sample_prices_df.sample(frac=1, random_state=7)
+        pd.testing.assert_frame_equal(
+            rank_by_drop(shuffled, as_of="2025-02-20").sort_values("coin_id"),
+            rank_by_drop(sample_prices_df, as_of="2025-02-20").sort_values("coin_id"),
+        )
+
+    def test_before_any_data(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that dates before the history give an empty ranking."""
+        assert summarize_coins(sample_prices_df, as_of="2024-12-31").empty
+        assert rank_by_drop(sample_prices_df, as_of="2024-12-31").empty
+
+    def test_sqlite_as_of_matches(
+        self, sample_prices_df: pd.DataFrame, sample_sqlite_db: Path
+    ) -> None:
+        """Test that the SQL pushdown honours as_of."""
+        expected = rank_by_drop(sample_prices_df, as_of="2025-02-20")
+        actual = rank_summary(query_coin_summary(sample_sqlite_db, as_of="2025-02-20"))
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_rank_as_of_reads_store(
+        self, sample_prices_csv: Path, sample_prices_df: pd.DataFrame,
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test rank_as_of against the CSV store."""
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", sample_prices_csv)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "missing.db")
+        results = rank_as_of("2025-02-20")
+        expected = rank_by_drop(sample_prices_df, as_of="2025-02-20")
+        assert results["coin_id"].tolist() == expected["coin_id"].tolist()
+
 
 class TestGetCoinStats:
     """Tests for get_coin_stats function."""
@@ -225,6 +342,14 @@ class TestGenerateSummary:
         summary = generate_summary(pd.DataFrame())
         assert summary["total_coins"] == 0
 
+    def test_percentiles_are_exact(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test the drop percentiles against numpy."""
+        results = rank_by_drop(sample_prices_df)
+        summary = generate_summary(results)
+
+        expected = np.percentile(results["pct_change"], [10, 25, 75, 90]).round(2)
+        assert [summary[f"p{q}_drop_pct"] for q in (10, 25, 75, 90)] == expected.tolist()
+
 
 class TestExportResults:
     """Tests for export_results function."""
@@ -258,6 +383,7 @@ class TestExportResults:
 class TestRun:
     """Tests for the run() function."""
 
+    @pytest.mark.usefixtures("isolated_outputs")
     def test_run_produces_results(
         self, sample_prices_csv: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -266,8 +392,6 @@ class TestRun:
 
         monkeypatch.setattr("src.analyzer.PRICES_CSV", sample_prices_csv)
         monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "nonexistent.db")
-        monkeypatch.setattr("src.analyzer.RESULTS_CSV", tmp_path / "results.csv")
-        monkeypatch.setattr("src.analyzer.DATA_DIR", tmp_path)
 
         import logging
         logging.basicConfig(level=logging.INFO)
@@ -275,6 +399,99 @@ class TestRun:
         results = run()
         assert not results.empty
         assert (tmp_path / "results.csv").exists()
+        assert "max_drawdown_pct" in pd.read_csv(tmp_path / "results.csv").columns
+
+    @pytest.mark.usefixtures("isolated_outputs")
+    def test_run_reports_progress(
+        self, sample_prices_csv: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that run() reports each step to the progress callback."""
+        from src.analyzer import run
+
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", sample_prices_csv)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "nonexistent.db")
+        steps = []
+
+        run(progress=steps.append)
+        run(progress=steps.append)
+
+        assert steps == [
+            "Ranking coins by drop from peak",
+            "Saving results",
+            "Summarizing results",
+            "Inputs unchanged since last run, using cached results",
+        ]
+
+    @pytest.mark.usefixtures("isolated_outputs")
+    def test_run_from_sqlite(
+        self, sample_sqlite_db: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that run(source='sqlite') ranks via the SQL summary."""
+        from src.analyzer import run
+
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", tmp_path / "missing.csv")
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", sample_sqlite_db)
+
+        results = run(source="sqlite")
+        assert not results.empty
+        assert (tmp_path / "results.csv").exists()
+        assert "max_drawdown_pct" in results.columns
+
+    @pytest.mark.usefixtures("isolated_outputs")
+    def test_run_reuses_unchanged_results(
+        self, sample_prices_csv: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that run() skips work when the inputs are unchanged."""
+        from src import analyzer
+
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", sample_prices_csv)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "nonexistent.db")
+
+        first = analyzer.run()
+        assert analyzer.results_are_fresh()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("analysis should not rerun")
+
+        monkeypatch.setattr("src.analyzer.load_data", fail)
+        cached = analyzer.run()
+        pd.testing.assert_frame_equal(cached, first, check_dtype=False)
+
+        # Changed inputs must trigger a recompute
+        monkeypatch.setattr("src.analyzer.input_fingerprint", lambda source="csv": "changed")
+        assert not analyzer.results_are_fresh()
+        with pytest.raises(AssertionError):
+            analyzer.run()
+
+    @pytest.mark.usefixtures("isolated_outputs")
+    def test_run_writes_full_ranking(
+        self, sample_prices_csv: Path, sample_prices_df: pd.DataFrame, tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that one run writes the top-N results and the full ranking."""
+        from src import analyzer
+
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", sample_prices_csv)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "nonexistent.db")
+        monkeypatch.setattr("src.analyzer.TOP_N_RANKING", 2)
+
+        results = analyzer.run()
+        ranking = analyzer.load_full_ranking(tmp_path / "ranking.pkl")
+
+        pd.testing.assert_frame_equal(ranking, rank_by_drop(sample_prices_df, top_n=None))
+        assert len(ranking) > len(results) == 2
+        assert results["coin_id"].tolist() == ranking["coin_id"].head(2).tolist()
+
+        # Gzipped downloads of the full ranking, rank included
+        exported = pd.read_csv(tmp_path / "ranking.csv.gz", index_col="rank")
+        assert exported["coin_id"].tolist() == ranking["coin_id"].tolist()
+        records = pd.read_json(tmp_path / "ranking.json.gz")
+        assert records["rank"].tolist() == ranking.index.tolist()
+
+        # Results without a matching ranking artifact are not fresh
+        (tmp_path / "ranking.pkl").unlink()
+        assert not analyzer.results_are_fresh()
+        assert analyzer.load_full_ranking(tmp_path / "ranking.pkl").empty
 
 
 class TestLoadData:
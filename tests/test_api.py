@@ -0,0 +1,260 @@
+"""Unit tests for api module."""
+
+import gzip
+import http.client
+import json
+import threading
+from typing import Iterator
+
+import pandas as pd
+import pytest
+
+from src.analyzer import rank_by_drop
+from src.api import (
+    ApiData,
+    ApiServer,
+    Response,
+    accepts_gzip,
+    etag_matches,
+    history_payload,
+    rankings_payload,
+    route,
+    summary_payload,
+)
+from src.store import PriceStore
+
+
+@pytest.fixture
+def store(sample_prices_df: pd.DataFrame) -> PriceStore:
+    """Store over the sample prices with their full ranking."""
+    ranking = rank_by_drop(sample_prices_df, top_n=None)
+    return PriceStore(sample_prices_df, ranking, ranking=ranking)
+
+
+@pytest.fixture
+def server(store: PriceStore) -> Iterator[ApiServer]:
+    """API server on a free local port."""
+    server = ApiServer(("127.0.0.1", 0), ApiData(lambda: store, lambda: "v1"))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(server: ApiServer, path: str, method: str = "GET",
+          **headers: str) -> tuple[http.client.HTTPResponse, bytes]:
+    """Send one request and return the response and its body."""
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+    conn.request(method, path, headers={k.replace("_", "-"): v for k, v in headers.items()})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response, body
+
+
+class TestPayloads:
+    """Tests for the endpoint payloads."""
+
+    def test_rankings(self, store: PriceStore) -> None:
+        """Test the full ranking and a page of it, with ranks."""
+        full = rankings_payload(store)
+        page = rankings_payload(store, limit=2, offset=1)
+
+        assert full["total"] == full["count"] == 4
+        assert [row["rank"] for row in full["rankings"]] == [1, 2, 3, 4]
+        assert page["count"] == 2
+        assert page["rankings"] == full["rankings"][1:3]
+
+    def test_history_window(self, store: PriceStore) -> None:
+        """Test that from and to are inclusive and identity is hoisted."""
+        payload = history_payload(store, "coin-a", pd.Timestamp("2025-01-10"),
+                                  pd.Timestamp("2025-01-12"))
+
+        assert payload["coin_id"] == "coin-a" and payload["symbol"] == "ca"
+        assert payload["count"] == 3
+        assert payload["history"][0]["date"].startswith("2025-01-10")
+        assert "coin_id" not in payload["history"][0]
+        assert history_payload(store, "coin-a", end=pd.Timestamp("2025-01-01"))["count"] == 1
+        assert history_payload(store, "coin-a")["count"] == 60
+
+    def test_missing_identity_is_null(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that a missing coin name is encoded as JSON null, not NaN."""
+        prices = sample_prices_df.assign(coin_name=None)
+        response = Response.render(history_payload(PriceStore(prices, pd.DataFrame()), "coin-b"))
+
+        assert json.loads(response.body)["coin_name"] is None
+
+    def test_unknown_coin(self, store: PriceStore) -> None:
+        """Test that a coin without prices is a KeyError."""
+        with pytest.raises(KeyError, match="Unknown coin"):
+            history_payload(store, "missing")
+
+    def test_summary(self, store: PriceStore) -> None:
+        """Test the headline numbers."""
+        summary = summary_payload(store)
+
+        assert summary["coins"] == 4
+        assert summary["biggest_drop"]["coin_id"] == "coin-d"
+        assert summary["mean_pct_change"] < 0 and summary["median_pct_change"] < 0
+        assert summary["as_of"] == "2025-03-01"
+
+    def test_no_results(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that a store without a ranking is FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            summary_payload(PriceStore(sample_prices_df, pd.DataFrame()))
+
+
+class TestRoute:
+    """Tests for route function."""
+
+    def test_equivalent_targets_share_a_key(self) -> None:
+        """Test that parameter order and unknown parameters are ignored."""
+        key, _ = route("/coins/coin%2Da/history?to=2025-02-01&from=2025-01-01&x=1")
+
+        assert key == ("history", "coin-a", pd.Timestamp("2025-01-01"),
+                       pd.Timestamp("2025-02-01"))
+        assert route("/rankings?offset=0")[0] == route("/rankings/")[0]
+
+    @pytest.mark.parametrize("target, error", [
+        ("/nope", KeyError),
+        ("/coins/a/prices", KeyError),
+        ("/rankings?limit=-1", ValueError),
+        ("/rankings?offset=x", ValueError),
+        ("/coins/a/history?from=someday", ValueError),
+        ("/coins/a/history?from=2025-01-10T00:00Z", ValueError),
+        ("/coins/a/history?to=2025-01-10%2B02:00", ValueError),
+        ("/coins/a/history?to=NaT", ValueError),
+    ])
+    def test_bad_targets(self, target: str, error: type) -> None:
+        """Test unknown paths and malformed parameters."""
+        with pytest.raises(error):
+            route(target)
+
+
+class TestResponse:
+    """Tests for Response.render."""
+
+    def test_nan_is_rejected(self) -> None:
+        """Test that NaN cannot be written as an invalid JSON token."""
+        with pytest.raises(ValueError):
+            Response.render({"value": float("nan")})
+
+
+class TestApiData:
+    """Tests for ApiData."""
+
+    def test_responses_are_cached_per_version(self, store: PriceStore) -> None:
+        """Test reuse within a version and a reload when it changes."""
+        versions, loads = ["v1"], []
+
+        def loader() -> PriceStore:
+            loads.append(1)
+            return store
+
+        data = ApiData(loader, lambda: versions[0], check_interval=0)
+        first = data.get("/summary")
+
+        assert data.get("/summary") is first
+        versions[0] = "v2"
+        second = data.get("/summary")
+        assert second is not first and second.etag == first.etag
+        assert second.version == "v2" and len(loads) == 2
+
+    def test_errors_and_eviction(self, store: PriceStore) -> None:
+        """Test error statuses and the cache size limit."""
+        data = ApiData(lambda: store, lambda: "v1", cache_size=1)
+
+        assert data.get("/nope").status == 404
+        assert data.get("/coins/missing/history").status == 404
+        assert data.get("/rankings?limit=x").status == 400
+        assert data.get("/coins/coin-a/history?from=2025-01-10T00:00Z").status == 400
+        first = data.get("/rankings?limit=1")
+        data.get("/rankings?limit=2")
+        assert data.get("/rankings?limit=1") is not first
+
+    def test_missing_results(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that the API answers 503 before the first analysis."""
+        data = ApiData(lambda: PriceStore(sample_prices_df, pd.DataFrame()), lambda: "v1")
+
+        assert data.get("/rankings").status == 503
+
+    def test_concurrent_requests_render_once(self, store: PriceStore,
+                                             monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a burst of identical cold requests shares one render."""
+        renders = []
+        render = Response.render
+
+        def counting_render(*args, **kwargs) -> Response:
+            renders.append(1)
+            return render(*args, **kwargs)
+
+        monkeypatch.setattr(Response, "render", counting_render)
+        data = ApiData(lambda: store, lambda: "v1")
+        threads = [threading.Thread(target=data.get, args=("/rankings",)) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(renders) == 1
+
+
+class TestHeaders:
+    """Tests for etag_matches and accepts_gzip functions."""
+
+    def test_etag_matches(self) -> None:
+        """Test weak comparison, lists and the wildcard."""
+        assert etag_matches('W/"abc"', 'W/"abc"')
+        assert etag_matches('"x", "abc"', 'W/"abc"')
+        assert etag_matches("*", 'W/"abc"')
+        assert not etag_matches('"x"', 'W/"abc"')
+        assert not etag_matches(None, 'W/"abc"')
+
+    def test_accepts_gzip(self) -> None:
+        """Test codings, wildcards and zero quality."""
+        assert accepts_gzip("gzip, deflate, br")
+        assert accepts_gzip("br;q=1.0, gzip;q=0.5")
+        assert accepts_gzip("*")
+        assert not accepts_gzip("gzip;q=0")
+        assert not accepts_gzip("identity")
+        assert not accepts_gzip(None)
+
+
+class TestServer:
+    """Tests for ApiServer over HTTP."""
+
+    def test_get_with_etag_and_gzip(self, server: ApiServer) -> None:
+        """Test the JSON body, gzip negotiation and a 304 revalidation."""
+        path = "/coins/coin-a/history"
+        plain, body = fetch(server, path)
+        packed, packed_body = fetch(server, path, Accept_Encoding="gzip")
+        revalidated, empty = fetch(server, path, If_None_Match=plain.getheader("ETag"))
+
+        assert plain.status == 200
+        assert plain.getheader("Content-Type") == "application/json"
+        assert json.loads(body)["count"] == 60
+        assert packed.getheader("Content-Encoding") == "gzip"
+        assert gzip.decompress(packed_body) == body
+        assert packed.getheader("ETag") == plain.getheader("ETag")
+        assert revalidated.status == 304 and empty == b""
+
+    def test_small_bodies_are_not_gzipped(self, server: ApiServer) -> None:
+        """Test that errors and small payloads are sent as is."""
+        response, body = fetch(server, "/coins/missing/history", Accept_Encoding="gzip")
+
+        assert response.status == 404
+        assert response.getheader("Content-Encoding") is None
+        assert json.loads(body) == {"error": "Unknown coin: missing"}
+
+    def test_head_and_keep_alive(self, server: ApiServer) -> None:
+        """Test HEAD without a body and several requests on one connection."""
+        head, body = fetch(server, "/summary", method="HEAD")
+        assert head.status == 200 and body == b""
+        assert int(head.getheader("Content-Length")) > 0
+
+        conn = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+        for path in ["/summary", "/coins/coin-a/history?from=2025-02-01"]:
+            conn.request("GET", path)
+            assert conn.getresponse().read()
+        conn.close()
@@ -0,0 +1,156 @@
+"""Unit tests for auto_fetch module."""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import src.auto_fetch as auto_fetch
+from src.auto_fetch import AnalysisStatus, analysis_status, ensure_data, start_analysis
+
+
+def wait_until_finished(timeout: float = 5.0) -> AnalysisStatus:
+    """Poll until the background analysis is no longer running."""
+    deadline = time.time() + timeout
+    while analysis_status().state == "running" and time.time() < deadline:
+        time.sleep(0.01)
+    return analysis_status()
+
+
+@pytest.fixture
+def lock_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Fresh status and lock file for each test."""
+    path = tmp_path / "analysis.lock"
+    monkeypatch.setattr("src.auto_fetch.ANALYSIS_LOCK", path)
+    monkeypatch.setattr("src.auto_fetch._status", AnalysisStatus())
+    monkeypatch.setattr("src.auto_fetch.input_fingerprint", lambda: "fp")
+    return path
+
+
+class TestStartAnalysis:
+    """Tests for the background analysis worker."""
+
+    def test_single_flight(self, lock_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a second start is refused while a run is under way."""
+        release, calls = threading.Event(), []
+
+        def slow_run(progress) -> None:
+            calls.append(1)
+            release.wait(5)
+
+        monkeypatch.setattr("src.analyzer.run", slow_run)
+
+        assert start_analysis()
+        assert lock_path.exists()
+        assert not start_analysis()
+        release.set()
+        status = wait_until_finished()
+
+        assert status.state == "done"
+        assert status.fingerprint == "fp"
+        assert calls == [1]
+        assert not lock_path.exists()
+
+    def test_lock_held_elsewhere(self, lock_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that another process's lock blocks a run until abandoned."""
+        monkeypatch.setattr("src.analyzer.run", lambda progress: None)
+        lock_path.write_text("12345\n")
+
+        assert not start_analysis()
+        assert analysis_status().state == "idle"
+
+        old = time.time() - auto_fetch.ANALYSIS_LOCK_TIMEOUT - 1
+        os.utime(lock_path, (old, old))
+        assert start_analysis()
+        assert wait_until_finished().state == "done"
+
+    def test_failure_recorded(self, lock_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a failing run is reported and releases the lock."""
+        def fail(progress) -> None:
+            raise RuntimeError("no prices")
+
+        monkeypatch.setattr("src.analyzer.run", fail)
+        start_analysis()
+        status = wait_until_finished()
+
+        assert status.state == "failed"
+        assert status.error == "no prices"
+        assert not lock_path.exists()
+
+    def test_progress_messages(self, lock_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the steps the run reports become its progress message."""
+        messages, reported, seen = [], threading.Event(), threading.Event()
+
+        def run(progress) -> None:
+            progress("Ranking coins by drop from peak")
+            reported.set()
+            seen.wait(5)
+            progress("Saving results")
+
+        monkeypatch.setattr("src.analyzer.run", run)
+        start_analysis()
+        reported.wait(5)
+        messages.append(analysis_status().message)
+        seen.set()
+        status = wait_until_finished()
+
+        assert messages == ["Ranking coins by drop from peak"]
+        assert status.message == "Saving results"
+        assert status.elapsed >= 0
+
+
+class TestEnsureData:
+    """Tests for ensure_data function."""
+
+    @pytest.fixture
+    def started(self, lock_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> list:
+        """Data files in tmp_path; records background starts instead of running."""
+        calls = []
+        monkeypatch.setattr("src.auto_fetch.PRICES_CSV", tmp_path / "prices.csv")
+        monkeypatch.setattr("src.auto_fetch.RESULTS_CSV", tmp_path / "results.csv")
+        monkeypatch.setattr("src.auto_fetch.start_analysis", lambda: calls.append("start"))
+        monkeypatch.setattr("src.auto_fetch._show_progress", lambda has: calls.append(has))
+        monkeypatch.setattr("src.auto_fetch.results_are_fresh", lambda: False)
+        return calls
+
+    def test_no_data(self, started: list) -> None:
+        """Test that nothing runs without prices."""
+        assert not ensure_data()
+        assert started == []
+
+    def test_fresh_results(self, started: list, tmp_path: Path,
+                           monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that fresh results are used without starting a run."""
+        (tmp_path / "prices.csv").write_text("x")
+        (tmp_path / "results.csv").write_text("x")
+        monkeypatch.setattr("src.auto_fetch.results_are_fresh", lambda: True)
+
+        assert ensure_data()
+        assert started == []
+
+    def test_stale_results_shown_while_updating(self, started: list, tmp_path: Path) -> None:
+        """Test that stale results stay available while the run starts."""
+        (tmp_path / "prices.csv").write_text("x")
+        (tmp_path / "results.csv").write_text("x")
+
+        assert ensure_data()
+        assert started == ["start", True]
+
+    def test_no_results_yet(self, started: list, tmp_path: Path) -> None:
+        """Test that the first run reports no data while it runs."""
+        (tmp_path / "prices.csv").write_text("x")
+
+        assert not ensure_data()
+        assert started == ["start", False]
+
+    def test_failed_run_not_retried(self, started: list, tmp_path: Path,
+                                    monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a run that failed on the same inputs is not restarted."""
+        (tmp_path / "prices.csv").write_text("x")
+        monkeypatch.setattr("src.auto_fetch._status",
+                            AnalysisStatus(state="failed", fingerprint="fp", error="boom"))
+
+        assert not ensure_data()
+        assert started == []
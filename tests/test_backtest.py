@@ -0,0 +1,151 @@
+"""Unit tests for backtest module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest import Strategy, parameter_grid, run_backtest
+from src.panel import build_panel
+
+
+def _panel(prices: dict[str, list[float]]):
+    """Build a panel from per-coin daily closes starting 2025-01-01."""
+    frames = []
+    for coin_id, closes in prices.items():
+        frame = pd.DataFrame({
+            "date": pd.date_range("2025-01-01", periods=len(closes)),
+            "coin_id": coin_id,
+            "price": closes,
+        })
+        frames.append(frame.dropna(subset=["price"]))
+    return build_panel(pd.concat(frames, ignore_index=True))
+
+
+def _reference_trades(panel, strategy: Strategy) -> list[tuple]:
+    """Day-by-day loop implementing the same rules, for comparison."""
+    trades = []
+    for row, closes in enumerate(panel.price):
+        peaks = np.fmax.accumulate(closes)
+        n_days, day = len(closes), 0
+        while day < n_days:
+            observed = not np.isnan(closes[day])
+            if not (observed and closes[day] / peaks[day] - 1
+                    <= -strategy.entry_drawdown_pct / 100):
+                day += 1
+                continue
+            target = closes[day] * (1 + strategy.take_profit_pct / 100)
+            exit_day, reason = None, None
+            for lag in range(1, strategy.max_hold_days + 1):
+                if day + lag >= n_days:
+                    break
+                if closes[day + lag] >= target:
+                    exit_day, reason = day + lag, "target"
+                    break
+            if exit_day is None:
+                if day + strategy.max_hold_days < n_days:
+                    exit_day, reason = day + strategy.max_hold_days, "time"
+                else:
+                    exit_day, reason = n_days - 1, "open"
+            trades.append((panel.coins[row], day, exit_day, reason))
+            day = exit_day + 1
+    return trades
+
+
+def _trade_tuples(result, panel, strategy_id: int) -> list[tuple]:
+    """Convert a strategy's trades to (coin, entry col, exit col, reason)."""
+    trades = result.trades[result.trades["strategy"] == strategy_id]
+    start = pd.Timestamp(panel.dates[0])
+    return list(zip(
+        trades["coin_id"].astype(str),
+        (trades["entry_date"] - start).dt.days,
+        (trades["exit_date"] - start).dt.days,
+        trades["exit_reason"].astype(str),
+    ))
+
+
+class TestParameterGrid:
+    """Tests for parameter_grid function."""
+
+    def test_cartesian_product(self) -> None:
+        """Test every combination is produced once."""
+        grid = parameter_grid([30, 50], [10], [7, 30, 90])
+        assert len(grid) == 6
+        assert Strategy(50, 10, 90) in grid
+
+
+class TestRunBacktest:
+    """Tests for run_backtest function."""
+
+    def test_take_profit_time_and_open_exits(self) -> None:
+        """Test each exit rule on a hand-built price path."""
+        panel = _panel({"A": [100, 50, 55, 60, 40, 40, 40, 40, 30, 31]})
+        result = run_backtest(panel, [Strategy(50, 20, 3)])
+        trades = result.trades
+
+        assert trades["entry_date"].dt.day.tolist() == [2, 5, 9]
+        assert trades["exit_reason"].astype(str).tolist() == ["target", "time", "open"]
+        assert trades["exit_date"].dt.day.tolist() == [4, 8, 10]
+        np.testing.assert_allclose(trades["return_pct"], [20.0, 0.0, 100 * (31 / 30 - 1)])
+
+    def test_no_signal_no_trades(self) -> None:
+        """Test that a coin that never draws down deep enough is not traded."""
+        panel = _panel({"A": [1, 2, 3, 2.5, 4]})
+        result = run_backtest(panel, [Strategy(50, 10, 5)])
+
+        assert result.trades.empty
+        assert result.summary["trades"].tolist() == [0]
+
+    def test_matches_reference_loop(self) -> None:
+        """Test the vectorized engine against a day-by-day loop with gaps."""
+        rng = np.random.default_rng(8)
+        closes = {}
+        for coin in range(6):
+            path = 10 * np.exp(np.cumsum(rng.normal(0, 0.08, 150)))
+            path[rng.random(150) < 0.1] = np.nan
+            path[:coin * 10] = np.nan  # staggered listings
+            closes[f"C{coin}"] = path.tolist()
+        panel = _panel(closes)
+        grid = parameter_grid([10, 30, 60], [5, 25], [1, 9, 40])
+        result = run_backtest(panel, grid)
+
+        for strategy_id, strategy in enumerate(grid):
+            assert sorted(_trade_tuples(result, panel, strategy_id)) == \
+                sorted(_reference_trades(panel, strategy))
+
+    def test_summaries(self) -> None:
+        """Test per-coin compounding and per-strategy aggregates."""
+        panel = _panel({
+            "A": [100, 50, 60, 30, 36],
+            "B": [10, 10, 10, 10, 10],
+        })
+        result = run_backtest(panel, [Strategy(50, 20, 5)])
+
+        per_coin = result.per_coin.set_index("coin_id")
+        assert list(per_coin.index) == ["A"]
+        assert per_coin.loc["A", "trades"] == 2
+        assert per_coin.loc["A", "total_return_pct"] == pytest.approx(44.0)
+
+        summary = result.summary.iloc[0]
+        assert summary["coins_traded"] == 1
+        assert summary["win_rate_pct"] == pytest.approx(100.0)
+        assert summary["avg_return_pct"] == pytest.approx(20.0)
+        assert summary["avg_coin_return_pct"] == pytest.approx(44.0)
+
+    def test_chunked_and_process_pool(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that chunking and workers do not change the results."""
+        rng = np.random.default_rng(1)
+        panel = _panel({f"C{i}": (10 * np.exp(np.cumsum(rng.normal(0, 0.1, 80)))).tolist()
+                        for i in range(5)})
+        grid = parameter_grid([20, 40], [10, 30], [5, 20])
+        expected = run_backtest(panel, grid)
+
+        monkeypatch.setattr("src.backtest.MAX_CHUNK_ROWS", 7)
+        pd.testing.assert_frame_equal(run_backtest(panel, grid).summary, expected.summary)
+        pooled = run_backtest(panel, grid, workers=2)
+        pd.testing.assert_frame_equal(pooled.trades, expected.trades)
+        pd.testing.assert_frame_equal(pooled.per_coin, expected.per_coin)
+
+    def test_empty_inputs(self, empty_prices_df: pd.DataFrame) -> None:
+        """Test an empty panel and an empty grid."""
+        assert run_backtest(build_panel(empty_prices_df), [Strategy(50, 10, 5)]).trades.empty
+        assert run_backtest(_panel({"A": [1, 2]}), []).summary.empty
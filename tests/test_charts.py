@@ -0,0 +1,85 @@
+"""Unit tests for charts module."""
+
+import pandas as pd
+import pytest
+
+from src.charts import (
+    candlestick,
+    drawdown_area,
+    drop_bar,
+    drop_histogram,
+    percentile_bands,
+    price_history,
+    rank_line,
+    volume_bars,
+)
+
+
+@pytest.fixture
+def coin_rows() -> pd.DataFrame:
+    """Ten days of one coin's prices, volumes and indicators."""
+    return pd.DataFrame({
+        "date": pd.date_range("2025-01-01", periods=10),
+        "price": [float(p) for p in range(10, 20)],
+        "volume": [1e6] * 10,
+        "sma_20": [15.0] * 10,
+        "drawdown_pct": [0.0, -5.0] * 5,
+        "rank": list(range(1, 11)),
+    })
+
+
+class TestRankingCharts:
+    """Tests for the ranking overview charts."""
+
+    def test_drop_bar(self) -> None:
+        """Test the bar chart and that missing hover columns are skipped."""
+        frame = pd.DataFrame({"symbol": ["A", "B"], "pct_change": [-80.0, -20.0],
+                              "coin_name": ["Alpha", "Beta"]})
+        fig = drop_bar(frame, ["coin_name", "peak_date"], height=450, y_label="Drop")
+
+        assert list(fig.data[0].y) == [-80.0, -20.0]
+        assert fig.layout.height == 450
+        assert fig.layout.yaxis.title.text == "Drop"
+
+    def test_drop_histogram(self) -> None:
+        """Test the histogram over a plain Series."""
+        fig = drop_histogram(pd.Series([-10.0, -50.0, -90.0], name="drops"), nbins=5)
+
+        assert list(fig.data[0].x) == [-10.0, -50.0, -90.0]
+        assert fig.data[0].nbinsx == 5
+
+    def test_percentile_bands(self) -> None:
+        """Test one line per percentile, skipping empty days."""
+        bands = pd.DataFrame({
+            "label": pd.date_range("2025-01-01", periods=3),
+            **{f"p{q}": [float(q), None, float(q)] for q in (10, 25, 50, 75, 90)},
+        })
+        fig = percentile_bands(bands, "% below peak")
+
+        assert [trace.name for trace in fig.data] == ["p10", "p25", "p50", "p75", "p90"]
+        assert all(len(trace.x) == 2 for trace in fig.data)
+
+
+class TestCoinCharts:
+    """Tests for the Coin Details charts."""
+
+    def test_price_history_with_overlays(self, coin_rows: pd.DataFrame) -> None:
+        """Test the price line, peak marker and overlay traces."""
+        fig = price_history(coin_rows, pd.Timestamp("2025-01-10"), 19.0,
+                            {"sma_20": coin_rows[["date", "sma_20"]]})
+
+        assert [trace.name for trace in fig.data][1:] == ["2025 Peak", "SMA 20"]
+        assert fig.data[1].y == (19.0,)
+
+    def test_history_charts(self, coin_rows: pd.DataFrame) -> None:
+        """Test the volume, drawdown and rank charts."""
+        assert volume_bars(coin_rows).data[0].type == "bar"
+        assert drawdown_area(coin_rows).layout.height == 300
+        assert rank_line(coin_rows).layout.yaxis.autorange == "reversed"
+
+    def test_candlestick_opens_at_previous_close(self, coin_rows: pd.DataFrame) -> None:
+        """Test that each candle opens at the previous close."""
+        candle = candlestick(coin_rows).data[0]
+
+        assert list(candle.open[1:]) == list(candle.close[:-1])
+        assert list(candle.high) == list(candle.close)
@@ -0,0 +1,173 @@
+"""Unit tests for correlation module."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.correlation import (
+    align_prices,
+    compute_betas,
+    daily_returns,
+    get_betas,
+    get_correlation,
+    pairwise_correlation,
+)
+from src.panel import build_panel
+
+
+@pytest.fixture
+def gappy_returns() -> np.ndarray:
+    """Random returns with scattered and leading gaps."""
+    rng = np.random.default_rng(3)
+    returns = rng.normal(0, 0.03, (23, 120))
+    returns[:, :5] += returns[:1, :5]  # some shared movement
+    returns[rng.random(returns.shape) < 0.25] = np.nan
+    returns[:4, :90] = np.nan  # late listings with short overlap
+    return returns
+
+
+def _market_prices(n_days: int = 120) -> pd.DataFrame:
+    """Benchmark prices plus two coins with known exposure to it."""
+    rng = np.random.default_rng(11)
+    dates = pd.date_range("2025-01-01", periods=n_days)
+    market = rng.normal(0, 0.02, n_days)
+    returns = {
+        "BTC": market,
+        "HIGH": 2 * market,
+        "NOISE": rng.normal(0, 0.02, n_days),
+    }
+    frames = [
+        pd.DataFrame({"date": dates, "coin_id": coin, "symbol": coin,
+                      "price": 100 * np.cumprod(1 + r)})
+        for coin, r in returns.items()
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestDailyReturns:
+    """Tests for daily_returns function."""
+
+    def test_missing_days_break_returns(self) -> None:
+        """Test that a return needs prices on both days."""
+        prices = np.array([[100.0, 110.0, np.nan, 121.0]])
+        returns = daily_returns(prices)
+        np.testing.assert_allclose(returns[0, 0], 0.1)
+        assert np.isnan(returns[0, 1:]).all()
+
+    def test_single_day(self) -> None:
+        """Test that one day yields no returns."""
+        assert daily_returns(np.array([[1.0]])).shape == (1, 0)
+
+
+class TestPairwiseCorrelation:
+    """Tests for pairwise_correlation function."""
+
+    def test_matches_pandas_pairwise_complete(self, gappy_returns: np.ndarray) -> None:
+        """Test against DataFrame.corr with pairwise-complete observations."""
+        result = pairwise_correlation(gappy_returns, block_size=5, min_periods=30)
+        expected = pd.DataFrame(gappy_returns.T).corr(min_periods=30).to_numpy()
+
+        assert result.dtype == np.float32
+        np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+        np.testing.assert_allclose(result, expected, atol=1e-6, equal_nan=True)
+
+    def test_block_size_does_not_change_result(self, gappy_returns: np.ndarray) -> None:
+        """Test that blocking only bounds memory."""
+        whole = pairwise_correlation(gappy_returns, block_size=1000)
+        for block_size in (1, 4, 7):
+            np.testing.assert_array_equal(
+                pairwise_correlation(gappy_returns, block_size=block_size), whole
+            )
+
+    def test_constant_series_is_nan(self) -> None:
+        """Test that zero variance gives NaN rather than inf."""
+        returns = np.array([np.zeros(40), np.linspace(-1, 1, 40)])
+        result = pairwise_correlation(returns, min_periods=10)
+        assert np.isnan(result[0]).all()
+        assert result[1, 1] == pytest.approx(1.0)
+
+
+class TestBetas:
+    """Tests for benchmark alignment and betas."""
+
+    def test_align_prices_offsets(self) -> None:
+        """Test placing a shorter panel on another panel's calendar."""
+        df = _market_prices(10)
+        panel = build_panel(df[df["coin_id"] != "BTC"])
+        bench = build_panel(df[(df["coin_id"] == "BTC") & (df["date"] >= "2025-01-04")])
+        aligned = align_prices(panel, bench)
+
+        assert aligned.shape == (1, 10)
+        assert np.isnan(aligned[0, :3]).all()
+        np.testing.assert_allclose(aligned[0, 3:], bench.price[0])
+
+    def test_known_beta(self) -> None:
+        """Test beta and correlation of coins with known exposure."""
+        df = _market_prices()
+        panel = build_panel(df[df["coin_id"] != "BTC"])
+        bench = build_panel(df[df["coin_id"] == "BTC"])
+        betas = compute_betas(panel, bench).set_index("coin_id")
+
+        assert list(betas.columns) == ["beta_btc", "corr_btc"]
+        assert betas.loc["HIGH", "beta_btc"] == pytest.approx(2.0)
+        assert betas.loc["HIGH", "corr_btc"] == pytest.approx(1.0)
+        assert abs(betas.loc["NOISE", "corr_btc"]) < 0.3
+
+    def test_insufficient_overlap(self) -> None:
+        """Test NaN when the benchmark barely overlaps a coin."""
+        df = _market_prices(60)
+        panel = build_panel(df[df["coin_id"] == "HIGH"])
+        bench = build_panel(df[(df["coin_id"] == "BTC") & (df["date"] >= "2025-02-20")])
+        assert compute_betas(panel, bench)["beta_btc"].isna().all()
+
+
+class TestCaching:
+    """Tests for the on-disk correlation cache and get_betas."""
+
+    @pytest.fixture(autouse=True)
+    def _isolate(self, tmp_path: Path, sample_prices_csv: Path,
+                 monkeypatch: pytest.MonkeyPatch) -> None:
+        """Point the analyzer and panel at temporary files."""
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", sample_prices_csv)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "missing.db")
+        monkeypatch.setattr("src.panel.PANEL_PATH", tmp_path / "panel.npz")
+
+    def test_reuses_fresh_matrix(self, tmp_path: Path,
+                                 monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a second call loads the cached matrix."""
+        path = tmp_path / "corr.npz"
+        first = get_correlation(path=path)
+        assert path.exists()
+
+        monkeypatch.setattr("src.correlation.compute_correlation", None)
+        second = get_correlation(path=path)
+        np.testing.assert_array_equal(second.matrix, first.matrix)
+        assert list(second.coins) == list(first.coins)
+
+    def test_most_correlated(self, tmp_path: Path) -> None:
+        """Test the per-coin lookup helpers."""
+        corr = get_correlation(path=tmp_path / "corr.npz")
+        top = corr.most_correlated("coin-a", n=5)
+
+        assert "coin-a" not in top["coin_id"].tolist()
+        assert top["correlation"].is_monotonic_decreasing
+        assert corr.pair("coin-a", "coin-a") == pytest.approx(1.0)
+        with pytest.raises(KeyError):
+            corr.most_correlated("missing")
+
+    def test_get_betas_without_benchmarks(self, tmp_path: Path) -> None:
+        """Test that missing benchmark prices give an empty frame."""
+        assert get_betas(benchmark_path=tmp_path / "none.csv").empty
+
+    def test_get_betas(self, tmp_path: Path, sample_prices_df: pd.DataFrame) -> None:
+        """Test betas against a fetched benchmark file."""
+        bench = sample_prices_df[sample_prices_df["coin_id"] == "coin-a"].assign(
+            coin_id="BTC", symbol="BTC"
+        )
+        bench_path = tmp_path / "bench.csv"
+        bench.to_csv(bench_path, index=False)
+
+        betas = get_betas(benchmark_path=bench_path).set_index("coin_id")
+        assert betas.loc["coin-a", "corr_btc"] == pytest.approx(1.0)
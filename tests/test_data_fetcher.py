@@ -307,6 +307,7 @@ class TestMainFunction:
         def _ctx():
             with patch("src.data_fetcher.ccxt") as mock_ccxt, \
                  patch("src.data_fetcher.PRICES_CSV", tmp_path / "prices.csv"), \
+                 patch("src.data_fetcher.BENCHMARK_CSV", tmp_path / "benchmarks.csv"), \
                  patch("src.data_fetcher.DATABASE_PATH", tmp_path / "test.db"), \
                  patch("src.data_fetcher.DATA_DIR", tmp_path), \
                  patch("src.data_fetcher.time.sleep"), \
@@ -354,3 +355,20 @@ class TestMainFunction:
 
         with self._patch_main(tmp_path, mock_exchange):
             main(coins=["EMPTY"])
+
+    def test_main_benchmarks_kept_separate(
+        self, tmp_path: Path, sample_ohlcv_response
+    ) -> None:
+        """Test benchmark assets go to their own CSV and not the altcoin store."""
+        from src.data_fetcher import main
+
+        mock_exchange = MagicMock()
+        mock_exchange.fetch_ohlcv.return_value = sample_ohlcv_response
+
+        with self._patch_main(tmp_path, mock_exchange):
+            main(benchmarks=True)
+
+        saved = pd.read_csv(tmp_path / "benchmarks.csv")
+        assert set(saved["coin_id"]) == {"BTC", "ETH"}
+        assert not (tmp_path / "prices.csv").exists()
+        assert not (tmp_path / "test.db").exists()
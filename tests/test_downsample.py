@@ -0,0 +1,102 @@
+"""Unit tests for downsample module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.downsample import downsample, in_window, lttb_indices, minmax_indices
+
+
+@pytest.fixture
+def hourly() -> pd.DataFrame:
+    """Random-walk hourly prices with a NaN gap."""
+    rng = np.random.default_rng(0)
+    n = 10_000
+    price = 100 + np.cumsum(rng.normal(size=n))
+    price[500:510] = np.nan
+    return pd.DataFrame({
+        "date": pd.date_range("2025-01-01", periods=n, freq="h"),
+        "price": price,
+    })
+
+
+class TestMinmaxIndices:
+    """Tests for minmax_indices function."""
+
+    def test_keeps_every_bucket_extreme(self) -> None:
+        """Test the budget, endpoints and each bucket's min and max."""
+        y = np.sin(np.linspace(0, 40, 1001)) * np.linspace(1, 2, 1001)
+        keep = minmax_indices(y, 102)
+
+        assert len(keep) <= 102
+        assert keep[0] == 0 and keep[-1] == len(y) - 1
+        assert np.all(np.diff(keep) > 0)
+        assert y[keep].max() == y.max() and y[keep].min() == y.min()
+
+    def test_short_series_untouched(self) -> None:
+        """Test that series within the budget are kept whole."""
+        np.testing.assert_array_equal(minmax_indices(np.arange(5.0), 10), np.arange(5))
+
+
+class TestLttbIndices:
+    """Tests for lttb_indices function."""
+
+    def test_exact_budget_and_endpoints(self) -> None:
+        """Test that exactly budget increasing positions are picked."""
+        x = np.arange(1000.0)
+        keep = lttb_indices(x, np.sin(x / 30), 100)
+
+        assert len(keep) == 100
+        assert keep[0] == 0 and keep[-1] == 999
+        assert np.all(np.diff(keep) > 0)
+
+    def test_picks_spike(self) -> None:
+        """Test that an isolated spike is kept."""
+        y = np.zeros(1000)
+        y[437] = 50.0
+
+        assert 437 in lttb_indices(np.arange(1000.0), y, 20)
+
+
+class TestDownsample:
+    """Tests for downsample function."""
+
+    @pytest.mark.parametrize("method", ["minmax", "lttb"])
+    def test_reduces_to_budget(self, hourly: pd.DataFrame, method: str) -> None:
+        """Test that both methods return ordered rows within the budget."""
+        points = downsample(hourly, "price", 300, method=method)
+
+        assert len(points) <= 300
+        assert points["date"].is_monotonic_increasing
+        assert points["price"].notna().all()
+
+    def test_minmax_keeps_peak_and_trough(self, hourly: pd.DataFrame) -> None:
+        """Test that the default method keeps the extremes."""
+        points = downsample(hourly, "price", 300)
+
+        assert points["price"].max() == hourly["price"].max()
+        assert points["price"].min() == hourly["price"].min()
+
+    def test_within_budget_drops_only_nans(self, hourly: pd.DataFrame) -> None:
+        """Test that a generous budget keeps every non-NaN row."""
+        assert len(downsample(hourly, "price", 20_000)) == hourly["price"].notna().sum()
+
+    def test_unknown_method(self, hourly: pd.DataFrame) -> None:
+        """Test that an unknown method raises."""
+        with pytest.raises(ValueError, match="Unknown downsampling method"):
+            downsample(hourly, "price", 100, method="mean")
+
+
+class TestInWindow:
+    """Tests for in_window function."""
+
+    def test_includes_whole_end_day(self, hourly: pd.DataFrame) -> None:
+        """Test that intraday rows on the last day are kept."""
+        window = in_window(hourly, pd.Timestamp("2025-01-02"), pd.Timestamp("2025-01-03"))
+
+        assert len(window) == 48
+        assert window["date"].iloc[-1] == pd.Timestamp("2025-01-03 23:00")
+
+    def test_open_start(self, hourly: pd.DataFrame) -> None:
+        """Test that a missing start keeps everything up to the end."""
+        assert len(in_window(hourly, None, pd.Timestamp("2025-01-01"))) == 24
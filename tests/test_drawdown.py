@@ -0,0 +1,118 @@
+"""Unit tests for drawdown module."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.drawdown import (
+    STATS_COLUMNS,
+    drawdown_episodes,
+    drawdown_stats,
+    underwater_curve,
+)
+
+
+@pytest.fixture
+def two_episode_df() -> pd.DataFrame:
+    """One coin with a recovered and an open drawdown, one that only rises."""
+    base_date = datetime(2025, 1, 1)
+    prices = {
+        "wavy": [10, 8, 6, 9, 10, 12, 11, 12, 13, 7],
+        "moon": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+    }
+    rows = []
+    for coin_id, series in prices.items():
+        for day, price in enumerate(series):
+            rows.append({
+                "date": base_date + timedelta(days=day),
+                "coin_id": coin_id,
+                "price": float(price),
+            })
+    return pd.DataFrame(rows)
+
+
+class TestUnderwaterCurve:
+    """Tests for underwater_curve function."""
+
+    def test_running_peak(self, two_episode_df: pd.DataFrame) -> None:
+        """Test the running peak and drawdown for one coin."""
+        curve = underwater_curve(two_episode_df)
+        wavy = curve[curve["coin_id"] == "wavy"]
+        assert wavy["running_peak"].tolist() == [10, 10, 10, 10, 10, 12, 12, 12, 13, 13]
+        assert wavy["drawdown_pct"].iloc[2] == pytest.approx(-40.0)
+
+    def test_never_underwater(self, two_episode_df: pd.DataFrame) -> None:
+        """Test that a rising coin has zero drawdown everywhere."""
+        curve = underwater_curve(two_episode_df)
+        assert (curve.loc[curve["coin_id"] == "moon", "drawdown_pct"] == 0).all()
+
+
+class TestDrawdownEpisodes:
+    """Tests for drawdown_episodes function."""
+
+    def test_episodes(self, two_episode_df: pd.DataFrame) -> None:
+        """Test episode boundaries, depth and recovery."""
+        episodes = drawdown_episodes(two_episode_df)
+        assert len(episodes) == 3
+        first = episodes.iloc[0]
+        assert first["peak_price"] == 10
+        assert first["trough_price"] == 6
+        assert first["depth_pct"] == -40.0
+        assert first["recovery_date"] == pd.Timestamp("2025-01-05")
+        assert first["duration_days"] == 4
+        assert bool(first["recovered"])
+
+        last = episodes.iloc[-1]
+        assert not last["recovered"]
+        assert pd.isna(last["recovery_date"])
+        assert last["duration_days"] == 1
+
+    def test_unsorted_input(self, two_episode_df: pd.DataFrame) -> None:
+        """Test that row order does not matter."""
+        shuffled = two_episode_df.sample(frac=1, random_state=3)
+        pd.testing.assert_frame_equal(
+            drawdown_episodes(shuffled), drawdown_episodes(two_episode_df)
+        )
+
+    def test_empty(self, empty_prices_df: pd.DataFrame) -> None:
+        """Test empty input."""
+        assert drawdown_episodes(empty_prices_df).empty
+
+
+class TestDrawdownStats:
+    """Tests for drawdown_stats function."""
+
+    def test_stats(self, two_episode_df: pd.DataFrame) -> None:
+        """Test the per-coin statistics."""
+        stats = drawdown_stats(two_episode_df).set_index("coin_id")
+        wavy = stats.loc["wavy"]
+        assert wavy["max_drawdown_pct"] == -46.15
+        assert wavy["longest_underwater_days"] == 4
+        assert wavy["days_since_peak"] == 1
+        assert np.isnan(wavy["recovery_days"])  # deepest episode is still open
+        assert wavy["drawdown_episodes"] == 3
+
+        moon = stats.loc["moon"]
+        assert moon["max_drawdown_pct"] == 0
+        assert moon["drawdown_episodes"] == 0
+        assert moon["days_since_peak"] == 0
+
+    def test_recovered_deepest_episode(self) -> None:
+        """Test recovery_days when the deepest drawdown recovered."""
+        df = pd.DataFrame({
+            "date": pd.date_range("2025-01-01", periods=6),
+            "coin_id": "v",
+            "price": [10.0, 5.0, 7.0, 11.0, 10.0, 10.5],
+        })
+        stats = drawdown_stats(df).iloc[0]
+        assert stats["recovery_days"] == 3
+        assert stats["drawdown_episodes"] == 2
+
+    def test_columns(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test output layout on the shared sample data."""
+        stats = drawdown_stats(sample_prices_df)
+        assert list(stats.columns) == STATS_COLUMNS
+        assert len(stats) == 4
+        assert (stats["max_drawdown_pct"] <= 0).all()
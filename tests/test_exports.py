@@ -0,0 +1,91 @@
+"""Unit tests for exports module."""
+
+import gzip
+import io
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.exports import artifact_bytes, export_mime, export_name, to_bytes, write_frame
+
+
+@pytest.fixture
+def ranking() -> pd.DataFrame:
+    """Two ranked coins indexed by rank."""
+    return pd.DataFrame({
+        "symbol": ["SOL", "ADA"],
+        "pct_change": [-85.0, -70.0],
+    }, index=pd.RangeIndex(1, 3, name="rank"))
+
+
+class TestWriteFrame:
+    """Tests for write_frame function."""
+
+    def test_named_index_is_kept(self, ranking: pd.DataFrame) -> None:
+        """Test that the rank is the first CSV column and a JSON field."""
+        csv, records = io.BytesIO(), io.BytesIO()
+        write_frame(ranking, "csv", csv, None)
+        write_frame(ranking, "json", records, None)
+
+        assert csv.getvalue().decode().splitlines()[0] == "rank,symbol,pct_change"
+        assert json.loads(records.getvalue())[0] == {
+            "rank": 1, "symbol": "SOL", "pct_change": -85.0}
+
+    def test_unnamed_index_is_dropped(self, ranking: pd.DataFrame) -> None:
+        """Test that a plain RangeIndex is not written."""
+        frame = ranking.reset_index(drop=True)
+        csv, records = io.BytesIO(), io.BytesIO()
+        write_frame(frame, "csv", csv, None)
+        write_frame(frame, "json", records, None)
+
+        assert csv.getvalue().decode().splitlines()[0] == "symbol,pct_change"
+        assert "rank" not in json.loads(records.getvalue())[0]
+
+    def test_gz_path_is_compressed(self, ranking: pd.DataFrame, tmp_path: Path) -> None:
+        """Test that a '.gz' path is gzipped."""
+        path = tmp_path / "ranking.csv.gz"
+        write_frame(ranking, "csv", path)
+
+        assert pd.read_csv(path, index_col="rank").equals(ranking)
+
+
+class TestToBytes:
+    """Tests for to_bytes function."""
+
+    def test_gzip_round_trip(self, ranking: pd.DataFrame) -> None:
+        """Test that the gzipped payload decompresses to the plain one."""
+        plain = to_bytes(ranking, "json")
+        packed = to_bytes(ranking, "json", compress=True)
+
+        assert gzip.decompress(packed) == plain
+        assert pd.read_json(io.BytesIO(plain)).shape == (2, 3)
+
+
+class TestArtifactBytes:
+    """Tests for artifact_bytes function."""
+
+    @pytest.mark.parametrize("name", ["ranking.csv", "ranking.csv.gz"])
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_matches_requested_compression(
+        self, ranking: pd.DataFrame, tmp_path: Path, name: str, compress: bool,
+    ) -> None:
+        """Test every combination of stored and requested compression."""
+        path = tmp_path / name
+        write_frame(ranking, "csv", path)
+
+        data = artifact_bytes(path, compress)
+
+        assert (gzip.decompress(data) if compress else data) == to_bytes(ranking, "csv")
+
+
+class TestExportNames:
+    """Tests for export_name and export_mime functions."""
+
+    def test_names_and_mime(self) -> None:
+        """Test the suffix and MIME type with and without gzip."""
+        assert export_name("drops", "csv") == "drops.csv"
+        assert export_name("drops", "json", compress=True) == "drops.json.gz"
+        assert export_mime("json") == "application/json"
+        assert export_mime("csv", compress=True) == "application/gzip"
@@ -0,0 +1,105 @@
+"""Unit tests for fingerprint module."""
+
+import os
+from pathlib import Path
+
+from src.fingerprint import (
+    analysis_params,
+    compute_fingerprint,
+    data_version,
+    file_signature,
+    is_fresh,
+    read_stamp,
+    stamp_path,
+    write_stamp,
+)
+
+
+class TestFileSignature:
+    """Tests for file_signature function."""
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Test that a missing file has no signature."""
+        assert file_signature(tmp_path / "missing.csv") is None
+
+    def test_size_and_mtime(self, tmp_path: Path) -> None:
+        """Test that size and mtime are recorded."""
+        path = tmp_path / "prices.csv"
+        path.write_text("a,b\n1,2\n")
+        sig = file_signature(path)
+        assert sig["size"] == path.stat().st_size
+        assert sig["mtime_ns"] == path.stat().st_mtime_ns
+        assert "sha256" not in sig
+
+    def test_content_hash(self, tmp_path: Path) -> None:
+        """Test optional content hashing."""
+        path = tmp_path / "prices.csv"
+        path.write_text("a,b\n1,2\n")
+        sig = file_signature(path, hash_content=True)
+        assert len(sig["sha256"]) == 64
+
+
+class TestComputeFingerprint:
+    """Tests for compute_fingerprint function."""
+
+    def test_stable_for_unchanged_inputs(self, sample_prices_csv: Path) -> None:
+        """Test that the fingerprint is deterministic."""
+        params = analysis_params()
+        assert (compute_fingerprint([sample_prices_csv], params)
+                == compute_fingerprint([sample_prices_csv], params))
+
+    def test_changes_with_file(self, sample_prices_csv: Path) -> None:
+        """Test that touching the store changes the fingerprint."""
+        before = compute_fingerprint([sample_prices_csv])
+        stat = sample_prices_csv.stat()
+        os.utime(sample_prices_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert compute_fingerprint([sample_prices_csv]) != before
+
+    def test_changes_with_params(self, sample_prices_csv: Path) -> None:
+        """Test that analysis parameters are part of the fingerprint."""
+        a = compute_fingerprint([sample_prices_csv], {"min_data_days": 30})
+        b = compute_fingerprint([sample_prices_csv], {"min_data_days": 60})
+        assert a != b
+
+
+class TestDataVersion:
+    """Tests for data_version function."""
+
+    def test_changes_only_when_files_change(self, tmp_path: Path) -> None:
+        """Test that the version is stable until a file is rewritten."""
+        prices, results = tmp_path / "prices.csv", tmp_path / "results.csv"
+        prices.write_text("a")
+        before = data_version(prices, results)
+
+        assert data_version(prices, results) == before
+        results.write_text("b")
+        after = data_version(prices, results)
+        assert after != before
+        prices.write_text("aa")
+        assert data_version(prices, results) != after
+
+
+class TestStamps:
+    """Tests for stamp read/write helpers."""
+
+    def test_roundtrip(self, tmp_path: Path) -> None:
+        """Test writing and reading a stamp."""
+        artifact = tmp_path / "results.csv"
+        artifact.write_text("rank\n")
+        write_stamp(artifact, "abc", rows=3)
+        assert stamp_path(artifact).exists()
+        assert read_stamp(artifact) == {"fingerprint": "abc", "rows": 3}
+        assert is_fresh(artifact, "abc")
+        assert not is_fresh(artifact, "def")
+
+    def test_missing_artifact_is_stale(self, tmp_path: Path) -> None:
+        """Test that a stamp without its artifact is not fresh."""
+        artifact = tmp_path / "results.csv"
+        write_stamp(artifact, "abc")
+        assert not is_fresh(artifact, "abc")
+
+    def test_corrupt_stamp(self, tmp_path: Path) -> None:
+        """Test that an unreadable stamp is treated as missing."""
+        artifact = tmp_path / "results.csv"
+        stamp_path(artifact).write_text("{not json")
+        assert read_stamp(artifact) == {}
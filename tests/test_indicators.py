@@ -0,0 +1,105 @@
+"""Unit tests for indicators module."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.indicators import compute_indicators, get_indicators
+
+
+@pytest.fixture
+def noisy_prices_df(sample_prices_df: pd.DataFrame) -> pd.DataFrame:
+    """Sample prices with deterministic noise so indicators are non-trivial."""
+    rng = np.random.default_rng(5)
+    df = sample_prices_df.copy()
+    df["price"] = df["price"] * (1 + rng.normal(0, 0.03, len(df)))
+    df["high"] = df["price"] * 1.02
+    df["low"] = df["price"] * 0.97
+    return df.sample(frac=1, random_state=2)  # shuffled on purpose
+
+
+def _coin(df: pd.DataFrame, coin_id: str) -> pd.DataFrame:
+    return df[df["coin_id"] == coin_id].sort_values("date").reset_index(drop=True)
+
+
+class TestComputeIndicators:
+    """Tests for compute_indicators function."""
+
+    def test_matches_single_coin_reference(self, noisy_prices_df: pd.DataFrame) -> None:
+        """Test grouped results against a straightforward per-coin computation."""
+        out = _coin(compute_indicators(noisy_prices_df), "coin-b")
+        coin = _coin(noisy_prices_df, "coin-b")
+        price = coin["price"]
+
+        np.testing.assert_allclose(out["sma_20"], price.rolling(20).mean())
+        np.testing.assert_allclose(out["ema_12"], price.ewm(span=12, adjust=False).mean())
+        mid, std = price.rolling(20).mean(), price.rolling(20).std(ddof=0)
+        np.testing.assert_allclose(out["bb_upper_20"], mid + 2 * std)
+        np.testing.assert_allclose(out["volatility_30"], price.pct_change().rolling(30).std())
+
+        delta = price.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+        loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+        np.testing.assert_allclose(out["rsi_14"], 100 - 100 / (1 + gain / loss))
+
+        prev = price.shift()
+        true_range = pd.concat([
+            coin["high"] - coin["low"],
+            (coin["high"] - prev).abs(),
+            (coin["low"] - prev).abs(),
+        ], axis=1).max(axis=1)
+        np.testing.assert_allclose(
+            out["atr_14"], true_range.ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+        )
+
+    def test_windows_do_not_cross_coins(self, noisy_prices_df: pd.DataFrame) -> None:
+        """Test that each coin starts with NaN warm-up values."""
+        out = compute_indicators(noisy_prices_df)
+        firsts = out.groupby("coin_id").head(19)
+        assert firsts["sma_20"].isna().all()
+
+    def test_rsi_bounds(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test RSI stays in [0, 100], including strictly rising stretches."""
+        rsi = compute_indicators(sample_prices_df, {"rsi": [14]})["rsi_14"].dropna()
+        assert rsi.between(0, 100).all()
+        assert (rsi == 100).any()
+
+    def test_custom_spec(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that only the requested indicators are produced."""
+        out = compute_indicators(sample_prices_df, {"sma": [5]})
+        assert list(out.columns) == ["coin_id", "date", "sma_5"]
+
+    def test_atr_needs_high_low(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that ATR is skipped when high/low are missing."""
+        out = compute_indicators(sample_prices_df.drop(columns=["high", "low"]), {"atr": [14]})
+        assert "atr_14" not in out.columns
+
+    def test_unknown_indicator(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test ValueError for unknown indicator names."""
+        with pytest.raises(ValueError):
+            compute_indicators(sample_prices_df, {"macd": [12]})
+
+    def test_empty_input(self, empty_prices_df: pd.DataFrame) -> None:
+        """Test with an empty frame."""
+        assert compute_indicators(empty_prices_df).empty
+
+
+class TestGetIndicators:
+    """Tests for the indicator cache."""
+
+    def test_cached_until_inputs_change(
+        self, tmp_path: Path, sample_prices_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the cache is reused and invalidated by a new spec."""
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", sample_prices_csv)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "missing.db")
+        path = tmp_path / "indicators.pkl"
+
+        first = get_indicators(path=path)
+        monkeypatch.setattr("src.indicators.compute_indicators", None)
+        pd.testing.assert_frame_equal(get_indicators(path=path), first)
+
+        with pytest.raises(TypeError):
+            get_indicators(spec={"sma": [5]}, path=path)
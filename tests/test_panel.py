@@ -0,0 +1,192 @@
+"""Unit tests for panel module."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analyzer import rank_by_drop, summarize_coins
+from src.panel import (
+    build_panel,
+    get_panel,
+    load_panel,
+    merge_panels,
+    rank_panel,
+    save_panel,
+    summarize_panel,
+)
+
+
+@pytest.fixture
+def gappy_prices_df(sample_prices_df: pd.DataFrame) -> pd.DataFrame:
+    """Sample prices with a few missing days for one coin."""
+    missing = (sample_prices_df["coin_id"] == "coin-c") & (
+        sample_prices_df["date"].dt.day.isin([5, 6, 7])
+    )
+    return sample_prices_df[~missing].reset_index(drop=True)
+
+
+class TestBuildPanel:
+    """Tests for build_panel function."""
+
+    def test_shape_and_alignment(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that the panel has one row per coin and one column per day."""
+        panel = build_panel(sample_prices_df)
+        assert panel.shape == (4, 60)
+        assert list(panel.coins) == ["coin-a", "coin-b", "coin-c", "coin-d"]
+        row = panel.coin_index("coin-a")
+        assert panel.price[row, panel.date_index("2025-01-21")] == 250.0
+
+    def test_missing_days_are_nan(self, gappy_prices_df: pd.DataFrame) -> None:
+        """Test that gaps become NaN instead of shifting columns."""
+        panel = build_panel(gappy_prices_df)
+        row = panel.coin_index("coin-c")
+        assert np.isnan(panel.price[row, panel.date_index("2025-01-05")])
+        assert not np.isnan(panel.price[row, panel.date_index("2025-01-08")])
+
+    def test_intraday_rows_are_aggregated(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that several rows of one coin on one day combine per field."""
+        day = sample_prices_df[(sample_prices_df["coin_id"] == "coin-a")
+                               & (sample_prices_df["date"] == "2025-01-21")]
+        intraday = pd.concat([
+            day.assign(date=day["date"] + pd.Timedelta(hours=18), price=240.0, high=260.0,
+                       low=230.0, volume=5.0),
+            day.assign(date=day["date"] + pd.Timedelta(hours=6), price=300.0, high=320.0,
+                       low=150.0, volume=7.0),
+        ])
+        panel = build_panel(pd.concat([sample_prices_df, intraday]))
+        row, col = panel.coin_index("coin-a"), panel.date_index("2025-01-21")
+
+        assert panel.shape == (4, 60)
+        assert panel.price[row, col] == 240.0
+        assert panel.fields["high"][row, col] == max(320.0, day["high"].iloc[0])
+        assert panel.fields["low"][row, col] == min(150.0, day["low"].iloc[0])
+        assert panel.fields["volume"][row, col] == day["volume"].iloc[0] + 12.0
+
+    def test_empty_frame(self, empty_prices_df: pd.DataFrame) -> None:
+        """Test building from an empty frame."""
+        panel = build_panel(empty_prices_df)
+        assert panel.shape == (0, 0)
+
+    def test_to_frame_roundtrip(self, gappy_prices_df: pd.DataFrame) -> None:
+        """Test converting back to the long format."""
+        frame = build_panel(gappy_prices_df).to_frame()
+        assert len(frame) == len(gappy_prices_df)
+        pd.testing.assert_frame_equal(
+            rank_by_drop(frame), rank_by_drop(gappy_prices_df), check_dtype=False
+        )
+
+    def test_unknown_coin(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test KeyError for coins outside the panel."""
+        with pytest.raises(KeyError):
+            build_panel(sample_prices_df).coin_index("nonexistent")
+
+
+class TestSummarizePanel:
+    """Tests for panel summaries and ranking."""
+
+    def test_matches_long_summary(self, gappy_prices_df: pd.DataFrame) -> None:
+        """Test that the panel summary matches summarize_coins."""
+        expected = summarize_coins(gappy_prices_df).sort_values("coin_id")
+        actual = summarize_panel(build_panel(gappy_prices_df))
+        pd.testing.assert_frame_equal(
+            actual.reset_index(drop=True), expected.reset_index(drop=True),
+            check_dtype=False,
+        )
+
+    def test_rank_matches(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that rank_panel matches rank_by_drop."""
+        pd.testing.assert_frame_equal(
+            rank_panel(build_panel(sample_prices_df)),
+            rank_by_drop(sample_prices_df),
+            check_dtype=False,
+        )
+
+
+class TestPanelStorage:
+    """Tests for saving, loading and incremental updates."""
+
+    def test_save_load_roundtrip(
+        self, tmp_path: Path, gappy_prices_df: pd.DataFrame
+    ) -> None:
+        """Test that a saved panel loads back identically."""
+        panel = build_panel(gappy_prices_df)
+        path = save_panel(panel, tmp_path / "panel.npz")
+        loaded = load_panel(path)
+        np.testing.assert_array_equal(loaded.coins, panel.coins)
+        np.testing.assert_array_equal(loaded.dates, panel.dates)
+        np.testing.assert_array_equal(loaded.price, panel.price)
+
+    def test_merge_appends_days_and_coins(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test merging a panel of newer days and a new coin."""
+        cutoff = pd.Timestamp("2025-02-15")
+        old = sample_prices_df[sample_prices_df["date"] < cutoff]
+        new = sample_prices_df[sample_prices_df["date"] >= cutoff].copy()
+        extra = new[new["coin_id"] == "coin-a"].assign(coin_id="coin-e", coin_name="E")
+
+        merged = merge_panels(build_panel(old), build_panel(pd.concat([new, extra])))
+        full = build_panel(pd.concat([sample_prices_df, extra]))
+        assert merged.shape == full.shape
+        for coin in full.coins:
+            np.testing.assert_array_equal(
+                merged.price[merged.coin_index(coin)], full.price[full.coin_index(coin)]
+            )
+
+    def test_get_panel_caches_and_extends(
+        self, tmp_path: Path, sample_prices_df: pd.DataFrame,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that get_panel reuses the cache and extends it with new days."""
+        csv_path = tmp_path / "prices.csv"
+        cutoff = pd.Timestamp("2025-02-15")
+        sample_prices_df[sample_prices_df["date"] < cutoff].to_csv(csv_path, index=False)
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", csv_path)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "missing.db")
+        panel_path = tmp_path / "panel.npz"
+
+        first = get_panel(path=panel_path)
+        assert first.shape == (4, 45)
+
+        monkeypatch.setattr("src.panel.build_panel", _fail_on_full_rebuild(45 * 4))
+        assert get_panel(path=panel_path).shape == (4, 45)
+
+        sample_prices_df[sample_prices_df["date"] >= cutoff].to_csv(
+            csv_path, mode="a", header=False, index=False
+        )
+        extended = get_panel(path=panel_path)
+        assert extended.shape == (4, 60)
+
+    def test_get_panel_rebuilds_revised_prices(
+        self, tmp_path: Path, sample_prices_df: pd.DataFrame,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that a revised cached price plus a new day is not merged stale."""
+        csv_path = tmp_path / "prices.csv"
+        cutoff = pd.Timestamp("2025-02-15")
+        old = sample_prices_df[sample_prices_df["date"] < cutoff]
+        old.to_csv(csv_path, index=False)
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", csv_path)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "missing.db")
+        panel_path = tmp_path / "panel.npz"
+        get_panel(path=panel_path)
+
+        revised = old.copy()
+        revised.loc[revised["date"] == "2025-01-03", "price"] *= 10
+        new_day = sample_prices_df[sample_prices_df["date"] == cutoff]
+        pd.concat([revised, new_day]).to_csv(csv_path, index=False)
+        panel = get_panel(path=panel_path)
+
+        expected = build_panel(pd.concat([revised, new_day]))
+        np.testing.assert_array_equal(panel.price, expected.price)
+
+
+def _fail_on_full_rebuild(max_rows: int):
+    """Wrap build_panel so that pivoting the whole store fails the test."""
+    original = build_panel
+
+    def wrapper(df: pd.DataFrame, *args, **kwargs):
+        assert len(df) < max_rows, "expected an incremental update"
+        return original(df, *args, **kwargs)
+
+    return wrapper
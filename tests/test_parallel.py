@@ -0,0 +1,74 @@
+"""Unit tests for parallel module."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analyzer import rank_by_drop
+from src.parallel import plan_shards, rank_parallel
+
+
+class TestPlanShards:
+    """Tests for plan_shards function."""
+
+    def test_never_splits_a_coin(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that shard boundaries fall between coins."""
+        df = sample_prices_df.sort_values(["coin_id", "date"], ignore_index=True)
+        codes = pd.factorize(df["coin_id"])[0]
+        shards = plan_shards(df, codes, 3)
+        assert shards[0].start == 0
+        assert shards[-1].stop == len(df)
+        for shard in shards:
+            assert set(df["coin_id"].iloc[shard.start:shard.stop]) == set(shard.coins)
+        assert sum(len(shard.coins) for shard in shards) == 4
+
+    def test_more_shards_than_coins(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that excess shards collapse to one per coin."""
+        df = sample_prices_df.sort_values(["coin_id", "date"], ignore_index=True)
+        shards = plan_shards(df, pd.factorize(df["coin_id"])[0], 16)
+        assert len(shards) == 4
+
+
+class TestRankParallel:
+    """Tests for rank_parallel function."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_matches_serial(self, sample_prices_df: pd.DataFrame, workers: int) -> None:
+        """Test that sharded analysis equals the serial ranking."""
+        expected = rank_by_drop(sample_prices_df, drawdowns=True)
+        actual = rank_parallel(sample_prices_df, workers=workers)
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_renamed_coin_matches_serial(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that a coin renamed mid-history gets the name at its peak."""
+        df = sample_prices_df.copy()
+        early = (df["coin_id"] == "coin-a") & (df["date"] < "2025-01-05")
+        df.loc[early, ["coin_name", "symbol"]] = ["Old A", "olda"]
+        df.loc[df["coin_id"] == "coin-b", "symbol"] = None
+
+        expected = rank_by_drop(df, drawdowns=True)
+        actual = rank_parallel(df, workers=1)
+
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+        assert "Old A" not in set(actual["coin_name"])
+
+    def test_empty_input(self, empty_prices_df: pd.DataFrame) -> None:
+        """Test with an empty frame."""
+        assert rank_parallel(empty_prices_df, workers=2).empty
+
+    @pytest.mark.usefixtures("isolated_outputs")
+    def test_run_with_workers(
+        self, sample_prices_csv: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test run(workers=...) exports the same results as a serial run."""
+        from src.analyzer import run
+
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", sample_prices_csv)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "missing.db")
+
+        serial = run(force=True)
+        sharded = run(force=True, workers=2)
+        pd.testing.assert_frame_equal(sharded, serial, check_dtype=False)
+        assert np.all(sharded["coin_id"] == serial["coin_id"])
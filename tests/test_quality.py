@@ -0,0 +1,192 @@
+"""Unit tests for quality module."""
+
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analyzer import rank_by_drop
+from src.quality import CHECKS, check_quality, drop_outliers, quality_report, quarantine
+
+
+def _coin(coin_id: str, closes: list[float], **columns) -> pd.DataFrame:
+    """Daily rows for one coin starting 2025-01-01, high/low around the close."""
+    closes = np.asarray(closes, dtype=float)
+    frame = pd.DataFrame({
+        "date": pd.date_range("2025-01-01", periods=len(closes)),
+        "coin_id": coin_id,
+        "symbol": coin_id,
+        "price": closes,
+        "high": closes * 1.01,
+        "low": closes * 0.99,
+        "volume": 1000.0,
+    })
+    return frame.assign(**columns)
+
+
+def _flagged_days(flags: pd.DataFrame, df: pd.DataFrame, check: str) -> list[int]:
+    """Day numbers (0-based) of the rows failing a check."""
+    start = pd.Timestamp("2025-01-01")
+    return sorted((df.loc[flags[check], "date"] - start).dt.days.tolist())
+
+
+class TestCheckQuality:
+    """Tests for check_quality function."""
+
+    def test_clean_data_has_no_flags(self) -> None:
+        """Test that a smooth series passes every check."""
+        df = _coin("A", np.linspace(10, 20, 40))
+        flags = check_quality(df)
+
+        assert list(flags.columns) == [*CHECKS, "flagged", "outlier"]
+        assert not flags.to_numpy().any()
+
+    def test_spike_needs_neighbours_on_both_sides(self) -> None:
+        """Test that a one-day spike is flagged but a final-day crash is not."""
+        closes = [10.0] * 20
+        closes[8] = 100.0  # fat-finger print
+        closes[-1] = 2.0  # genuine crash on the last day
+        df = _coin("A", closes)
+        df.loc[8, ["high", "low"]] = [101.0, 99.0]
+        flags = check_quality(df)
+
+        assert _flagged_days(flags, df, "spike") == [8]
+        assert flags.loc[8, "outlier"]
+
+    def test_candle_checks(self) -> None:
+        """Test non-positive prices and inconsistent high/low/close."""
+        df = _coin("A", [5.0] * 10 + [6.0] * 10)
+        df.loc[3, "price"] = 0.0
+        df.loc[5, ["high", "low"]] = [4.0, 6.0]
+        df.loc[7, "price"] = 5.1  # above the 5.05 high
+        flags = check_quality(df)
+
+        assert _flagged_days(flags, df, "non_positive") == [3]
+        assert _flagged_days(flags, df, "high_below_low") == [5]
+        assert 7 in _flagged_days(flags, df, "close_outside_range")
+
+    def test_runs_do_not_cross_coins(self) -> None:
+        """Test stale closes and zero-volume streaks stop at coin boundaries."""
+        a = _coin("A", np.r_[np.linspace(1, 2, 10), [3.0] * 3])
+        b = _coin("B", np.r_[[3.0] * 3, np.linspace(4, 5, 10)])
+        a.loc[11:, "volume"] = 0.0
+        b.loc[:1, "volume"] = 0.0
+        df = pd.concat([a, b], ignore_index=True)
+        flags = check_quality(df)
+
+        assert not flags["stale_close"].any()
+        assert not flags["zero_volume_streak"].any()
+
+    def test_runs_flagged(self) -> None:
+        """Test long runs of identical closes and zero volume."""
+        df = _coin("A", np.r_[np.linspace(1, 2, 5), [3.0] * 6, np.linspace(4, 5, 5)])
+        df.loc[12:14, "volume"] = 0.0
+        flags = check_quality(df)
+
+        assert _flagged_days(flags, df, "stale_close") == [6, 7, 8, 9, 10]
+        assert _flagged_days(flags, df, "zero_volume_streak") == [12, 13, 14]
+        assert not flags["outlier"].any()
+
+    def test_duplicates_and_input_order(self) -> None:
+        """Test that flags align with an unsorted, duplicated input."""
+        df = _coin("A", np.linspace(1, 2, 10))
+        df = pd.concat([df, df.iloc[[4]]]).iloc[::-1]
+        flags = check_quality(df)
+
+        assert flags.index.equals(df.index)
+        assert flags["duplicate"].sum() == 1
+
+    def test_missing_optional_columns(self) -> None:
+        """Test frames without high, low or volume."""
+        df = _coin("A", np.linspace(1, 2, 10))[["date", "coin_id", "price"]]
+        assert not check_quality(df)["flagged"].any()
+
+    def test_empty(self, empty_prices_df: pd.DataFrame) -> None:
+        """Test an empty frame."""
+        assert check_quality(empty_prices_df).empty
+        assert quality_report(empty_prices_df).empty
+
+
+class TestQualityReport:
+    """Tests for quality_report and drop_outliers."""
+
+    def test_counts_per_coin(self) -> None:
+        """Test per-coin counts, worst coin first."""
+        bad = _coin("BAD", np.r_[np.linspace(10, 11, 9), [100.0], np.linspace(11, 12, 10)])
+        df = pd.concat([_coin("GOOD", np.linspace(1, 2, 20)), bad], ignore_index=True)
+        report = quality_report(df).set_index("coin_id")
+
+        assert report.index[0] == "BAD"
+        assert report.loc["BAD", "spike"] == 1
+        assert report.loc["BAD", "flagged_pct"] == pytest.approx(5.0)
+        assert report.loc["GOOD", "flagged_rows"] == 0
+
+    def test_ignore_outliers_fixes_peak(self) -> None:
+        """Test that a spiked peak no longer drives the ranking."""
+        closes = np.r_[np.linspace(10, 12, 30), np.linspace(12, 6, 30)]
+        closes[5] = 120.0
+        df = _coin("A", closes)
+
+        assert len(drop_outliers(df)) == len(df) - 1
+        raw = rank_by_drop(df).iloc[0]
+        clean = rank_by_drop(df, ignore_outliers=True).iloc[0]
+        assert raw["peak_price"] == pytest.approx(120.0)
+        assert clean["peak_price"] == pytest.approx(12.0)
+        assert clean["pct_change"] == pytest.approx(-50.0)
+
+
+class TestQuarantine:
+    """Tests for quarantine function."""
+
+    def test_moves_outliers_from_both_stores(self, tmp_path: Path) -> None:
+        """Test that outlier rows leave the CSV and SQLite stores."""
+        df = _coin("A", [10.0] * 5 + [0.0] + [10.0] * 3 + [90.0] + [10.0] * 5)
+        df["date"] = df["date"].dt.strftime("%Y-%m-%d")
+        csv_path, db_path = tmp_path / "prices.csv", tmp_path / "prices.db"
+        quarantine_path = tmp_path / "quarantine.csv"
+        df.to_csv(csv_path, index=False)
+        with sqlite3.connect(db_path) as conn:
+            df.to_sql("prices", conn, index=False)
+
+        assert quarantine(csv_path, db_path, quarantine_path) == 4
+        assert len(pd.read_csv(csv_path)) == len(df) - 2
+        with sqlite3.connect(db_path) as conn:
+            remaining = conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+        assert remaining == len(df) - 2
+
+        moved = pd.read_csv(quarantine_path)
+        assert len(moved) == 4
+        assert set(moved["reason"]) == {"non_positive", "spike"}
+        assert quarantine(csv_path, db_path, quarantine_path) == 0
+        assert sorted(f.name for f in tmp_path.iterdir()) == [
+            "prices.csv", "prices.db", "quarantine.csv"]
+
+    def test_reasons_list_every_failed_check(self, tmp_path: Path) -> None:
+        """Test that a row failing several checks records all of them."""
+        df = _coin("A", [10.0] * 5 + [0.0] + [10.0] * 5)
+        df = pd.concat([df, df.iloc[[5]]])
+        csv_path = tmp_path / "prices.csv"
+        df.to_csv(csv_path, index=False)
+
+        assert quarantine(csv_path, tmp_path / "missing.db", tmp_path / "quarantine.csv") == 2
+        moved = pd.read_csv(tmp_path / "quarantine.csv")
+        assert sorted(moved["reason"]) == ["non_positive", "non_positive,duplicate"]
+
+    def test_failed_rewrite_keeps_store(self, tmp_path: Path,
+                                        monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the CSV is untouched and no temp file is left on failure."""
+        csv_path = tmp_path / "prices.csv"
+        _coin("A", [10.0] * 5 + [0.0] + [10.0] * 5).to_csv(csv_path, index=False)
+        original = csv_path.read_bytes()
+
+        def fail(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("src.quality.os.replace", fail)
+        with pytest.raises(OSError, match="disk full"):
+            quarantine(csv_path, tmp_path / "missing.db", tmp_path / "quarantine.csv")
+
+        assert csv_path.read_bytes() == original
+        assert not list(tmp_path.glob("*.tmp"))
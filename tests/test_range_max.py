@@ -0,0 +1,123 @@
+"""Unit tests for range_max module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analyzer import rank_by_drop
+from src.panel import build_panel
+from src.range_max import RangeMaxIndex, rank_by_window, resolve_window
+
+
+@pytest.fixture
+def index(sample_prices_df: pd.DataFrame) -> RangeMaxIndex:
+    """Range-max index over the sample panel."""
+    return RangeMaxIndex(build_panel(sample_prices_df))
+
+
+def _brute_force_peak(df: pd.DataFrame, coin_id: str, start: str, end: str) -> float:
+    """Reference peak by scanning the rows."""
+    rows = df[(df["coin_id"] == coin_id) & (df["date"] >= start) & (df["date"] <= end)]
+    return float(rows["price"].max())
+
+
+class TestPeakInWindow:
+    """Tests for RangeMaxIndex.peak_in_window."""
+
+    def test_full_history_matches_peak(self, index: RangeMaxIndex) -> None:
+        """Test that the unbounded window finds the overall peak."""
+        peak = index.peak_in_window("coin-a")
+        assert peak == {"price": 250.0, "date": "2025-01-21"}
+
+    @pytest.mark.parametrize("start,end", [
+        ("2025-01-01", "2025-01-01"),
+        ("2025-01-03", "2025-01-17"),
+        ("2025-02-01", "2025-03-01"),
+        ("2025-01-10", "2025-02-28"),
+    ])
+    def test_matches_brute_force(
+        self, index: RangeMaxIndex, sample_prices_df: pd.DataFrame, start: str, end: str
+    ) -> None:
+        """Test arbitrary windows against a direct scan."""
+        for coin in ["coin-a", "coin-b", "coin-c", "coin-d"]:
+            peak = index.peak_in_window(coin, start, end)
+            assert peak["price"] == _brute_force_peak(sample_prices_df, coin, start, end)
+
+    def test_earliest_day_wins_ties(self) -> None:
+        """Test that equal peaks resolve to the earliest date."""
+        df = pd.DataFrame({
+            "date": pd.date_range("2025-01-01", periods=5),
+            "coin_id": "flat",
+            "price": [1.0, 3.0, 2.0, 3.0, 1.0],
+        })
+        index = RangeMaxIndex(build_panel(df))
+        assert index.peak_in_window("flat")["date"] == "2025-01-02"
+        assert index.peak_in_window("flat", "2025-01-03")["date"] == "2025-01-04"
+
+    def test_skips_missing_days(self) -> None:
+        """Test that NaN gaps never become the peak."""
+        df = pd.DataFrame({
+            "date": pd.to_datetime(["2025-01-01", "2025-01-05"]),
+            "coin_id": "gappy",
+            "price": [2.0, 1.0],
+        })
+        index = RangeMaxIndex(build_panel(df))
+        assert index.peak_in_window("gappy", "2025-01-02", "2025-01-04") == {}
+        assert index.peak_in_window("gappy", "2025-01-02")["price"] == 1.0
+
+    def test_unknown_coin_and_empty_window(self, index: RangeMaxIndex) -> None:
+        """Test empty results for unknown coins and windows outside the data."""
+        assert index.peak_in_window("nonexistent") == {}
+        assert index.peak_in_window("coin-a", "2024-01-01", "2024-12-31") == {}
+
+
+class TestWindowPeaks:
+    """Tests for vectorized window queries and ranking."""
+
+    def test_window_peaks_all_coins(
+        self, index: RangeMaxIndex, sample_prices_df: pd.DataFrame
+    ) -> None:
+        """Test that every coin is answered in one query."""
+        peaks = index.window_peaks("2025-02-01", "2025-03-01")
+        assert len(peaks) == 4
+        for _, row in peaks.iterrows():
+            expected = _brute_force_peak(sample_prices_df, row["coin_id"],
+                                         "2025-02-01", "2025-03-01")
+            assert row["peak_price"] == expected
+
+    def test_all_window_matches_rank_by_drop(
+        self, index: RangeMaxIndex, sample_prices_df: pd.DataFrame
+    ) -> None:
+        """Test that the full-history window reproduces the live ranking."""
+        pd.testing.assert_frame_equal(
+            rank_by_window(index, "all"), rank_by_drop(sample_prices_df), check_dtype=False
+        )
+
+    def test_short_window_shrinks_drops(self, index: RangeMaxIndex) -> None:
+        """Test that a trailing window measures from a lower, recent peak."""
+        full = rank_by_window(index, "all").set_index("coin_id")
+        recent = rank_by_window(index, "10d").set_index("coin_id")
+        for coin in recent.index:
+            assert recent.loc[coin, "pct_change"] >= full.loc[coin, "pct_change"]
+        assert np.all(recent["peak_date"] >= "2025-02-20")
+
+
+class TestResolveWindow:
+    """Tests for resolve_window function."""
+
+    def test_named_windows(self) -> None:
+        """Test the named window shortcuts."""
+        assert resolve_window("all", "2025-06-30") == (None, pd.Timestamp("2025-06-30"))
+        assert resolve_window("ytd", "2025-06-30")[0] == pd.Timestamp("2025-01-01")
+        assert resolve_window("90d", "2025-06-30")[0] == pd.Timestamp("2025-04-02")
+
+    def test_explicit_range(self) -> None:
+        """Test an explicit (start, end) tuple."""
+        start, end = resolve_window(("2025-02-01", "2025-03-01"), "2025-06-30")
+        assert start == pd.Timestamp("2025-02-01")
+        assert end == pd.Timestamp("2025-03-01")
+
+    def test_invalid_window(self) -> None:
+        """Test ValueError for unknown windows."""
+        with pytest.raises(ValueError):
+            resolve_window("fortnight", "2025-06-30")
@@ -0,0 +1,100 @@
+"""Unit tests for rank_history module."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analyzer import rank_by_drop
+from src.panel import Panel, build_panel
+from src.rank_history import (
+    compute_rank_history,
+    get_rank_history,
+    load_rank_history,
+    save_rank_history,
+)
+
+
+class TestComputeRankHistory:
+    """Tests for compute_rank_history function."""
+
+    @pytest.mark.parametrize("day", ["2025-01-30", "2025-02-10", "2025-03-01"])
+    def test_matches_as_of_ranking(self, sample_prices_df: pd.DataFrame, day: str) -> None:
+        """Test that each day equals rank_by_drop as of that day."""
+        history = compute_rank_history(build_panel(sample_prices_df))
+        expected = rank_by_drop(sample_prices_df, top_n=100, as_of=day)
+
+        col = int((np.datetime64(day) - history.dates[0]).astype(int))
+        for rank, row in expected.iterrows():
+            coin_row = int(np.flatnonzero(history.coins == row["coin_id"])[0])
+            assert history.rank[coin_row, col] == rank
+            assert history.drawdown[coin_row, col] == pytest.approx(row["pct_change"], abs=0.01)
+        assert np.count_nonzero(history.rank[:, col]) == len(expected)
+
+    def test_unranked_before_min_days(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that coins are unranked until they have enough data."""
+        history = compute_rank_history(build_panel(sample_prices_df), min_data_days=30)
+        assert not history.rank[:, :29].any()
+
+    def test_gaps_use_last_price(self) -> None:
+        """Test that days without a candle carry the last price forward."""
+        df = pd.DataFrame({
+            "date": pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-05"]),
+            "coin_id": "gappy",
+            "price": [10.0, 5.0, 8.0],
+        })
+        history = compute_rank_history(build_panel(df), min_data_days=1)
+        np.testing.assert_allclose(history.drawdown[0], [0, -50, -50, -50, -20])
+
+    def test_coin_series(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test extracting a single coin's trajectory."""
+        history = compute_rank_history(build_panel(sample_prices_df))
+        series = history.coin_series("coin-d")
+        assert len(series) == 60
+        assert series["rank"].iloc[-1] == 1
+        assert series["rank"].iloc[:29].isna().all()
+        assert history.coin_series("nonexistent").empty
+
+    def test_ranks_past_int16(self) -> None:
+        """Test that more coins than int16 can count are ranked without wrapping."""
+        n_coins = np.iinfo(np.int16).max + 10
+        price = np.tile([2.0, 1.0], (n_coins, 1)) + np.arange(n_coins)[:, None] * 1e-3
+        panel = Panel(
+            coins=np.array([f"c{i}" for i in range(n_coins)]),
+            names=np.array([f"c{i}" for i in range(n_coins)]),
+            symbols=np.array([f"c{i}" for i in range(n_coins)]),
+            dates=np.arange("2025-01-01", "2025-01-03", dtype="datetime64[D]"),
+            fields={"price": price},
+        )
+        history = compute_rank_history(panel, min_data_days=1)
+
+        assert history.rank.dtype == np.int32
+        assert history.rank[:, 1].max() == n_coins
+        assert sorted(history.rank[:, 1]) == list(range(1, n_coins + 1))
+
+
+class TestRankHistoryStorage:
+    """Tests for saving and caching rank histories."""
+
+    def test_compact_roundtrip(self, tmp_path: Path, sample_prices_df: pd.DataFrame) -> None:
+        """Test that histories are stored with compact dtypes."""
+        history = compute_rank_history(build_panel(sample_prices_df))
+        loaded = load_rank_history(save_rank_history(history, tmp_path / "ranks.npz"))
+        assert loaded.rank.dtype == np.int16
+        assert loaded.drawdown.dtype == np.float32
+        np.testing.assert_array_equal(loaded.rank, history.rank)
+
+    def test_get_rank_history_caches(
+        self, tmp_path: Path, sample_prices_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that an unchanged store reuses the saved history."""
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", sample_prices_csv)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "missing.db")
+        monkeypatch.setattr("src.panel.PANEL_PATH", tmp_path / "panel.npz")
+        path = tmp_path / "ranks.npz"
+
+        first = get_rank_history(path=path)
+        monkeypatch.setattr("src.rank_history.compute_rank_history", None)
+        second = get_rank_history(path=path)
+        np.testing.assert_array_equal(first.rank, second.rank)
@@ -0,0 +1,144 @@
+"""Unit tests for simulation module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.panel import build_panel
+from src.simulation import (
+    INTERVAL_COLUMNS,
+    bootstrap_paths,
+    coin_log_returns,
+    path_statistics,
+    simulate_drawdowns,
+    summary_intervals,
+)
+
+
+@pytest.fixture
+def random_panel():
+    """Random-walk panel with one short-history coin."""
+    rng = np.random.default_rng(2)
+    frames = []
+    for coin, days in [("A", 120), ("B", 120), ("C", 90), ("SHORT", 10)]:
+        frames.append(pd.DataFrame({
+            "date": pd.date_range("2025-01-01", periods=days),
+            "coin_id": coin,
+            "price": 10 * np.exp(np.cumsum(rng.normal(0, 0.05, days))),
+        }))
+    return build_panel(pd.concat(frames, ignore_index=True))
+
+
+class TestCoinLogReturns:
+    """Tests for coin_log_returns function."""
+
+    def test_packs_observed_returns(self) -> None:
+        """Test that gaps drop returns and rows are left-aligned."""
+        df = pd.DataFrame({
+            "date": pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-04",
+                                    "2025-01-05", "2025-01-01", "2025-01-02"]),
+            "coin_id": ["A", "A", "A", "A", "B", "B"],
+            "price": [1.0, 2.0, 4.0, 2.0, 5.0, 5.0],
+        })
+        returns, lengths = coin_log_returns(build_panel(df))
+
+        assert lengths.tolist() == [2, 1]
+        np.testing.assert_allclose(returns[0], np.log([2.0, 0.5]))
+        np.testing.assert_allclose(returns[1], [0.0, np.nan])
+
+
+class TestBootstrapPaths:
+    """Tests for bootstrap_paths function."""
+
+    def test_blocks_are_circular_runs(self) -> None:
+        """Test that each block follows the original order, wrapping around."""
+        n = 7
+        returns = np.arange(n, dtype=float)[None, :]
+        seeds = np.random.SeedSequence(0).spawn(1)
+        paths = bootstrap_paths(returns, np.array([n]), seeds, n_paths=50, horizon=30,
+                                block_days=5)
+        steps = np.diff(paths[0], prepend=0, axis=1).round().astype(int)
+
+        assert paths.shape == (1, 50, 30)
+        within_block = steps.reshape(50, 6, 5)
+        assert ((np.diff(within_block, axis=2) % n) == 1).all()
+
+    def test_ragged_lengths(self) -> None:
+        """Test that padding beyond a coin's length is never sampled."""
+        returns = np.array([[0.1, 0.2, 0.3, 0.4], [0.5, np.nan, np.nan, np.nan]])
+        seeds = np.random.SeedSequence(1).spawn(2)
+        paths = bootstrap_paths(returns, np.array([4, 1]), seeds, 20, 12, 3)
+
+        assert np.isfinite(paths).all()
+        np.testing.assert_allclose(paths[1, :, -1], 12 * 0.5)
+
+
+class TestPathStatistics:
+    """Tests for path_statistics function."""
+
+    def test_drawdown_and_recovery(self) -> None:
+        """Test depth and recovery day on hand-built log paths."""
+        log_paths = np.log([[[1.2, 0.6, 0.9, 1.5, 2.0]],
+                            [[0.5, 0.5, 0.5, 0.5, 0.5]]])
+        max_drawdown, recovery_days = path_statistics(log_paths, np.log([1.4, 1.0]))
+
+        assert max_drawdown[0, 0] == pytest.approx(-0.5)
+        assert recovery_days[0, 0] == 4
+        assert max_drawdown[1, 0] == pytest.approx(-0.5)
+        assert recovery_days[1, 0] == 0  # already at its peak
+
+
+class TestSimulateDrawdowns:
+    """Tests for simulate_drawdowns function."""
+
+    def test_intervals(self, random_panel) -> None:
+        """Test output layout, ordering of bounds and skipped coins."""
+        result = simulate_drawdowns(random_panel, n_paths=200, horizon=60)
+
+        assert list(result.columns) == INTERVAL_COLUMNS
+        assert result["coin_id"].tolist() == ["A", "B", "C"]
+        assert (result["max_drawdown_lo"] <= result["max_drawdown_median"]).all()
+        assert (result["max_drawdown_median"] <= result["max_drawdown_hi"]).all()
+        assert (result["max_drawdown_hi"] <= 0).all()
+        assert result["recovery_prob_pct"].between(0, 100).all()
+
+    def test_reproducible_across_batches_and_workers(
+        self, random_panel, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that seeds, not batching or processes, determine results."""
+        expected = simulate_drawdowns(random_panel, n_paths=100, horizon=30, seed=7)
+        monkeypatch.setattr("src.simulation.MAX_BATCH_CELLS", 1)
+        pd.testing.assert_frame_equal(
+            simulate_drawdowns(random_panel, n_paths=100, horizon=30, seed=7), expected
+        )
+        pd.testing.assert_frame_equal(
+            simulate_drawdowns(random_panel, n_paths=100, horizon=30, seed=7, workers=2),
+            expected,
+        )
+        different = simulate_drawdowns(random_panel, n_paths=100, horizon=30, seed=8)
+        assert not different.equals(expected)
+
+    def test_no_eligible_coins(self, random_panel) -> None:
+        """Test an empty result when every coin has too little history."""
+        result = simulate_drawdowns(random_panel, min_observations=1000)
+        assert result.empty
+        assert list(result.columns) == INTERVAL_COLUMNS
+
+
+class TestSummaryIntervals:
+    """Tests for summary_intervals function."""
+
+    def test_brackets_point_estimates(self) -> None:
+        """Test that the intervals contain the point estimates."""
+        rng = np.random.default_rng(0)
+        results = pd.DataFrame({"pct_change": rng.uniform(-90, -10, 80)})
+        intervals = summary_intervals(results)
+
+        lo, hi = intervals["avg_drop_pct"]
+        assert lo < results["pct_change"].mean() < hi
+        lo, hi = intervals["median_drop_pct"]
+        assert lo <= results["pct_change"].median() <= hi
+
+    def test_empty(self) -> None:
+        """Test with no results."""
+        assert summary_intervals(pd.DataFrame()) == {}
@@ -0,0 +1,211 @@
+"""Unit tests for sketch module."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.panel import build_panel
+from src.sketch import (
+    QuantileSketch,
+    compute_sketches,
+    get_sketches,
+    rolling_volatility,
+)
+
+
+@pytest.fixture
+def values() -> np.ndarray:
+    """Mixed-sign values with gaps, zeros and one empty row."""
+    rng = np.random.default_rng(5)
+    values = rng.normal(-20, 40, (4, 800))
+    values[0, :300] = np.nan
+    values[1, ::7] = 0.0
+    values[3] = np.nan
+    return values
+
+
+def _within_accuracy(estimate: np.ndarray, exact: np.ndarray, alpha: float) -> bool:
+    """Check relative error (with a little slack for float rounding)."""
+    return bool(np.all(np.abs(estimate - exact) <= alpha * np.abs(exact) + 1e-9))
+
+
+class TestQuantileSketch:
+    """Tests for QuantileSketch."""
+
+    def test_quantiles_within_relative_accuracy(self, values: np.ndarray) -> None:
+        """Test every quantile against the exact lower-rank value."""
+        qs = [0.0, 0.01, 0.1, 0.5, 0.77, 0.99, 1.0]
+        sketch = QuantileSketch.from_values(values, np.arange(4), alpha=0.01)
+        estimate = sketch.quantiles(qs)
+        exact = np.nanquantile(values[:3], qs, axis=1, method="lower").T
+
+        assert _within_accuracy(estimate[:3], exact, 0.01)
+        assert np.isnan(estimate[3]).all()
+        np.testing.assert_allclose(estimate[:3, [0, -1]],
+                                   np.c_[np.nanmin(values[:3], 1), np.nanmax(values[:3], 1)])
+
+    def test_count_and_mean_are_exact(self, values: np.ndarray) -> None:
+        """Test that counts and means do not depend on the buckets."""
+        sketch = QuantileSketch.from_values(values, np.arange(4))
+        np.testing.assert_array_equal(sketch.count, (~np.isnan(values)).sum(axis=1))
+        np.testing.assert_allclose(sketch.mean()[:3], np.nanmean(values[:3], axis=1))
+        assert np.isnan(sketch.mean()[3])
+
+    def test_merge_equals_sketch_of_union(self, values: np.ndarray) -> None:
+        """Test that shards merged in any order match sketching all items."""
+        labels = np.arange(4)
+        whole = QuantileSketch.from_values(values, labels)
+        shards = [QuantileSketch.from_values(values[:, cols], labels)
+                  for cols in (slice(0, 100), slice(100, 550), slice(550, None))]
+
+        merged = shards[2].merge(shards[1]).merge(shards[0])
+        np.testing.assert_array_equal(merged.quantiles(), whole.quantiles())
+        np.testing.assert_array_equal(merged.count, whole.count)
+        np.testing.assert_array_equal(merged.low, whole.low)
+
+    def test_merge_new_labels(self, values: np.ndarray) -> None:
+        """Test incremental updates that add days to a sketch."""
+        early = QuantileSketch.from_values(values[:2], [1, 2])
+        late = QuantileSketch.from_values(values[2:3] * 1000, [3])
+        merged = early.merge(late)
+
+        assert list(merged.labels) == [1, 2, 3]
+        np.testing.assert_array_equal(merged.quantiles()[:2], early.quantiles())
+        np.testing.assert_array_equal(merged.quantiles()[2:], late.quantiles())
+
+    def test_merge_rejects_other_accuracy(self, values: np.ndarray) -> None:
+        """Test that sketches of different accuracy cannot be merged."""
+        a = QuantileSketch.from_values(values, np.arange(4), alpha=0.01)
+        b = QuantileSketch.from_values(values, np.arange(4), alpha=0.02)
+        with pytest.raises(ValueError):
+            a.merge(b)
+
+    def test_histogram(self, values: np.ndarray) -> None:
+        """Test bin counts against numpy.histogram on bucket-safe edges."""
+        edges = np.array([-200.0, -50.0, -0.5, 0.5, 50.0, 200.0])
+        sketch = QuantileSketch.from_values(values, np.arange(4), alpha=0.001)
+        expected = np.array([np.histogram(row[~np.isnan(row)], edges)[0] for row in values])
+
+        np.testing.assert_allclose(sketch.histogram(edges), expected, atol=2)
+        assert sketch.histogram(edges)[1, 2] == expected[1, 2]
+
+    def test_collapse(self, values: np.ndarray) -> None:
+        """Test merging all labels into one sketch."""
+        sketch = QuantileSketch.from_values(values, np.arange(4)).collapse()
+        flat = values[~np.isnan(values)]
+
+        assert sketch.count[0] == flat.size
+        assert _within_accuracy(sketch.quantiles([0.5])[0],
+                                np.quantile(flat, [0.5], method="lower"), 0.01)
+
+
+class TestRollingVolatility:
+    """Tests for rolling_volatility function."""
+
+    def test_matches_pandas(self) -> None:
+        """Test against pandas rolling std with min_periods."""
+        rng = np.random.default_rng(2)
+        returns = rng.normal(0, 0.05, (3, 90))
+        returns[rng.random(returns.shape) < 0.2] = np.nan
+        expected = pd.DataFrame(returns.T).rolling(10, min_periods=5).std().to_numpy().T
+
+        np.testing.assert_allclose(rolling_volatility(returns, 10), expected,
+                                   rtol=1e-8, atol=1e-12, equal_nan=True)
+
+
+class TestComputeSketches:
+    """Tests for compute_sketches and get_sketches."""
+
+    def test_daily_drawdown_percentiles(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test per-day drawdown sketches against the exact panel values."""
+        panel = build_panel(sample_prices_df)
+        sketches = compute_sketches(panel)
+        drawdown = sketches["drawdown_pct"]
+
+        price = panel.price
+        exact = (price / np.fmax.accumulate(price, axis=1) - 1) * 100
+        np.testing.assert_array_equal(drawdown.labels, panel.dates)
+        np.testing.assert_array_equal(drawdown.count, (~np.isnan(price)).sum(axis=0))
+        assert _within_accuracy(drawdown.quantiles([0.5])[:, 0],
+                                np.nanquantile(exact, 0.5, axis=0, method="lower"), 0.01)
+        assert set(sketches) == {"drawdown_pct", "volatility_pct", "volume"}
+
+    def test_cached_round_trip(self, tmp_path: Path, sample_prices_csv: Path,
+                               monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a fresh cache is loaded instead of recomputed."""
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", sample_prices_csv)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "missing.db")
+        monkeypatch.setattr("src.panel.PANEL_PATH", tmp_path / "panel.npz")
+        path = tmp_path / "sketches.npz"
+        first = get_sketches(path=path)
+
+        monkeypatch.setattr("src.sketch.compute_sketches", None)
+        second = get_sketches(path=path)
+        for name, sketch in first.items():
+            np.testing.assert_array_equal(second[name].quantiles(), sketch.quantiles())
+            assert second[name].alpha == sketch.alpha
+
+    def test_new_days_are_appended(self, tmp_path: Path, sample_prices_df: pd.DataFrame,
+                                   monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that only new days are sketched and the result matches a rebuild."""
+        csv_path = tmp_path / "prices.csv"
+        cutoff = pd.Timestamp("2025-02-15")
+        sample_prices_df[sample_prices_df["date"] < cutoff].to_csv(csv_path, index=False)
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", csv_path)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "missing.db")
+        monkeypatch.setattr("src.panel.PANEL_PATH", tmp_path / "panel.npz")
+        path = tmp_path / "sketches.npz"
+        get_sketches(path=path)
+
+        sample_prices_df[sample_prices_df["date"] >= cutoff].to_csv(
+            csv_path, mode="a", header=False, index=False
+        )
+        starts = []
+
+        def recording(panel, alpha=0.01, start=0):
+            starts.append(start)
+            return compute_sketches(panel, alpha, start)
+
+        monkeypatch.setattr("src.sketch.compute_sketches", recording)
+        appended = get_sketches(path=path)
+        rebuilt = compute_sketches(build_panel(sample_prices_df))
+
+        assert starts == [45]
+        for name, sketch in rebuilt.items():
+            np.testing.assert_array_equal(appended[name].labels, sketch.labels)
+            np.testing.assert_array_equal(appended[name].count, sketch.count)
+            np.testing.assert_allclose(appended[name].quantiles(), sketch.quantiles(),
+                                       rtol=1e-8, equal_nan=True)
+
+    def test_revised_day_rebuilds(self, tmp_path: Path, sample_prices_df: pd.DataFrame,
+                                  monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a change inside the cached days is not appended onto."""
+        csv_path = tmp_path / "prices.csv"
+        sample_prices_df.to_csv(csv_path, index=False)
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", csv_path)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "missing.db")
+        monkeypatch.setattr("src.panel.PANEL_PATH", tmp_path / "panel.npz")
+        path = tmp_path / "sketches.npz"
+        get_sketches(path=path)
+
+        revised = sample_prices_df.copy()
+        revised.loc[revised["date"] == "2025-01-03", "price"] *= 10
+        revised.to_csv(csv_path, index=False)
+        sketches = get_sketches(path=path)
+
+        expected = compute_sketches(build_panel(revised))["drawdown_pct"]
+        np.testing.assert_array_equal(sketches["drawdown_pct"].quantiles(), expected.quantiles())
+
+    def test_prices_without_volume(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that a price-only store sketches everything but volume."""
+        panel = build_panel(sample_prices_df[["date", "coin_id", "coin_name", "symbol", "price"]])
+        sketches = compute_sketches(panel)
+
+        assert set(sketches) == {"drawdown_pct", "volatility_pct"}
+
+    def test_empty_panel(self, empty_prices_df: pd.DataFrame) -> None:
+        """Test an empty panel gives empty sketches."""
+        sketches = compute_sketches(build_panel(empty_prices_df))
+        assert sketches["volume"].to_frame().empty
@@ -0,0 +1,226 @@
+"""Unit tests for store module."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analyzer import rank_by_drop
+from src.data_fetcher import save_to_sqlite
+from src.store import COIN_HISTORY_SQL, PriceStore, load_store, shared_store
+
+
+class TestPriceStore:
+    """Tests for PriceStore."""
+
+    def test_coin_prices_match_filter(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test the indexed lookup against filtering the frame."""
+        store = PriceStore(sample_prices_df.sample(frac=1, random_state=0), pd.DataFrame())
+
+        assert store.coins == sorted(sample_prices_df["coin_id"].unique())
+        for coin_id in store.coins:
+            expected = sample_prices_df[sample_prices_df["coin_id"] == coin_id]
+            got = store.coin_prices(coin_id)
+            assert got["coin_id"].eq(coin_id).all()
+            assert got["date"].is_monotonic_increasing
+            assert got["price"].tolist() == expected.sort_values("date")["price"].tolist()
+        assert store.coin_prices("missing").empty
+
+    def test_views_do_not_change_shared_data(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that editing what a page gets leaves the store untouched."""
+        store = PriceStore(sample_prices_df, rank_by_drop(sample_prices_df))
+
+        view = store.coin_prices(store.coins[0])
+        view["price"] = 0.0
+        results = store.results
+        results["extra"] = 1
+
+        assert (store.coin_prices(store.coins[0])["price"] > 0).all()
+        assert "extra" not in store.results.columns
+        assert "extra" not in store.prices.columns
+
+    def test_cell_edits_do_not_change_shared_data(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that editing single cells of a view leaves the store untouched."""
+        ranking = rank_by_drop(sample_prices_df, top_n=None)
+        store = PriceStore(sample_prices_df, ranking.copy(), ranking=ranking)
+        coin_id = store.coins[0]
+        before = store.coin_prices(coin_id)["price"].tolist()
+
+        view = store.coin_prices(coin_id)
+        view.loc[view.index[0], "price"] = -1.0
+        view.iloc[0, view.columns.get_loc("volume")] = -1.0
+        results, all_drops, prices = store.results, store.all_drops, store.prices
+        results.iloc[0, results.columns.get_loc("pct_change")] = 0.0
+        all_drops.loc[1, "pct_change"] = 0.0
+        prices.iat[0, prices.columns.get_loc("price")] = -1.0
+
+        assert store.coin_prices(coin_id)["price"].tolist() == before
+        assert (store.coin_prices(coin_id)["volume"] > 0).all()
+        assert (store.prices["price"] > 0).all()
+        pd.testing.assert_frame_equal(store.results, ranking)
+        pd.testing.assert_frame_equal(store.all_drops, ranking)
+
+    def test_deep_copies_before_pandas_3(self, sample_prices_df: pd.DataFrame,
+                                         monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that callers get their own buffers without copy-on-write."""
+        store = PriceStore(sample_prices_df, pd.DataFrame())
+        monkeypatch.setattr("src.store.DEEP_COPIES", True)
+
+        first, second = store.prices, store.coin_prices("coin-a")
+        assert not np.shares_memory(first["price"].to_numpy(), store.prices["price"].to_numpy())
+        assert not np.shares_memory(second["price"].to_numpy(),
+                                    store.coin_prices("coin-a")["price"].to_numpy())
+
+    def test_concurrent_first_use_loads_once(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that cold requests from several threads share one price load."""
+        loads, coins, started = [], [], threading.Barrier(8)
+
+        def load() -> pd.DataFrame:
+            loads.append(1)
+            time.sleep(0.05)
+            return sample_prices_df
+
+        store = PriceStore(load, pd.DataFrame())
+
+        def first_request() -> None:
+            started.wait(5)
+            coins.append(len(store.coins))
+
+        threads = [threading.Thread(target=first_request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loads == [1]
+        assert coins == [4] * 8
+
+    def test_all_drops_is_the_ranking_artifact(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test the full ranking comes from the analyzer, not the prices."""
+        def fail() -> pd.DataFrame:
+            raise AssertionError("prices should not be loaded")
+
+        ranking = rank_by_drop(sample_prices_df, top_n=None)
+        store = PriceStore(fail, pd.DataFrame(), ranking=ranking)
+
+        pd.testing.assert_frame_equal(store.all_drops, ranking)
+        assert PriceStore(fail, pd.DataFrame()).all_drops.empty
+
+    def test_search_indexes(self, sample_prices_df: pd.DataFrame) -> None:
+        """Test that each table gets its own search index, built once."""
+        results = rank_by_drop(sample_prices_df, top_n=1)
+        ranking = rank_by_drop(sample_prices_df, top_n=None)
+        store = PriceStore(sample_prices_df, results, ranking=ranking)
+
+        assert store.results_search.size == 1
+        assert store.all_drops_search.size == len(ranking)
+        assert store.all_drops_search is store.all_drops_search
+
+
+class TestCoinHistory:
+    """Tests for the indexed per-coin lookup."""
+
+    @pytest.fixture
+    def db_path(self, tmp_path: Path, sample_prices_df: pd.DataFrame) -> Path:
+        """SQLite store with the fetcher's (coin_id, date) index."""
+        path = tmp_path / "prices.db"
+        save_to_sqlite(sample_prices_df.assign(
+            date=sample_prices_df["date"].dt.strftime("%Y-%m-%d")), path)
+        return path
+
+    def test_reads_one_coin_through_index(self, db_path: Path,
+                                          sample_prices_df: pd.DataFrame) -> None:
+        """Test that the query uses the index and matches the full table."""
+        def fail() -> pd.DataFrame:
+            raise AssertionError("full price table should not be loaded")
+
+        store = PriceStore(fail, pd.DataFrame(), db_path)
+        history = store.coin_history("coin-a")
+        expected = sample_prices_df[sample_prices_df["coin_id"] == "coin-a"]
+
+        assert store.uses_index
+        assert history["price"].tolist() == expected.sort_values("date")["price"].tolist()
+        assert pd.api.types.is_datetime64_any_dtype(history["date"])
+        assert store.coin_history("missing").empty
+        with sqlite3.connect(db_path) as conn:
+            plan = conn.execute("EXPLAIN QUERY PLAN " + COIN_HISTORY_SQL, ("coin-a",)).fetchall()
+        assert "idx_prices_coin_date" in str(plan)
+
+    def test_recent_coins_cached(self, db_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the LRU of recently viewed coins."""
+        monkeypatch.setattr("src.store.COIN_CACHE_SIZE", 1)
+        store = PriceStore(pd.DataFrame(), pd.DataFrame(), db_path)
+        store.coin_history("coin-a")
+        store.coin_history("coin-a")
+        store.coin_history("coin-b")
+
+        info = store._query_coin.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 2, 1)
+
+        view = store.coin_history("coin-b")
+        view["price"] = 0.0
+        view.loc[view.index[0], "volume"] = 0.0
+        assert (store.coin_history("coin-b")["price"] > 0).all()
+        assert (store.coin_history("coin-b")["volume"] > 0).all()
+
+    def test_falls_back_to_memory(self, tmp_path: Path,
+                                  sample_prices_df: pd.DataFrame) -> None:
+        """Test slicing the in-memory prices when there is no database."""
+        store = PriceStore(sample_prices_df, pd.DataFrame(), tmp_path / "none.db")
+
+        assert not store.uses_index
+        pd.testing.assert_frame_equal(store.coin_history("coin-b"), store.coin_prices("coin-b"))
+
+
+class TestLoadStore:
+    """Tests for load_store function."""
+
+    def test_reads_files(self, tmp_path: Path, sample_prices_csv: Path,
+                         sample_prices_df: pd.DataFrame) -> None:
+        """Test loading prices and results from disk."""
+        results_path, ranking_path = tmp_path / "results.csv", tmp_path / "ranking.pkl"
+        rank_by_drop(sample_prices_df).to_csv(results_path, index=False)
+        rank_by_drop(sample_prices_df, top_n=None).to_pickle(ranking_path)
+        store = load_store(sample_prices_csv, results_path, ranking_path=ranking_path)
+
+        assert len(store.prices) == len(sample_prices_df)
+        assert store.all_drops.index.name == "rank"
+        assert pd.api.types.is_datetime64_any_dtype(store.prices["date"])
+        assert not store.results.empty
+
+    def test_missing_files(self, tmp_path: Path) -> None:
+        """Test that missing files give an empty store."""
+        store = load_store(tmp_path / "none.csv", tmp_path / "none.csv", tmp_path / "none.db",
+                           tmp_path / "none.pkl")
+
+        assert store.prices.empty and store.results.empty
+        assert store.coins == []
+        assert store.all_drops.empty
+        assert store.coin_prices("any").empty
+
+
+class TestSharedStore:
+    """Tests for the data-versioned shared store."""
+
+    def test_reloads_only_when_files_change(self, tmp_path: Path, sample_prices_df: pd.DataFrame,
+                                            monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the store is reused until a data file is rewritten."""
+        results_path = tmp_path / "results.csv"
+        monkeypatch.setattr("src.store.RESULTS_CSV", results_path)
+        monkeypatch.setattr("src.store.RANKING_PATH", tmp_path / "ranking.pkl")
+        monkeypatch.setattr("src.store.PRICES_CSV", tmp_path / "prices.csv")
+        monkeypatch.setattr("src.store.DATABASE_PATH", tmp_path / "prices.db")
+        rank_by_drop(sample_prices_df, top_n=2).to_csv(results_path, index=False)
+
+        first = shared_store()
+        assert shared_store() is first
+        assert len(first.results) == 2
+
+        rank_by_drop(sample_prices_df).to_csv(results_path, index=False)
+        second = shared_store()
+        assert second is not first
+        assert len(second.results) == len(rank_by_drop(sample_prices_df))
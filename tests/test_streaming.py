@@ -0,0 +1,94 @@
+"""Unit tests for streaming module."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.analyzer import rank_by_drop, summarize_coins
+from src.streaming import iter_chunks, stream_history, stream_rank, stream_summary
+
+
+@pytest.fixture
+def csv_store(
+    tmp_path: Path, sample_prices_df: pd.DataFrame, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Sample prices written out of order, as repeated --update appends would."""
+    path = tmp_path / "prices.csv"
+    sample_prices_df.sample(frac=1, random_state=11).to_csv(path, index=False)
+    monkeypatch.setattr("src.streaming.PRICES_CSV", path)
+    monkeypatch.setattr("src.streaming.DATABASE_PATH", tmp_path / "missing.db")
+    return path
+
+
+class TestStreamSummary:
+    """Tests for stream_summary function."""
+
+    @pytest.mark.parametrize("chunksize", [7, 50, 1000])
+    def test_matches_in_memory(
+        self, csv_store: Path, sample_prices_df: pd.DataFrame, chunksize: int
+    ) -> None:
+        """Test that folding chunks gives the in-memory summary."""
+        expected = summarize_coins(sample_prices_df).sort_values("coin_id")
+        actual = stream_summary(chunksize=chunksize)
+        pd.testing.assert_frame_equal(
+            actual, expected.reset_index(drop=True), check_dtype=False
+        )
+
+    def test_as_of(self, csv_store: Path, sample_prices_df: pd.DataFrame) -> None:
+        """Test that as_of bounds the streamed rows."""
+        expected = rank_by_drop(sample_prices_df, as_of="2025-02-10")
+        actual = stream_rank(chunksize=33, as_of="2025-02-10")
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_sqlite_source(
+        self, sample_sqlite_db: Path, sample_prices_df: pd.DataFrame,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test streaming from SQLite."""
+        monkeypatch.setattr("src.streaming.DATABASE_PATH", sample_sqlite_db)
+        pd.testing.assert_frame_equal(
+            stream_rank("sqlite", chunksize=40), rank_by_drop(sample_prices_df),
+            check_dtype=False,
+        )
+
+    def test_missing_store(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test FileNotFoundError when no store exists."""
+        monkeypatch.setattr("src.streaming.PRICES_CSV", tmp_path / "missing.csv")
+        monkeypatch.setattr("src.streaming.DATABASE_PATH", tmp_path / "missing.db")
+        with pytest.raises(FileNotFoundError):
+            stream_summary()
+
+    def test_bounded_chunks(self, csv_store: Path) -> None:
+        """Test that no chunk exceeds the requested size."""
+        assert max(len(chunk) for chunk in iter_chunks(chunksize=25)) <= 25
+
+
+class TestStreamHistory:
+    """Tests for stream_history function."""
+
+    def test_selected_coins_only(self, csv_store: Path) -> None:
+        """Test that only the requested coins are collected."""
+        history = stream_history(["coin-a", "coin-d"], chunksize=17)
+        assert set(history["coin_id"]) == {"coin-a", "coin-d"}
+        assert len(history) == 120
+
+
+class TestRunStreaming:
+    """Tests for run(stream=True)."""
+
+    @pytest.mark.usefixtures("isolated_outputs")
+    def test_run_stream_matches_run(
+        self, csv_store: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that streaming mode exports the same ranking."""
+        from src.analyzer import run
+
+        monkeypatch.setattr("src.analyzer.PRICES_CSV", csv_store)
+        monkeypatch.setattr("src.analyzer.DATABASE_PATH", tmp_path / "missing.db")
+
+        expected = run(force=True)
+        streamed = run(force=True, stream=True)
+        pd.testing.assert_frame_equal(
+            streamed.sort_index(axis=1), expected.sort_index(axis=1), check_dtype=False
+        )
@@ -0,0 +1,97 @@
+"""Unit tests for table module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.table import (
+    DEFAULT_DROP_STYLE,
+    SearchIndex,
+    drop_styles,
+    filter_positions,
+    page_count,
+    page_slice,
+    style_table,
+)
+
+
+@pytest.fixture
+def ranking() -> pd.DataFrame:
+    """Small ranked table with mixed-case names and a missing name."""
+    return pd.DataFrame({
+        "coin_name": ["Solana", "Cardano", None, "Polkadot", "SOL Wrapped"],
+        "symbol": ["SOL", "ADA", "DOGE", "DOT", "WSOL"],
+        "pct_change": [-85.0, -70.0, -65.5, -40.0, -10.0],
+        "market_cap": [9e9, 5e9, np.nan, 2e9, 1e8],
+    }, index=pd.RangeIndex(1, 6, name="rank"))
+
+
+class TestSearchIndex:
+    """Tests for SearchIndex."""
+
+    def test_matches_like_case_insensitive_contains(self, ranking: pd.DataFrame) -> None:
+        """Test agreement with str.contains over name and symbol."""
+        index = SearchIndex(ranking)
+        for query in ["sol", "SOL", "a", "do", "o w", "xyz", "(", "s\x1fa"]:
+            expected = (
+                ranking["coin_name"].str.contains(query, case=False, regex=False, na=False)
+                | ranking["symbol"].str.contains(query, case=False, regex=False, na=False)
+            ).to_numpy()
+            np.testing.assert_array_equal(index.match(query), expected, err_msg=query)
+
+    def test_no_match_across_rows(self, ranking: pd.DataFrame) -> None:
+        """Test that a query cannot join the end of one row to the next."""
+        assert not SearchIndex(ranking).match("solcar").any()
+
+    def test_empty_query_and_table(self, ranking: pd.DataFrame) -> None:
+        """Test the empty query and an empty table."""
+        assert SearchIndex(ranking).match("  ").all()
+        assert SearchIndex(ranking.iloc[:0]).match("sol").size == 0
+
+
+class TestFilterPositions:
+    """Tests for filter_positions function."""
+
+    def test_combined_filters(self, ranking: pd.DataFrame) -> None:
+        """Test search, market cap and drop range together."""
+        index = SearchIndex(ranking)
+
+        assert filter_positions(ranking, index).tolist() == [0, 1, 2, 3, 4]
+        assert filter_positions(ranking, index, "sol").tolist() == [0, 4]
+        assert filter_positions(ranking, index, "sol", min_market_cap=1e9).tolist() == [0]
+        assert filter_positions(ranking, index, drop_range=(-70, -40)).tolist() == [1, 2, 3]
+
+
+class TestPagination:
+    """Tests for page_count and page_slice functions."""
+
+    def test_pages(self, ranking: pd.DataFrame) -> None:
+        """Test page boundaries and clamping."""
+        positions = np.array([0, 2, 3, 4])
+
+        assert page_count(len(positions), 3) == 2
+        assert page_count(0, 3) == 1
+        assert page_slice(ranking, positions, 1, 3).index.tolist() == [1, 3, 4]
+        assert page_slice(ranking, positions, 2, 3).index.tolist() == [5]
+        assert page_slice(ranking, positions, 9, 3).index.tolist() == [5]
+        assert page_slice(ranking, positions[:0], 1, 3).empty
+
+
+class TestStyling:
+    """Tests for drop_styles and style_table functions."""
+
+    def test_drop_styles_match_thresholds(self) -> None:
+        """Test the severity bands, including the boundaries."""
+        styles = drop_styles(pd.Series([-90.0, -80.0, -79.9, -60.0, -10.0, np.nan]))
+
+        assert "#ff4444" in styles[0] and "#ff4444" in styles[1]
+        assert "#ff8800" in styles[2] and "#ff8800" in styles[3]
+        assert styles[4] == DEFAULT_DROP_STYLE and styles[5] == DEFAULT_DROP_STYLE
+
+    def test_style_table(self, ranking: pd.DataFrame) -> None:
+        """Test formatting and colouring of a page."""
+        html = style_table(ranking.head(2)).to_html()
+
+        assert "-85.00%" in html
+        assert "$9,000,000,000" in html
+        assert "#ff4444" in html